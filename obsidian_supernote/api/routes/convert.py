@@ -4,6 +4,7 @@ Conversion endpoints for Obsidian-Supernote Sync.
 Provides:
 - /convert/md-to-note - Convert Markdown to .note
 - /convert/note-to-md - Convert .note to Markdown
+- /convert/note-page - Render a single .note page as an image
 - /convert/pdf-to-note - Convert PDF to .note
 - /convert/png-to-note - Convert PNG to .note
 - /batch/convert - Batch conversion operations
@@ -16,7 +17,7 @@ import tempfile
 from pathlib import Path
 from typing import Literal
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
 from pydantic import BaseModel, Field
 
 from obsidian_supernote.api.websocket import (
@@ -31,6 +32,10 @@ router = APIRouter()
 
 # Request/Response Models
 
+QuantizeMode = Literal["off", "levels", "ordered", "diffusion"]
+ImageProfile = Literal["png", "png-fast", "png-small", "gray4", "bw", "webp"]
+
+
 class MarkdownToNoteRequest(BaseModel):
     """Request to convert Markdown to .note file."""
 
@@ -48,6 +53,19 @@ class MarkdownToNoteRequest(BaseModel):
         default=True,
         description="Update markdown frontmatter with .note file reference"
     )
+    quantize: QuantizeMode = Field(
+        default="off",
+        description="Map background pages onto e-ink gray levels (levels, ordered, diffusion)"
+    )
+    gray_levels: int = Field(default=16, ge=2, le=256, description="Gray levels used when quantizing")
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory of the rendered-page cache; unchanged pages are not re-rendered"
+    )
+    deterministic: bool = Field(
+        default=False,
+        description="Reproducible output; an identical existing .note file is not rewritten"
+    )
 
 
 class NoteToMarkdownRequest(BaseModel):
@@ -59,6 +77,14 @@ class NoteToMarkdownRequest(BaseModel):
         default=None,
         description="Directory for extracted images (default: same as output)"
     )
+    incremental: bool = Field(
+        default=False,
+        description="Only render pages that changed since the last export"
+    )
+    image_profile: ImageProfile = Field(
+        default="png",
+        description="Page image format: png, png-fast, png-small, gray4 (4-bit gray), bw (1-bit), webp (lossless)"
+    )
 
 
 class PdfToNoteRequest(BaseModel):
@@ -68,6 +94,23 @@ class PdfToNoteRequest(BaseModel):
     output_path: str = Field(..., description="Path for output .note file")
     device: str = Field(default="A5X2", description="Target device")
     realtime: bool = Field(default=False, description="Enable realtime recognition")
+    quantize: QuantizeMode = Field(
+        default="off",
+        description="Map background pages onto e-ink gray levels (levels, ordered, diffusion)"
+    )
+    gray_levels: int = Field(default=16, ge=2, le=256, description="Gray levels used when quantizing")
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory of the rendered-page cache; unchanged pages are not re-rendered"
+    )
+    deterministic: bool = Field(
+        default=False,
+        description="Reproducible output; an identical existing .note file is not rewritten"
+    )
+    pages: str | None = Field(
+        default=None,
+        description="Pages to convert, e.g. '1-20,45' (default: all)"
+    )
 
 
 class PngToNoteRequest(BaseModel):
@@ -78,6 +121,19 @@ class PngToNoteRequest(BaseModel):
     device: str = Field(default="A5X2", description="Target device")
     template_name: str | None = Field(default=None, description="Template name")
     realtime: bool = Field(default=False, description="Enable realtime recognition")
+    quantize: QuantizeMode = Field(
+        default="off",
+        description="Map background pages onto e-ink gray levels (levels, ordered, diffusion)"
+    )
+    gray_levels: int = Field(default=16, ge=2, le=256, description="Gray levels used when quantizing")
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory of the template cache; a template is prepared once per device"
+    )
+    deterministic: bool = Field(
+        default=False,
+        description="Reproducible output; an identical existing .note file is not rewritten"
+    )
 
 
 class BatchConvertRequest(BaseModel):
@@ -88,6 +144,19 @@ class BatchConvertRequest(BaseModel):
     output_dir: str = Field(..., description="Output directory for converted files")
     device: str = Field(default="A5X2", description="Target device (for *-to-note)")
     realtime: bool = Field(default=False, description="Enable realtime recognition")
+    quantize: QuantizeMode = Field(
+        default="off",
+        description="Gray-level quantization for *-to-note conversions"
+    )
+    gray_levels: int = Field(default=16, ge=2, le=256, description="Gray levels used when quantizing")
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory of the rendered-page and template cache; unchanged pages are not re-rendered"
+    )
+    deterministic: bool = Field(
+        default=False,
+        description="Reproducible output; an identical existing .note file is not rewritten"
+    )
 
 
 class ConversionResult(BaseModel):
@@ -167,6 +236,10 @@ async def convert_markdown_to_note(request: MarkdownToNoteRequest) -> Conversion
                 margin=request.margin,
                 font_size=request.font_size,
                 update_markdown=request.update_markdown,
+                quantize=request.quantize,
+                gray_levels=request.gray_levels,
+                cache_dir=request.cache_dir,
+                deterministic=request.deterministic,
             )
 
         await asyncio.get_event_loop().run_in_executor(None, do_conversion)
@@ -201,13 +274,13 @@ async def convert_note_to_markdown(request: NoteToMarkdownRequest) -> Conversion
     """
     Convert a Supernote .note file to Markdown with embedded images.
 
-    Extracts all pages as PNG images and creates a Markdown file
+    Extracts all pages as images (PNG or WebP) and creates a Markdown file
     with Obsidian-compatible image embeds. Broadcasts WebSocket progress events.
     """
     reporter = ProgressReporter("note-to-md", request.input_path)
 
     try:
-        from obsidian_supernote.converters import convert_note_to_markdown as _convert
+        from obsidian_supernote.converters.note_to_obsidian import convert_note_to_markdown as _convert
 
         input_path = _validate_file_exists(request.input_path, ".note file")
         output_path = _ensure_output_dir(request.output_path)
@@ -222,6 +295,8 @@ async def convert_note_to_markdown(request: NoteToMarkdownRequest) -> Conversion
                 note_path=input_path,
                 output_path=output_path,
                 image_dir=image_dir,
+                incremental=request.incremental,
+                image_profile=request.image_profile,
             )
 
         await reporter.progress(0.5, "Extracting pages...")
@@ -252,6 +327,45 @@ async def convert_note_to_markdown(request: NoteToMarkdownRequest) -> Conversion
         )
 
 
+@router.get("/note-page")
+async def render_note_page(
+    path: str,
+    page_index: int = Query(default=0, ge=0, description="Page to render (0 = first page)"),
+    image_profile: ImageProfile = "png",
+) -> Response:
+    """
+    Render one page of a Supernote .note file as an image.
+
+    Only the note's shared metadata and the requested page's blocks are
+    read, so previewing a page of a long notebook is as fast as previewing
+    one of a short notebook.
+
+    Args:
+        path: Path to the .note file
+        page_index: Page to render (0-based)
+        image_profile: Image format (png, png-fast, png-small, gray4, bw, webp)
+
+    Returns:
+        The page image (image/png or image/webp)
+    """
+    from obsidian_supernote.converters.note_to_obsidian import render_note_page as _render
+    from obsidian_supernote.converters.page_image import image_suffix, page_image_bytes
+
+    input_path = _validate_file_exists(path, ".note file")
+
+    def do_render() -> bytes:
+        return page_image_bytes(_render(input_path, page_index), image_profile)
+
+    try:
+        content = await asyncio.get_event_loop().run_in_executor(None, do_render)
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid .note file: {e}")
+
+    return Response(content=content, media_type=f"image/{image_suffix(image_profile)[1:]}")
+
+
 @router.post("/pdf-to-note", response_model=ConversionResult)
 async def convert_pdf_to_note(request: PdfToNoteRequest) -> ConversionResult:
     """
@@ -277,6 +391,11 @@ async def convert_pdf_to_note(request: PdfToNoteRequest) -> ConversionResult:
                 output_path=output_path,
                 device=request.device,
                 realtime=request.realtime,
+                quantize=request.quantize,
+                gray_levels=request.gray_levels,
+                cache_dir=request.cache_dir,
+                deterministic=request.deterministic,
+                pages=request.pages,
             )
 
         await reporter.progress(0.5, "Converting pages to .note format...")
@@ -332,6 +451,10 @@ async def convert_png_to_note(request: PngToNoteRequest) -> ConversionResult:
                 device=request.device,
                 template_name=request.template_name,
                 realtime=request.realtime,
+                quantize=request.quantize,
+                gray_levels=request.gray_levels,
+                cache_dir=request.cache_dir,
+                deterministic=request.deterministic,
             )
 
         await reporter.progress(0.6, "Creating .note file...")
@@ -378,20 +501,31 @@ async def batch_convert(request: BatchConvertRequest) -> BatchConversionResult:
     output_dir = Path(request.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Map conversion type to the appropriate converter function
+    # Options of the conversions that write .note files; exporting a
+    # .note file to Markdown takes none of them
+    note_options = {
+        "device": request.device,
+        "realtime": request.realtime,
+        "quantize": request.quantize,
+        "gray_levels": request.gray_levels,
+        "cache_dir": request.cache_dir,
+        "deterministic": request.deterministic,
+    }
+
+    # Map conversion type to the appropriate converter function and its options
     converters = {
-        "md-to-note": _batch_md_to_note,
-        "note-to-md": _batch_note_to_md,
-        "pdf-to-note": _batch_pdf_to_note,
-        "png-to-note": _batch_png_to_note,
+        "md-to-note": (_batch_md_to_note, note_options),
+        "note-to-md": (_batch_note_to_md, {}),
+        "pdf-to-note": (_batch_pdf_to_note, note_options),
+        "png-to-note": (_batch_png_to_note, note_options),
     }
 
-    converter_func = converters.get(request.conversion_type)
-    if not converter_func:
+    if request.conversion_type not in converters:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown conversion type: {request.conversion_type}"
         )
+    converter_func, options = converters[request.conversion_type]
 
     # Create batch progress reporter
     batch_reporter = BatchProgressReporter(len(request.input_paths))
@@ -400,12 +534,7 @@ async def batch_convert(request: BatchConvertRequest) -> BatchConversionResult:
     for i, input_path in enumerate(request.input_paths):
         await batch_reporter.file_progress(i, input_path, "converting")
 
-        result = await converter_func(
-            input_path=input_path,
-            output_dir=output_dir,
-            device=request.device,
-            realtime=request.realtime,
-        )
+        result = await converter_func(input_path=input_path, output_dir=output_dir, **options)
         results.append(result)
 
         await batch_reporter.file_complete(
@@ -435,6 +564,10 @@ async def _batch_md_to_note(
     output_dir: Path,
     device: str,
     realtime: bool,
+    quantize: str = "off",
+    gray_levels: int = 16,
+    cache_dir: str | None = None,
+    deterministic: bool = False,
 ) -> ConversionResult:
     """Batch convert a single Markdown file."""
     try:
@@ -454,6 +587,10 @@ async def _batch_md_to_note(
             output_path=output_path,
             device=device,
             realtime=realtime,
+            quantize=quantize,
+            gray_levels=gray_levels,
+            cache_dir=cache_dir,
+            deterministic=deterministic,
         )
 
         return ConversionResult(
@@ -472,12 +609,10 @@ async def _batch_md_to_note(
 async def _batch_note_to_md(
     input_path: str,
     output_dir: Path,
-    device: str,
-    realtime: bool,
 ) -> ConversionResult:
     """Batch convert a single .note file."""
     try:
-        from obsidian_supernote.converters import convert_note_to_markdown as _convert
+        from obsidian_supernote.converters.note_to_obsidian import convert_note_to_markdown as _convert
 
         p = Path(input_path)
         if not p.exists():
@@ -511,6 +646,10 @@ async def _batch_pdf_to_note(
     output_dir: Path,
     device: str,
     realtime: bool,
+    quantize: str = "off",
+    gray_levels: int = 16,
+    cache_dir: str | None = None,
+    deterministic: bool = False,
 ) -> ConversionResult:
     """Batch convert a single PDF file."""
     try:
@@ -530,6 +669,10 @@ async def _batch_pdf_to_note(
             output_path=output_path,
             device=device,
             realtime=realtime,
+            quantize=quantize,
+            gray_levels=gray_levels,
+            cache_dir=cache_dir,
+            deterministic=deterministic,
         )
 
         return ConversionResult(
@@ -550,6 +693,10 @@ async def _batch_png_to_note(
     output_dir: Path,
     device: str,
     realtime: bool,
+    quantize: str = "off",
+    gray_levels: int = 16,
+    cache_dir: str | None = None,
+    deterministic: bool = False,
 ) -> ConversionResult:
     """Batch convert a single PNG file."""
     try:
@@ -569,6 +716,10 @@ async def _batch_png_to_note(
             output_path=output_path,
             device=device,
             realtime=realtime,
+            quantize=quantize,
+            gray_levels=gray_levels,
+            cache_dir=cache_dir,
+            deterministic=deterministic,
         )
 
         return ConversionResult(
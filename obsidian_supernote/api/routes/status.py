@@ -4,6 +4,7 @@ Status and health check endpoints.
 Provides:
 - /status - Overall system health and version info
 - /status/dependencies - Check availability of external tools
+- /status/cache - Rendered-page cache statistics
 """
 
 import shutil
@@ -26,6 +27,18 @@ class DependencyStatus(BaseModel):
     path: str | None = None
 
 
+class PageCacheStatus(BaseModel):
+    """Statistics of a rendered-page cache."""
+
+    cache_dir: str
+    entries: int
+    size_bytes: int
+    max_size_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
 class SystemStatus(BaseModel):
     """Overall system status response."""
 
@@ -139,6 +152,19 @@ async def get_dependencies() -> dict[str, DependencyStatus]:
     }
 
 
+@router.get("/status/cache", response_model=list[PageCacheStatus])
+async def get_cache_status() -> list[PageCacheStatus]:
+    """
+    Get statistics of the rendered-page caches used since the server started.
+
+    Returns:
+        One entry per cache directory with hit/miss counters and disk usage
+    """
+    from obsidian_supernote.converters.page_cache import page_cache_stats
+
+    return [PageCacheStatus(**stats) for stats in page_cache_stats()]
+
+
 @router.get("/health")
 async def health_check() -> dict[str, str]:
     """
@@ -158,6 +184,8 @@ class FileInfo(BaseModel):
     is_dir: bool
     size: int | None = None
     extension: str | None = None
+    pages: int | None = None
+    has_handwriting: bool | None = None
 
 
 class BrowseResponse(BaseModel):
@@ -172,6 +200,7 @@ class BrowseResponse(BaseModel):
 async def browse_files(
     path: str | None = None,
     filter_ext: str | None = None,
+    index_path: str | None = None,
 ) -> BrowseResponse:
     """
     Browse files and directories on the local filesystem.
@@ -179,6 +208,8 @@ async def browse_files(
     Args:
         path: Directory path to browse (defaults to user home)
         filter_ext: Optional file extension filter (e.g., ".md", ".note")
+        index_path: SQLite note index; .note files are listed with their
+            page count and handwriting flag, read only if they changed
 
     Returns:
         List of files and directories in the specified path
@@ -186,6 +217,8 @@ async def browse_files(
     from pathlib import Path
     import os
 
+    from obsidian_supernote.parsers.note_index import NoteIndex
+
     # Default to user home directory
     if not path:
         path = str(Path.home())
@@ -199,6 +232,7 @@ async def browse_files(
         raise HTTPException(status_code=400, detail=f"Not a directory: {path}")
 
     items: list[FileInfo] = []
+    index = NoteIndex(index_path) if index_path else None
 
     try:
         for entry in sorted(browse_path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower())):
@@ -219,15 +253,27 @@ async def browse_files(
             except OSError:
                 size = None
 
+            summary = None
+            if index is not None and ext == ".note":
+                try:
+                    summary = index.get(entry)["summary"]
+                except OSError:
+                    pass
+
             items.append(FileInfo(
                 name=entry.name,
                 path=str(entry),
                 is_dir=is_dir,
                 size=size,
                 extension=ext,
+                pages=summary["pages_count"] if summary else None,
+                has_handwriting=summary["has_handwriting"] if summary else None,
             ))
     except PermissionError:
         raise HTTPException(status_code=403, detail=f"Permission denied: {path}")
+    finally:
+        if index is not None:
+            index.close()
 
     # Get parent path
     parent = browse_path.parent
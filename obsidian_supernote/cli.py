@@ -1,5 +1,9 @@
 """Command-line interface for Obsidian-Supernote Sync."""
 
+import glob
+import json
+import time
+
 import click
 from pathlib import Path
 from rich.console import Console
@@ -15,8 +19,16 @@ from obsidian_supernote.converters.note_writer import (
     convert_markdown_to_note,
 )
 from obsidian_supernote.converters.note_to_obsidian import NoteToObsidianConverter
+from obsidian_supernote.converters.page_cache import get_page_cache
+from obsidian_supernote.converters.page_image import DEFAULT_IMAGE_PROFILE, IMAGE_PROFILES
+from obsidian_supernote.converters.quantize import DEFAULT_GRAY_LEVELS, QUANTIZE_MODES
 from obsidian_supernote.converters import WEASYPRINT_AVAILABLE
-from obsidian_supernote.parsers.note_parser import NoteFileParser
+from obsidian_supernote.parsers.note_index import NoteIndex
+from obsidian_supernote.parsers.note_parser import (
+    NoteFileParser,
+    iter_note_summaries,
+    read_note_summary,
+)
 
 # Conditionally import WeasyPrint converter
 if WEASYPRINT_AVAILABLE:
@@ -124,12 +136,32 @@ def md_to_pdf(
 @click.option("--device", default="A5X", help="Target Supernote device (A5X, A6X, Nomad, N5, N6)")
 @click.option("--language", default="en_GB", help="Recognition language (en_GB, en_US, etc.)")
 @click.option("--dpi", default=300, help="DPI for rendering PDF pages (higher = better quality)")
+@click.option("--workers", default=1, type=click.IntRange(min=0), help="Processes used to render pages (0 = all CPU cores)")
+@click.option("--render-mode", type=click.Choice(NoteFileWriter.RENDER_MODES), default="resample", help="Page rasterization: resample (DPI render + resize) or fit (direct to device pixels)")
+@click.option("--color-mode", type=click.Choice(NoteFileWriter.COLOR_MODES), default="rgba", help="Background pixel format: rgba or gray (8-bit grayscale, smaller and faster)")
+@click.option("--quantize", type=click.Choice(QUANTIZE_MODES), default="off", help="Map backgrounds onto e-ink gray levels: levels, ordered or diffusion dithering")
+@click.option("--gray-levels", default=DEFAULT_GRAY_LEVELS, type=click.IntRange(2, 256), help="Gray levels used with --quantize (default: 16)")
+@click.option("--streaming", is_flag=True, help="Write pages to the .note file as they are rendered (bounded memory for long documents)")
+@click.option("--cache-dir", type=click.Path(file_okay=False), default=None, help="Cache rendered pages here and reuse unchanged pages on later runs")
+@click.option("--deterministic", is_flag=True, help="Reproducible output: same input gives identical bytes, and an unchanged file is not rewritten")
+@click.option("--pages", default=None, help="Pages to convert, e.g. 1-20,45 or 40- (default: all)")
+@click.option("--progressive", default=0, type=click.IntRange(min=0), help="Write a note with the first N pages right away, then extend it with the rest")
 def pdf_to_note(
     input_file: str,
     output_file: str,
     device: str,
     language: str,
     dpi: int,
+    workers: int,
+    render_mode: str,
+    color_mode: str,
+    quantize: str,
+    gray_levels: int,
+    streaming: bool,
+    cache_dir: str | None,
+    deterministic: bool,
+    pages: str | None,
+    progressive: int,
 ) -> None:
     """Convert PDF file to Supernote .note format.
 
@@ -154,11 +186,60 @@ def pdf_to_note(
         console.print(f"  Device:   {device}")
         console.print(f"  Language: {language}")
         console.print(f"  DPI:      {dpi}")
+        console.print(f"  Workers:  {workers or 'all cores'}")
+        console.print(f"  Render:   {render_mode}")
+        console.print(f"  Color:    {color_mode}")
+        if quantize != "off":
+            console.print(f"  Quantize: {quantize} ({gray_levels} levels)")
+        if streaming:
+            console.print(f"  Streaming: enabled")
+        if cache_dir:
+            console.print(f"  Cache:    {cache_dir}")
+        if pages:
+            console.print(f"  Pages:    {pages}")
+        if progressive:
+            console.print(f"  Progressive: first {progressive} pages")
+
+        page_cache = get_page_cache(cache_dir) if cache_dir else None
+        writer = NoteFileWriter(
+            device=device,
+            language=language,
+            workers=workers,
+            render_mode=render_mode,
+            color_mode=color_mode,
+            quantize=quantize,
+            gray_levels=gray_levels,
+            streaming=streaming,
+            page_cache=page_cache,
+            deterministic=deterministic,
+        )
 
-        writer = NoteFileWriter(device=device, language=language)
-
-        with console.status("[bold green]Converting PDF to .note...", spinner="dots"):
-            writer.convert_pdf_to_note(input_path, output_path, dpi=dpi)
+        with console.status("[bold green]Converting PDF to .note...", spinner="dots") as status:
+            if progressive:
+                def first_pages_ready(path: Path, count: int) -> None:
+                    console.print(f"  First {count} pages ready: {path}")
+                    status.update("[bold green]Extending .note with the remaining pages...")
+
+                extension = writer.start_pdf_to_note_progressive(
+                    input_path, output_path, progressive, dpi=dpi, pages=pages,
+                    on_first_pages=first_pages_ready,
+                )
+                # The preview may have changed meanwhile, in which case the
+                # complete note is written next to it
+                complete_path = extension.result()
+                if complete_path != output_path:
+                    console.print(
+                        f"  [yellow]{output_path} changed while it was extended; "
+                        f"complete note written to {complete_path}[/yellow]"
+                    )
+                    output_path = complete_path
+            else:
+                writer.convert_pdf_to_note(input_path, output_path, dpi=dpi, pages=pages)
+
+        if page_cache:
+            console.print(f"  Cache hits: {page_cache.hits}, misses: {page_cache.misses}")
+        if writer.last_write_skipped:
+            console.print(f"\n[yellow]Output unchanged - existing file left untouched[/yellow]")
 
         # Get file size and page count
         size_mb = output_path.stat().st_size / (1024 * 1024)
@@ -188,6 +269,16 @@ def pdf_to_note(
 @click.option("--realtime/--no-realtime", default=None, help="Force realtime mode (overrides frontmatter)")
 @click.option("--no-frontmatter", is_flag=True, help="Ignore frontmatter properties")
 @click.option("--no-update-markdown", is_flag=True, help="Don't update markdown with .note file reference")
+@click.option("--workers", default=1, type=click.IntRange(min=0), help="Processes used to render pages (0 = all CPU cores)")
+@click.option("--render-mode", type=click.Choice(NoteFileWriter.RENDER_MODES), default="resample", help="Page rasterization: resample (DPI render + resize) or fit (direct to device pixels)")
+@click.option("--color-mode", type=click.Choice(NoteFileWriter.COLOR_MODES), default="rgba", help="Background pixel format: rgba or gray (8-bit grayscale, smaller and faster)")
+@click.option("--quantize", type=click.Choice(QUANTIZE_MODES), default="off", help="Map backgrounds onto e-ink gray levels: levels, ordered or diffusion dithering")
+@click.option("--gray-levels", default=DEFAULT_GRAY_LEVELS, type=click.IntRange(2, 256), help="Gray levels used with --quantize (default: 16)")
+@click.option("--streaming", is_flag=True, help="Write pages to the .note file as they are rendered (bounded memory for long documents)")
+@click.option("--incremental", is_flag=True, help="In update mode, append only changed pages to the existing .note file")
+@click.option("--cache-dir", type=click.Path(file_okay=False), default=None, help="Cache rendered pages here and reuse unchanged pages on later runs")
+@click.option("--deterministic", is_flag=True, help="Reproducible output: same input gives identical bytes, and an unchanged file is not rewritten")
+@click.option("--index", "index_path", type=click.Path(dir_okay=False), default=None, help="In update mode, look up the existing .note file in this SQLite index before re-reading it")
 def md_to_note(
     input_file: str,
     output_file: str,
@@ -199,6 +290,16 @@ def md_to_note(
     realtime: bool | None,
     no_frontmatter: bool,
     no_update_markdown: bool,
+    workers: int,
+    render_mode: str,
+    color_mode: str,
+    quantize: str,
+    gray_levels: int,
+    streaming: bool,
+    incremental: bool,
+    cache_dir: str | None,
+    deterministic: bool,
+    index_path: str | None,
 ) -> None:
     """Convert Markdown file directly to Supernote .note format.
 
@@ -232,6 +333,15 @@ def md_to_note(
         console.print(f"  Page size:  {page_size}")
         console.print(f"  Margin:     {margin}")
         console.print(f"  Font size:  {font_size}pt")
+        console.print(f"  Workers:    {workers or 'all cores'}")
+        console.print(f"  Render:     {render_mode}")
+        console.print(f"  Color:      {color_mode}")
+        if quantize != "off":
+            console.print(f"  Quantize:   {quantize} ({gray_levels} levels)")
+        if streaming:
+            console.print(f"  Streaming:  enabled")
+        if cache_dir:
+            console.print(f"  Cache:      {cache_dir}")
 
         use_frontmatter = not no_frontmatter
         if not use_frontmatter:
@@ -256,6 +366,16 @@ def md_to_note(
                 font_size=font_size,
                 use_frontmatter=use_frontmatter,
                 update_markdown=not no_update_markdown,
+                workers=workers,
+                render_mode=render_mode,
+                color_mode=color_mode,
+                quantize=quantize,
+                gray_levels=gray_levels,
+                streaming=streaming,
+                incremental=incremental,
+                cache_dir=cache_dir,
+                deterministic=deterministic,
+                index_path=index_path,
             )
 
         # Get file size
@@ -294,7 +414,10 @@ def md_to_note(
 @main.command()
 @click.argument("input_file", type=click.Path(exists=True))
 @click.argument("output_dir", type=click.Path())
-def note_to_png(input_file: str, output_dir: str) -> None:
+@click.option("--workers", default=1, type=click.IntRange(min=0), help="Processes used to render pages (0 = all CPU cores)")
+@click.option("--incremental", is_flag=True, help="Only render pages that changed since the last export")
+@click.option("--image-profile", type=click.Choice(IMAGE_PROFILES), default=DEFAULT_IMAGE_PROFILE, help="Page image format, from fastest to smallest: png-fast, png, png-small, gray4 (4-bit gray), bw (1-bit), webp (lossless)")
+def note_to_png(input_file: str, output_dir: str, workers: int, incremental: bool, image_profile: str) -> None:
     """Convert Supernote .note file to PNG images.
 
     Extracts all pages from the .note file as PNG images.
@@ -310,15 +433,18 @@ def note_to_png(input_file: str, output_dir: str) -> None:
         console.print(f"[bold blue]Converting .note to PNG images[/bold blue]")
         console.print(f"  Input:  {input_path}")
         console.print(f"  Output: {output_path}")
+        console.print(f"  Format: {image_profile}")
 
-        converter = NoteToObsidianConverter(input_path)
+        converter = NoteToObsidianConverter(input_path, workers=workers, image_profile=image_profile)
         console.print(f"  Pages:  {converter.page_count}")
 
         with console.status("[bold green]Converting pages...", spinner="dots"):
-            png_files = converter.convert_all_pages_to_png(output_path)
+            png_files = converter.convert_all_pages_to_png(output_path, incremental=incremental)
 
         console.print(f"\n[bold green]SUCCESS![/bold green]")
-        console.print(f"  Generated {len(png_files)} PNG files:")
+        if incremental:
+            console.print(f"  Rendered {len(converter.rendered_pages)} changed pages")
+        console.print(f"  Generated {len(png_files)} {converter.image_suffix[1:].upper()} files:")
         for f in png_files:
             console.print(f"    - {f.name}")
 
@@ -334,11 +460,14 @@ def note_to_png(input_file: str, output_dir: str) -> None:
 @click.argument("output_file", type=click.Path())
 @click.option("--image-dir", type=click.Path(), help="Directory for images (default: same as markdown)")
 @click.option("--embed/--no-embed", default=True, help="Use Obsidian image embeds (![[image]])")
-def note_to_md(input_file: str, output_file: str, image_dir: str | None, embed: bool) -> None:
+@click.option("--workers", default=1, type=click.IntRange(min=0), help="Processes used to render pages (0 = all CPU cores)")
+@click.option("--incremental", is_flag=True, help="Only render pages that changed since the last export")
+@click.option("--image-profile", type=click.Choice(IMAGE_PROFILES), default=DEFAULT_IMAGE_PROFILE, help="Page image format, from fastest to smallest: png-fast, png, png-small, gray4 (4-bit gray), bw (1-bit), webp (lossless)")
+def note_to_md(input_file: str, output_file: str, image_dir: str | None, embed: bool, workers: int, incremental: bool, image_profile: str) -> None:
     """Convert Supernote .note file to Markdown with images.
 
     Creates a Markdown file with YAML frontmatter and embedded images.
-    Images are saved as PNG files alongside the Markdown.
+    Images are saved alongside the Markdown, as PNG files by default.
 
     Arguments:
         INPUT_FILE: Path to .note file
@@ -354,16 +483,19 @@ def note_to_md(input_file: str, output_file: str, image_dir: str | None, embed:
         console.print(f"  Output:    {output_path}")
         console.print(f"  Image dir: {img_dir or output_path.parent}")
         console.print(f"  Embed:     {'Obsidian (![[]])' if embed else 'Standard markdown'}")
+        console.print(f"  Format:    {image_profile}")
 
-        converter = NoteToObsidianConverter(input_path)
+        converter = NoteToObsidianConverter(input_path, workers=workers, image_profile=image_profile)
         console.print(f"  Pages:     {converter.page_count}")
 
         with console.status("[bold green]Converting...", spinner="dots"):
-            md_path = converter.convert_to_markdown(output_path, img_dir, embed)
+            md_path = converter.convert_to_markdown(output_path, img_dir, embed, incremental=incremental)
 
         console.print(f"\n[bold green]SUCCESS![/bold green]")
         console.print(f"  Markdown: {md_path}")
-        console.print(f"  Images:   {converter.page_count} PNG files")
+        console.print(f"  Images:   {converter.page_count} {converter.image_suffix[1:].upper()} files")
+        if incremental:
+            console.print(f"  Rendered: {len(converter.rendered_pages)} changed pages")
 
     except Exception as e:
         console.print(f"[bold red]ERROR:[/bold red] {e}")
@@ -408,105 +540,277 @@ def status() -> None:
     console.print("\n[yellow]Not yet implemented - Coming soon![/yellow]")
 
 
+def _collect_note_files(patterns: tuple[str, ...]) -> list[Path]:
+    """Expand files, directories (searched recursively) and glob patterns to .note files.
+
+    Raises:
+        click.BadParameter: If an argument matches no file
+    """
+    note_files: list[Path] = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.note"))
+        elif path.exists():
+            matches = [path]
+        else:
+            matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+            if not matches:
+                raise click.BadParameter(f"No such file, directory or match: {pattern}")
+        note_files.extend(matches)
+    # A note matched by several arguments is listed once
+    return list(dict.fromkeys(note_files))
+
+
+def _summary_statistics(results: list[dict], elapsed: float) -> dict:
+    """Aggregate fast summaries of many notes."""
+    summaries = [result["summary"] for result in results if result["summary"]]
+    devices: dict[str, int] = {}
+    versions: dict[str, int] = {}
+    for summary in summaries:
+        devices[summary["device"]] = devices.get(summary["device"], 0) + 1
+        versions[summary["format_version"]] = versions.get(summary["format_version"], 0) + 1
+    return {
+        "files": len(results),
+        "failed": len(results) - len(summaries),
+        "pages": sum(summary["pages_count"] for summary in summaries),
+        "with_handwriting": sum(1 for summary in summaries if summary["has_handwriting"]),
+        "size_mb": round(sum(summary["file_size_mb"] for summary in summaries), 2),
+        "devices": devices,
+        "versions": versions,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
 @main.command()
-@click.argument("note_file", type=click.Path(exists=True))
+@click.argument("note_files", nargs=-1, required=True)
 @click.option("--save-images", type=click.Path(), help="Directory to save extracted PNG images")
-def inspect(note_file: str, save_images: str | None) -> None:
-    """Inspect a Supernote .note file structure.
+@click.option("--fast", is_flag=True, help="Only read the metadata blocks (no images or handwriting data); listings of several notes always do")
+@click.option("--index", "index_path", type=click.Path(dir_okay=False), default=None, help="With several notes: keep summaries in this SQLite index and only re-read changed notes")
+@click.option("--workers", default=0, type=click.IntRange(min=0), help="Processes used to read notes when listing many (0 = all CPU cores)")
+@click.option("--jsonl", is_flag=True, help="Print one JSON object per note as soon as it is read")
+@click.option("--stats", is_flag=True, help="Print aggregate statistics after the notes")
+def inspect(
+    note_files: tuple[str, ...],
+    save_images: str | None,
+    fast: bool,
+    index_path: str | None,
+    workers: int,
+    jsonl: bool,
+    stats: bool,
+) -> None:
+    """Inspect Supernote .note file structure.
+
+    Given several files, a directory (searched recursively) or a glob
+    pattern such as "backup/**/*.note", lists every note with a fast summary
+    read from the metadata blocks only, reading notes in parallel. Saving
+    images needs a single note; an index is only used for listings.
 
     Arguments:
-        NOTE_FILE: Path to .note file to inspect
+        NOTE_FILES: .note files, directories of .note files or glob patterns
     """
+    note_path = Path(note_files[0])
+    single = len(note_files) == 1 and note_path.is_file() and not (jsonl or stats)
+    if single and index_path:
+        raise click.UsageError("--index only applies when listing several notes")
+    if not single and save_images:
+        raise click.UsageError("--save-images only applies when inspecting a single note")
+
     try:
-        note_path = Path(note_file)
+        if not single:
+            started = time.perf_counter()
+            paths = _collect_note_files(note_files)
+
+            if index_path:
+                with NoteIndex(index_path) as index:
+                    # Refreshing directories also drops entries of deleted notes
+                    for pattern in note_files:
+                        if Path(pattern).is_dir():
+                            index.refresh(pattern)
+                    records = [index.get(path) for path in paths]
+                    index_stats = index.stats()
+                results = [
+                    {"path": str(path), "summary": record["summary"], "error": record["error"]}
+                    for path, record in zip(paths, records)
+                ]
+                stream = iter(results)
+                if not jsonl:
+                    console.print(
+                        f"Index: {index_stats['entries']} notes, "
+                        f"{index_stats['misses']} re-read"
+                    )
+            else:
+                results = []
+                stream = iter_note_summaries(paths, workers=workers)
+
+            if jsonl:
+                for result in stream:
+                    if not index_path:
+                        results.append(result)
+                    line = {"path": result["path"]}
+                    line.update(result["summary"] or {"error": result["error"]})
+                    click.echo(json.dumps(line))
+                if stats:
+                    statistics = _summary_statistics(results, time.perf_counter() - started)
+                    click.echo(json.dumps({"stats": statistics}))
+                return
+
+            if not index_path:
+                with console.status(f"[bold green]Reading {len(paths)} notes...", spinner="dots"):
+                    results = list(stream)
+
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("File", style="cyan")
+            table.add_column("Device")
+            table.add_column("Version")
+            table.add_column("Pages", justify="right")
+            table.add_column("Template")
+            table.add_column("Handwriting")
+            table.add_column("Size", justify="right")
+
+            failed = 0
+            for result in sorted(results, key=lambda result: result["path"]):
+                summary = result["summary"]
+                if result["error"]:
+                    failed += 1
+                    table.add_row(result["path"], f"[red]{result['error']}[/red]", "", "", "", "", "")
+                    continue
+                table.add_row(
+                    result["path"],
+                    summary["device"],
+                    summary["format_version"],
+                    str(summary["pages_count"]),
+                    summary["pdf_template"],
+                    "Yes" if summary["has_handwriting"] else "No",
+                    f"{summary['file_size_mb']} MB",
+                )
+
+            console.print(table)
+            elapsed = time.perf_counter() - started
+            console.print(
+                f"\n{len(results)} .note files summarized in {elapsed:.2f}s"
+                + (f" ([red]{failed} unreadable[/red])" if failed else "")
+            )
+            if stats:
+                statistics = _summary_statistics(results, elapsed)
+                table = Table(show_header=False, box=None, padding=(0, 2))
+                table.add_column("Statistic", style="cyan")
+                table.add_column("Value", style="white")
+                table.add_row("Notes", str(statistics["files"]))
+                table.add_row("Unreadable", str(statistics["failed"]))
+                table.add_row("Pages", str(statistics["pages"]))
+                table.add_row("With handwriting", str(statistics["with_handwriting"]))
+                table.add_row("Total size", f"{statistics['size_mb']} MB")
+                table.add_row("Devices", ", ".join(f"{device}: {count}" for device, count in sorted(statistics["devices"].items())))
+                table.add_row("Versions", ", ".join(f"{version}: {count}" for version, count in sorted(statistics["versions"].items())))
+                console.print(table)
+            return
+
+        if fast:
+            summary = read_note_summary(note_path)
+            table = Table(show_header=False, box=None, padding=(0, 2))
+            table.add_column("Property", style="cyan")
+            table.add_column("Value", style="white")
+            table.add_row("File name", summary["file_name"])
+            table.add_row("File size", f"{summary['file_size_mb']} MB")
+            table.add_row("Format version", summary["format_version"])
+            table.add_row("File type", summary["file_type"])
+            table.add_row("Device", summary["device"])
+            table.add_row("Language", summary["language"])
+            table.add_row("PDF template", summary["pdf_template"])
+            table.add_row("Pages", str(summary["pages_count"]))
+            table.add_row("Handwriting archive", f"{summary['zip_archive_size_kb']} KB")
+            table.add_row("Has handwriting", "Yes" if summary["has_handwriting"] else "No")
+            console.print(table)
+            return
 
         console.print(Panel.fit(
             f"[bold cyan]Inspecting Supernote .note File[/bold cyan]\n{note_path}",
             border_style="cyan"
         ))
 
-        # Parse the file
-        with console.status("[bold green]Parsing file...", spinner="dots"):
-            parser = NoteFileParser(note_path)
-            data = parser.parse()
-            summary = parser.get_summary()
-
-        # Display summary
-        console.print("\n[bold]File Summary:[/bold]")
-        table = Table(show_header=False, box=None, padding=(0, 2))
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="white")
-
-        table.add_row("File name", summary["file_name"])
-        table.add_row("File size", f"{summary['file_size_mb']} MB")
-        table.add_row("Format version", summary["format_version"])
-        table.add_row("File type", summary["file_type"])
-        table.add_row("Device", summary["device"])
-        table.add_row("Language", summary["language"])
-        table.add_row("PDF template", summary["pdf_template"])
-        table.add_row("Template MD5", summary["pdf_template_md5"][:32] + "..." if len(summary["pdf_template_md5"]) > 32 else summary["pdf_template_md5"])
-
-        console.print(table)
-
-        # Display PNG information
-        console.print(f"\n[bold]Embedded Images:[/bold]")
-        table = Table(show_header=False, box=None, padding=(0, 2))
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="white")
-
-        table.add_row("PNG count", str(summary["png_images_count"]))
-        table.add_row("Images size", f"{summary['png_images_size_mb']} MB")
-
-        if summary["png_images_count"] > 0:
-            # Get dimensions of first image
-            first_img = parser.get_png_image(0)
-            if first_img:
-                table.add_row("Dimensions", f"{first_img.width} x {first_img.height} pixels")
-                table.add_row("Mode", first_img.mode)
-
-        console.print(table)
-
-        # Display ZIP archive information
-        console.print(f"\n[bold]Handwriting Data (ZIP):[/bold]")
-        table = Table(show_header=False, box=None, padding=(0, 2))
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="white")
-
-        table.add_row("Archive size", f"{summary['zip_archive_size_kb']} KB")
-        table.add_row("Pages", str(summary["pages_count"]))
-        table.add_row("Has handwriting", "Yes" if summary["has_handwriting"] else "No")
-
-        # Show ZIP metadata if available
-        if "meta" in data["zip_contents"]:
-            meta = data["zip_contents"]["meta"]
-            table.add_row("Application", meta.get("Application", "Unknown"))
-            table.add_row("App version", meta.get("Application_Version", "Unknown"))
-            table.add_row("Format version", meta.get("format-version", "Unknown"))
-
-        console.print(table)
-
-        # Display page details
-        if data["zip_contents"].get("pages"):
-            console.print(f"\n[bold]Pages Detail:[/bold]")
-            pages_table = Table(show_header=True, box=None)
-            pages_table.add_column("Page ID", style="cyan")
-            pages_table.add_column("Has Content", style="white")
-            pages_table.add_column("Ink Size", style="white", justify="right")
-
-            for page_id, page_data in data["zip_contents"]["pages"].items():
-                has_content = "Yes" if page_data.get("has_content") else "No"
-                ink_size = f"{page_data.get('ink_size', 0) / 1024:.1f} KB" if page_data.get("ink_size") else "N/A"
-                pages_table.add_row(page_id, has_content, ink_size)
-
-            console.print(pages_table)
-
-        # Save images if requested
-        if save_images and summary["png_images_count"] > 0:
-            output_dir = Path(save_images)
-            console.print(f"\n[bold]Saving images to {output_dir}...[/bold]")
-            saved_files = parser.save_png_images(output_dir)
-            for f in saved_files:
-                console.print(f"  [green]OK[/green] {f.name}")
+        with NoteFileParser(note_path, lazy=True) as parser:
+            # Parse the file
+            with console.status("[bold green]Parsing file...", spinner="dots"):
+                data = parser.parse()
+                summary = parser.get_summary()
+
+            # Display summary
+            console.print("\n[bold]File Summary:[/bold]")
+            table = Table(show_header=False, box=None, padding=(0, 2))
+            table.add_column("Property", style="cyan")
+            table.add_column("Value", style="white")
+
+            table.add_row("File name", summary["file_name"])
+            table.add_row("File size", f"{summary['file_size_mb']} MB")
+            table.add_row("Format version", summary["format_version"])
+            table.add_row("File type", summary["file_type"])
+            table.add_row("Device", summary["device"])
+            table.add_row("Language", summary["language"])
+            table.add_row("PDF template", summary["pdf_template"])
+            table.add_row("Template MD5", summary["pdf_template_md5"][:32] + "..." if len(summary["pdf_template_md5"]) > 32 else summary["pdf_template_md5"])
+
+            console.print(table)
+
+            # Display PNG information
+            console.print(f"\n[bold]Embedded Images:[/bold]")
+            table = Table(show_header=False, box=None, padding=(0, 2))
+            table.add_column("Property", style="cyan")
+            table.add_column("Value", style="white")
+
+            table.add_row("PNG count", str(summary["png_images_count"]))
+            table.add_row("Images size", f"{summary['png_images_size_mb']} MB")
+
+            if summary["png_images_count"] > 0:
+                # Get dimensions of first image
+                first_img = parser.get_png_image(0)
+                if first_img:
+                    table.add_row("Dimensions", f"{first_img.width} x {first_img.height} pixels")
+                    table.add_row("Mode", first_img.mode)
+
+            console.print(table)
+
+            # Display ZIP archive information
+            console.print(f"\n[bold]Handwriting Data (ZIP):[/bold]")
+            table = Table(show_header=False, box=None, padding=(0, 2))
+            table.add_column("Property", style="cyan")
+            table.add_column("Value", style="white")
+
+            table.add_row("Archive size", f"{summary['zip_archive_size_kb']} KB")
+            table.add_row("Pages", str(summary["pages_count"]))
+            table.add_row("Has handwriting", "Yes" if summary["has_handwriting"] else "No")
+
+            # Show ZIP metadata if available
+            if "meta" in data["zip_contents"]:
+                meta = data["zip_contents"]["meta"]
+                table.add_row("Application", meta.get("Application", "Unknown"))
+                table.add_row("App version", meta.get("Application_Version", "Unknown"))
+                table.add_row("Format version", meta.get("format-version", "Unknown"))
+
+            console.print(table)
+
+            # Display page details
+            if data["zip_contents"].get("pages"):
+                console.print(f"\n[bold]Pages Detail:[/bold]")
+                pages_table = Table(show_header=True, box=None)
+                pages_table.add_column("Page ID", style="cyan")
+                pages_table.add_column("Has Content", style="white")
+                pages_table.add_column("Ink Size", style="white", justify="right")
+
+                for page_id, page_data in data["zip_contents"]["pages"].items():
+                    has_content = "Yes" if page_data.get("has_content") else "No"
+                    ink_size = f"{page_data.get('ink_size', 0) / 1024:.1f} KB" if page_data.get("ink_size") else "N/A"
+                    pages_table.add_row(page_id, has_content, ink_size)
+
+                console.print(pages_table)
+
+            # Save images if requested
+            if save_images and summary["png_images_count"] > 0:
+                output_dir = Path(save_images)
+                console.print(f"\n[bold]Saving images to {output_dir}...[/bold]")
+                saved_files = parser.save_png_images(output_dir)
+                for f in saved_files:
+                    console.print(f"  [green]OK[/green] {f.name}")
 
         console.print(f"\n[bold green]SUCCESS: Inspection complete![/bold green]")
 
@@ -0,0 +1,202 @@
+"""Plan the blocks of a .note file and write them with as few syscalls as possible.
+
+A .note file is a sequence of length-prefixed blocks that only ever reference
+blocks written before them (the footer address comes last). That allows a
+single forward pass: every block is assigned its address when it is added,
+and the finished file is emitted as one vectored write (os.writev) straight
+from the collected chunks, without copying them into one buffer first.
+"""
+
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+# Per-call iovec limit; Linux and macOS use 1024
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+# Without os.writev (Windows), chunks smaller than this are joined before writing
+_COALESCE_LIMIT = 64 * 1024
+
+Chunk = Union[bytes, bytearray, memoryview]
+
+
+class NoteLayout:
+    """Assign addresses to .note blocks and write them out in one go.
+
+    Example:
+        layout = NoteLayout()
+        layout.add_raw(b"note" + b"SN_FILE_VER_20230015")
+        header_address = layout.add_block("<FILE_TYPE:NOTE>")
+        ...
+        footer_address = layout.add_block(footer)
+        layout.add_raw(b"tail")
+        layout.add_address(footer_address)
+        layout.write(output_path)
+
+    Chunks are kept by reference, so page images are never copied. For
+    writers that cannot hold the whole file, flush() writes the pending
+    chunks to an open file and keeps counting addresses from there.
+
+    Blocks added with add_unique_block() are content-addressed: adding the
+    same key again returns the address of the block stored first, the way
+    identical background pages share one PNG block.
+    """
+
+    LENGTH_FIELD_SIZE = 4
+
+    def __init__(self, start: int = 0) -> None:
+        """Initialize an empty layout.
+
+        Args:
+            start: Address of the first added byte (the size of an existing
+                   file when appending to it)
+        """
+        self._chunks: List[Chunk] = []
+        self._unique_blocks: Dict[str, int] = {}
+        self.size = start
+
+    def add_raw(self, data: Chunk) -> int:
+        """Append bytes without a length prefix.
+
+        Args:
+            data: Bytes to append
+
+        Returns:
+            Address of the data
+        """
+        address = self.size
+        if len(data):
+            self._chunks.append(data)
+            self.size += len(data)
+        return address
+
+    def add_block(self, data: Union[Chunk, str]) -> int:
+        """Append a length-prefixed block.
+
+        Args:
+            data: Block content; strings are UTF-8 encoded (once)
+
+        Returns:
+            Address of the block's length field
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        address = self.size
+        self._chunks.append(struct.pack("<I", len(data)))
+        self.size += self.LENGTH_FIELD_SIZE
+        self.add_raw(data)
+        return address
+
+    def add_unique_block(self, data: Chunk, key: str) -> int:
+        """Append a length-prefixed block unless a block with the same key exists.
+
+        Args:
+            data: Block content
+            key: Content hash identifying the block (e.g. the PNG's MD5)
+
+        Returns:
+            Address of the new block, or of the block stored earlier for key
+        """
+        address = self._unique_blocks.get(key)
+        if address is None:
+            address = self._unique_blocks[key] = self.add_block(data)
+        return address
+
+    def register_unique_block(self, key: str, address: int) -> None:
+        """Make an already written block (e.g. of a file being appended to) reusable."""
+        self._unique_blocks.setdefault(key, address)
+
+    def add_address(self, address: int) -> None:
+        """Append a 4-byte little-endian address (e.g. the trailing footer address)."""
+        self.add_raw(struct.pack("<I", address))
+
+    def to_bytes(self) -> bytes:
+        """Return the pending (unflushed) contents of the layout."""
+        return b"".join(self._chunks)
+
+    def write(self, output_path: Union[str, os.PathLike], skip_unchanged: bool = False) -> bool:
+        """Write the layout to a new file.
+
+        Args:
+            output_path: Path to output file (overwritten if it exists)
+            skip_unchanged: Leave an existing file alone if it already holds
+                            exactly these bytes (keeps its mtime, so sync tools
+                            and file watchers see no change)
+
+        Returns:
+            False if the write was skipped, True otherwise
+        """
+        if skip_unchanged and self.matches_file(output_path):
+            self._chunks = []
+            return False
+        with open(output_path, "wb", buffering=0) as f:
+            self.flush(f)
+        return True
+
+    def matches_file(self, path: Union[str, os.PathLike]) -> bool:
+        """Check whether a file consists of exactly the pending chunks."""
+        try:
+            if os.path.getsize(path) != sum(len(chunk) for chunk in self._chunks):
+                return False
+            with open(path, "rb") as f:
+                return all(f.read(len(chunk)) == chunk for chunk in self._chunks)
+        except OSError:
+            return False
+
+    def flush(self, f: BinaryIO) -> None:
+        """Write all pending chunks to an open file and release them.
+
+        Addresses keep counting from the current size, so the layout can be
+        flushed repeatedly while a file is being produced incrementally. The
+        file must be positioned at the address of the first pending chunk.
+
+        Args:
+            f: Binary file opened for writing (preferably unbuffered)
+        """
+        chunks, self._chunks = self._chunks, []
+        if not chunks:
+            return
+        if hasattr(os, "writev"):
+            f.flush()
+            _writev_all(f.fileno(), chunks)
+        else:
+            for chunk in _coalesce(chunks):
+                f.write(chunk)
+
+
+def _writev_all(fd: int, chunks: List[Chunk]) -> None:
+    """Write every chunk with os.writev, resuming after short writes."""
+    views = [memoryview(chunk) for chunk in chunks]
+    index = 0
+    while index < len(views):
+        written = os.writev(fd, views[index : index + _IOV_MAX])
+        while index < len(views) and written >= len(views[index]):
+            written -= len(views[index])
+            index += 1
+        if written:
+            views[index] = views[index][written:]
+
+
+def _coalesce(chunks: List[Chunk]) -> Iterator[Chunk]:
+    """Join runs of small chunks so each write call moves a useful amount of data."""
+    pending: List[Chunk] = []
+    pending_size = 0
+    for chunk in chunks:
+        if len(chunk) >= _COALESCE_LIMIT:
+            if pending:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+            yield chunk
+        else:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= _COALESCE_LIMIT:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+    if pending:
+        yield b"".join(pending)
@@ -1,12 +1,78 @@
 """Convert Supernote .note files to Obsidian-compatible formats (PNG, Markdown)."""
 
+import json
+import math
+import os
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from os import cpu_count
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Deque, Dict, List, Optional, Sequence
 from datetime import datetime
 
-from supernotelib import load_notebook
+import supernotelib
+from PIL import Image
+from supernotelib import fileformat, load_notebook
 from supernotelib.converter import ImageConverter
 
+from obsidian_supernote.converters.page_image import (
+    DEFAULT_IMAGE_PROFILE,
+    image_suffix,
+    save_page_image,
+    validate_image_profile,
+)
+from obsidian_supernote.parsers.note_parser import (
+    NoteFileParser,
+    page_content_hash,
+    read_note_page,
+)
+
+# Bump when page hashing or the manifest format changes
+EXPORT_MANIFEST_VERSION = 2
+
+# Import date in the frontmatter of an exported Markdown file
+_IMPORTED_PATTERN = re.compile(r"^imported: (.+)$", re.MULTILINE)
+
+# Image converter of the notebook loaded by each export worker process, and
+# the image profile its pages are saved with
+_worker_converter: Optional[ImageConverter] = None
+_worker_profile = DEFAULT_IMAGE_PROFILE
+
+
+def _init_export_worker(note_path: str, image_profile: str) -> None:
+    """Load the notebook once per worker process."""
+    global _worker_converter, _worker_profile
+    _worker_converter = ImageConverter(load_notebook(note_path))
+    _worker_profile = image_profile
+
+
+def _export_pages_in_worker(page_numbers: List[int], output_paths: List[Path]) -> None:
+    """Render and save a slice of pages in a worker process."""
+    _export_pages(_worker_converter, page_numbers, output_paths, _worker_profile)
+
+
+def _export_pages(
+    image_converter: ImageConverter,
+    page_numbers: Sequence[int],
+    output_paths: Sequence[Path],
+    image_profile: str = DEFAULT_IMAGE_PROFILE,
+) -> None:
+    """Render pages, saving each image in a thread while the next page renders.
+
+    At most one page waits to be saved, so memory stays bounded.
+    """
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        pending: Optional[Future] = None
+        for page_num, output_path in zip(page_numbers, output_paths):
+            img = image_converter.convert(page_num)
+            if pending is not None:
+                pending.result()
+            pending = saver.submit(save_page_image, img, output_path, image_profile)
+        if pending is not None:
+            pending.result()
+
 
 class NoteToObsidianConverter:
     """Convert Supernote .note files to PNG images and Markdown.
@@ -14,15 +80,39 @@ class NoteToObsidianConverter:
     Uses supernotelib to parse .note files and render pages as images.
     """
 
-    def __init__(self, note_path: Path):
+    # Slices per worker when exporting across processes; smaller slices
+    # even out pages that take longer to render
+    SLICES_PER_WORKER = 4
+
+    def __init__(
+        self,
+        note_path: Path,
+        workers: int = 1,
+        image_profile: str = DEFAULT_IMAGE_PROFILE,
+    ):
         """Initialize converter with a .note file.
 
         Args:
             note_path: Path to Supernote .note file
+            workers: Processes used to render pages when exporting all pages
+                     (0 = all CPU cores, 1 = render in this process)
+            image_profile: Format pages are saved in, one of IMAGE_PROFILES
+                           (png, png-fast, png-small, gray4, bw, webp)
+
+        Raises:
+            ValueError: If workers is negative or the image profile is unknown
         """
+        if workers < 0:
+            raise ValueError(f"workers must be >= 0, got {workers}")
+        validate_image_profile(image_profile)
+
         self.note_path = Path(note_path)
+        self.workers = workers or cpu_count() or 1
+        self.image_profile = image_profile
         self.notebook = load_notebook(str(self.note_path))
         self.image_converter = ImageConverter(self.notebook)
+        # Pages (0-indexed) rendered by the last convert_all_pages_to_png call
+        self.rendered_pages: List[int] = []
 
     @property
     def page_count(self) -> int:
@@ -37,58 +127,202 @@ class NoteToObsidianConverter:
         except Exception:
             return None
 
+    @property
+    def image_suffix(self) -> str:
+        """File suffix of exported page images (.png or .webp)."""
+        return image_suffix(self.image_profile)
+
     def convert_page_to_png(self, page_num: int, output_path: Path) -> Path:
-        """Convert a single page to PNG.
+        """Convert a single page to an image, saved with the image profile.
 
         Args:
             page_num: Page number (0-indexed)
-            output_path: Path to save PNG file
+            output_path: Path to save the image file
 
         Returns:
-            Path to saved PNG file
+            Path to saved image file
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         img = self.image_converter.convert(page_num)
-        img.save(output_path, "PNG")
+        return save_page_image(img, output_path, self.image_profile)
 
-        return output_path
+    def convert_all_pages_to_png(self, output_dir: Path, incremental: bool = False) -> List[Path]:
+        """Convert all pages to images (PNG, or WebP with the webp profile).
+
+        Image encoding and writing overlap with rendering the next page. With
+        more than one worker, pages are rendered across a process pool in
+        which every worker loads the notebook once and renders contiguous
+        slices of pages.
 
-    def convert_all_pages_to_png(self, output_dir: Path) -> List[Path]:
-        """Convert all pages to PNG images.
+        In incremental mode an export manifest next to the images records a
+        hash of every page's layers and rendering metadata. Pages whose hash
+        is unchanged (and whose image still exists) are not rendered again,
+        and images of pages that no longer exist are removed.
 
         Args:
-            output_dir: Directory to save PNG files
+            output_dir: Directory to save image files
+            incremental: Only render pages that changed since the last export
 
         Returns:
-            List of paths to saved PNG files
+            List of paths to saved image files, in page order
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        saved_files = []
         stem = self.note_path.stem
+        page_numbers = list(range(self.page_count))
+        saved_files = [
+            output_dir / f"{stem}_page_{page_num + 1:02d}{self.image_suffix}"
+            for page_num in page_numbers
+        ]
+
+        if not incremental:
+            self._export(page_numbers, saved_files)
+            self.rendered_pages = page_numbers
+            return saved_files
+
+        manifest_path = output_dir / f".{stem}.export.json"
+        previous = self._load_manifest(manifest_path)
+        hashes = self.page_hashes()
+        changed = [
+            page_num
+            for page_num in page_numbers
+            if hashes is None
+            or previous.get(saved_files[page_num].name) != hashes[page_num]
+            or not saved_files[page_num].exists()
+        ]
+        self._export(changed, [saved_files[page_num] for page_num in changed])
+        self.rendered_pages = changed
+
+        # Images of pages that were removed from the note, or that were
+        # written with a profile of another file type. The manifest is just
+        # a file in the vault, so only names of this note's page images are
+        # ever deleted
+        current_names = {path.name for path in saved_files}
+        page_image = re.compile(rf"{re.escape(stem)}_page_\d+\.(png|webp)")
+        for name in previous:
+            if name in current_names or "/" in name or "\\" in name:
+                continue
+            if page_image.fullmatch(name):
+                (output_dir / name).unlink(missing_ok=True)
+
+        if hashes is None:
+            manifest_path.unlink(missing_ok=True)
+        else:
+            self._save_manifest(
+                manifest_path,
+                {path.name: page_hash for path, page_hash in zip(saved_files, hashes)},
+            )
+        return saved_files
 
-        for page_num in range(self.page_count):
-            output_path = output_dir / f"{stem}_page_{page_num + 1:02d}.png"
-            self.convert_page_to_png(page_num, output_path)
-            saved_files.append(output_path)
+    def page_hashes(self) -> Optional[List[str]]:
+        """Hash what every page's image is made from.
 
-        return saved_files
+        The hash covers the page's layer blocks, its rendering metadata and
+        the image profile it is saved with.
+
+        Returns:
+            Hex digest per page, or None if the file's block structure can't
+            be read (every page then counts as changed)
+        """
+        try:
+            with NoteFileParser(self.note_path, mode="structured", lazy=True) as parser:
+                parser.parse(read_handwriting=False)
+                if len(parser.pages) != self.page_count:
+                    return None
+
+                # Page size and color decoding depend on the device and version
+                file_key = (
+                    f"{EXPORT_MANIFEST_VERSION}|{supernotelib.__version__}|{self.image_profile}|"
+                    f"{parser.metadata.get('apply_equipment', '')}|"
+                    f"{parser.metadata.get('file_version', '')}|"
+                )
+                return [
+                    page_content_hash(
+                        page["metadata"],
+                        (
+                            (layer_name, layer["protocol"], parser.get_layer_data(index, layer_name))
+                            for layer_name, layer in page["layers"].items()
+                        ),
+                        file_key,
+                    )
+                    for index, page in enumerate(parser.pages)
+                ]
+        except ValueError:
+            return None
+
+    def _export(self, page_numbers: List[int], output_paths: List[Path]) -> None:
+        """Render pages to image files, across a process pool if configured."""
+        workers = min(self.workers, len(page_numbers))
+        if workers <= 1:
+            _export_pages(self.image_converter, page_numbers, output_paths, self.image_profile)
+            return
+
+        slice_size = math.ceil(len(page_numbers) / (workers * self.SLICES_PER_WORKER))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_export_worker,
+            initargs=(str(self.note_path), self.image_profile),
+        ) as pool:
+            pending: Deque[Future] = deque(
+                pool.submit(
+                    _export_pages_in_worker,
+                    page_numbers[start : start + slice_size],
+                    output_paths[start : start + slice_size],
+                )
+                for start in range(0, len(page_numbers), slice_size)
+            )
+            # Surface the first failure, in page order
+            while pending:
+                pending.popleft().result()
+
+    def _load_manifest(self, manifest_path: Path) -> Dict[str, str]:
+        """Load the page hashes of the last export, if they are still comparable."""
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != EXPORT_MANIFEST_VERSION:
+            return {}
+        pages = manifest.get("pages")
+        return pages if isinstance(pages, dict) else {}
+
+    def _save_manifest(self, manifest_path: Path, pages: Dict[str, str]) -> None:
+        """Write the export manifest atomically."""
+        manifest: Dict[str, Any] = {
+            "version": EXPORT_MANIFEST_VERSION,
+            "note": self.note_path.name,
+            "pages": pages,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=manifest_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_name, manifest_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
 
     def convert_to_markdown(
         self,
         output_path: Path,
         image_dir: Optional[Path] = None,
         embed_images: bool = True,
+        incremental: bool = False,
     ) -> Path:
         """Convert .note file to Markdown with embedded/linked images.
 
+        The Markdown file is not rewritten if its content is unchanged.
+
         Args:
             output_path: Path to save Markdown file
             image_dir: Directory to save images (default: same as markdown)
             embed_images: If True, use Obsidian image embeds (![[image]])
+            incremental: Only render pages that changed since the last
+                         export, and keep the import date of an existing
+                         Markdown file
 
         Returns:
             Path to saved Markdown file
@@ -99,14 +333,24 @@ class NoteToObsidianConverter:
         if image_dir is None:
             image_dir = output_path.parent
 
-        # Convert all pages to PNG
-        png_files = self.convert_all_pages_to_png(image_dir)
+        # Convert all pages to images
+        png_files = self.convert_all_pages_to_png(image_dir, incremental=incremental)
+
+        try:
+            existing = output_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            existing = None
 
         # Build markdown content
-        md_content = self._build_markdown(png_files, embed_images)
+        imported = None
+        if incremental and existing is not None:
+            match = _IMPORTED_PATTERN.search(existing)
+            imported = match.group(1) if match else None
+        md_content = self._build_markdown(png_files, embed_images, imported=imported)
 
-        # Write markdown file
-        output_path.write_text(md_content, encoding="utf-8")
+        # Write markdown file, leaving an identical one untouched
+        if md_content != existing:
+            output_path.write_text(md_content, encoding="utf-8")
 
         return output_path
 
@@ -114,12 +358,14 @@ class NoteToObsidianConverter:
         self,
         png_files: List[Path],
         embed_images: bool = True,
+        imported: Optional[str] = None,
     ) -> str:
         """Build markdown content with frontmatter and image embeds.
 
         Args:
-            png_files: List of PNG file paths
+            png_files: List of page image paths
             embed_images: If True, use Obsidian image embeds
+            imported: Import date for the frontmatter (default: today)
 
         Returns:
             Markdown content string
@@ -128,7 +374,7 @@ class NoteToObsidianConverter:
 
         # YAML frontmatter
         title = self.title or self.note_path.stem
-        now = datetime.now().strftime("%Y-%m-%d")
+        now = imported or datetime.now().strftime("%Y-%m-%d")
 
         lines.append("---")
         lines.append(f"title: \"{title}\"")
@@ -158,27 +404,83 @@ class NoteToObsidianConverter:
         return "\n".join(lines)
 
 
+def render_note_page(note_path: str | Path, page_num: int) -> Image.Image:
+    """Render a single page without loading the rest of the notebook.
+
+    load_notebook() parses every page and reads every layer before a page
+    can be rendered. This reads the shared metadata and the page's own
+    blocks through the footer's page address table (see read_note_page())
+    and renders them with supernotelib, so rendering a page of a long
+    notebook costs the same as rendering one of a short notebook.
+    Pages without layers, which keep a single bitmap under DATA, are
+    rendered from that bitmap.
+
+    Args:
+        note_path: Path to .note file
+        page_num: Page number (0-indexed)
+
+    Returns:
+        Rendered page, as NoteToObsidianConverter renders it
+
+    Raises:
+        IndexError: If the note has no such page
+        ValueError: If the file is not a .note file, a block is invalid or
+            the page has neither layers nor a bitmap
+    """
+    page = read_note_page(note_path, page_num)
+
+    page_info = dict(page["metadata"])
+    if page["layers"]:
+        page_info[fileformat.KEY_LAYERS] = [layer["metadata"] for layer in page["layers"]]
+    elif page["data"] is None:
+        raise ValueError(f"Page {page_num} has neither layers nor a bitmap")
+    metadata = fileformat.SupernoteMetadata()
+    metadata.type = "note"
+    metadata.signature = page["signature"]
+    metadata.header = page["header"]
+    metadata.footer = page["footer"]
+    metadata.pages = [page_info]
+
+    # A one-page notebook: covers, keywords, titles and links are not needed
+    notebook = fileformat.Notebook(metadata)
+    notebook.get_page(0).set_content(page["data"])
+    for layer, content in zip(notebook.get_page(0).get_layers(), page["layers"]):
+        layer.set_content(content["data"])
+    return ImageConverter(notebook).convert(0)
+
+
 def convert_note_to_png(
     note_path: str | Path,
     output_dir: str | Path,
+    workers: int = 1,
+    incremental: bool = False,
+    image_profile: str = DEFAULT_IMAGE_PROFILE,
 ) -> List[Path]:
     """Convenience function to convert .note file to PNG images.
 
     Args:
         note_path: Path to .note file
-        output_dir: Directory to save PNG files
+        output_dir: Directory to save image files
+        workers: Processes used to render pages (0 = all CPU cores)
+        incremental: Only render pages that changed since the last export
+        image_profile: Format pages are saved in, one of IMAGE_PROFILES
 
     Returns:
-        List of paths to saved PNG files
+        List of paths to saved image files
     """
-    converter = NoteToObsidianConverter(Path(note_path))
-    return converter.convert_all_pages_to_png(Path(output_dir))
+    converter = NoteToObsidianConverter(
+        Path(note_path), workers=workers, image_profile=image_profile
+    )
+    return converter.convert_all_pages_to_png(Path(output_dir), incremental=incremental)
 
 
 def convert_note_to_markdown(
     note_path: str | Path,
     output_path: str | Path,
     image_dir: Optional[str | Path] = None,
+    workers: int = 1,
+    incremental: bool = False,
+    image_profile: str = DEFAULT_IMAGE_PROFILE,
 ) -> Path:
     """Convenience function to convert .note file to Markdown.
 
@@ -186,10 +488,15 @@ def convert_note_to_markdown(
         note_path: Path to .note file
         output_path: Path to save Markdown file
         image_dir: Optional directory for images
+        workers: Processes used to render pages (0 = all CPU cores)
+        incremental: Only render pages that changed since the last export
+        image_profile: Format pages are saved in, one of IMAGE_PROFILES
 
     Returns:
         Path to saved Markdown file
     """
-    converter = NoteToObsidianConverter(Path(note_path))
+    converter = NoteToObsidianConverter(
+        Path(note_path), workers=workers, image_profile=image_profile
+    )
     img_dir = Path(image_dir) if image_dir else None
-    return converter.convert_to_markdown(Path(output_path), img_dir)
+    return converter.convert_to_markdown(Path(output_path), img_dir, incremental=incremental)
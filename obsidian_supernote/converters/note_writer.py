@@ -2,26 +2,248 @@
 
 import hashlib
 import base64
+import filecmp
 import json
+import logging
+import os
+import re
+import shutil
 import struct
 import random
 import string
 import tempfile
-from datetime import datetime
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from io import BytesIO
+from os import cpu_count
 from pathlib import Path
-from typing import List, Tuple, Optional
+from itertools import chain
+from typing import (
+    BinaryIO, Callable, Deque, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Optional,
+)
 
 import fitz  # PyMuPDF
 from PIL import Image
 
+from obsidian_supernote.converters.note_layout import NoteLayout
+from obsidian_supernote.converters.page_cache import PageCache, get_page_cache
 from obsidian_supernote.converters.pandoc_converter import PandocConverter
+from obsidian_supernote.converters.quantize import (
+    DEFAULT_GRAY_LEVELS,
+    QUANTIZE_MODES,
+    encode_quantized_png,
+    validate_quantize_options,
+)
+from obsidian_supernote.converters.ratta_rle import blank_layer_rle
+from obsidian_supernote.converters.template_cache import TemplateCache, get_template_cache
+from obsidian_supernote.utils.page_ranges import parse_page_ranges
 from obsidian_supernote.utils.frontmatter import (
     read_markdown_with_frontmatter,
     update_frontmatter_file_reference,
 )
+from obsidian_supernote.parsers.note_index import NoteIndex
 from obsidian_supernote.parsers.note_parser import NoteFileParser
 
+logger = logging.getLogger(__name__)
+
+
+class _PageRenderSettings(NamedTuple):
+    """Picklable render parameters shared with page rendering workers."""
+
+    width: int
+    height: int
+    dpi: int
+    render_mode: str = "resample"
+    color_mode: str = "rgba"
+    quantize: str = "off"
+    gray_levels: int = DEFAULT_GRAY_LEVELS
+
+
+# PDF document opened once per rendering worker process (see _init_render_worker)
+_worker_doc: Optional[fitz.Document] = None
+
+
+def _render_page_to_png(page: fitz.Page, settings: _PageRenderSettings) -> bytes:
+    """Render a single PDF page to device-sized PNG bytes.
+
+    Args:
+        page: PyMuPDF page to render
+        settings: Target dimensions, rendering DPI, render and color mode
+
+    Returns:
+        PNG image data as bytes
+    """
+    if settings.render_mode == "fit":
+        pix = _render_page_fitted(page, settings)
+        if settings.quantize == "off":
+            return pix.tobytes("png")
+        # Quantizing implies gray mode, so the pixmap is single-channel already
+        return _encode_page_image(Image.frombytes("L", [pix.width, pix.height], pix.samples), settings)
+
+    # Calculate zoom factor for target DPI
+    zoom = settings.dpi / 72.0  # PDF is 72 DPI by default
+    mat = fitz.Matrix(zoom, zoom)
+
+    # Render page to pixmap; grayscale pages stay single-channel throughout
+    if settings.color_mode == "gray":
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        img = Image.frombytes("L", [pix.width, pix.height], pix.samples)
+    else:
+        pix = page.get_pixmap(matrix=mat, alpha=True)
+        img = Image.frombytes("RGBA", [pix.width, pix.height], pix.samples)
+
+    # Resize to Supernote dimensions
+    img = img.resize((settings.width, settings.height), Image.Resampling.LANCZOS)
+
+    return _encode_page_image(img, settings)
+
+
+def _encode_page_image(img: Image.Image, settings: _PageRenderSettings) -> bytes:
+    """Encode a device-sized page image as PNG, quantizing it if enabled."""
+    if settings.quantize != "off":
+        if img.mode != "L":
+            img = _flatten_to_grayscale(img)
+        return encode_quantized_png(img, settings.gray_levels, settings.quantize)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render_page_fitted(page: fitz.Page, settings: _PageRenderSettings) -> fitz.Pixmap:
+    """Rasterize a page straight to device pixels, letterboxed if needed.
+
+    The page is scaled uniformly so it fits the device screen and centered;
+    the matrix carries the centering offset, so the rendered pixmap already
+    sits at its final position and is copied onto a device-sized canvas
+    (transparent for RGBA, white for grayscale). No intermediate resize
+    pass is needed.
+
+    Args:
+        page: PyMuPDF page to render
+        settings: Target dimensions and color mode
+
+    Returns:
+        Pixmap of exactly settings.width x settings.height pixels
+    """
+    rect = page.rect
+    scale = min(settings.width / rect.width, settings.height / rect.height)
+    offset_x = (settings.width - rect.width * scale) / 2 - rect.x0 * scale
+    offset_y = (settings.height - rect.height * scale) / 2 - rect.y0 * scale
+    mat = fitz.Matrix(scale, 0, 0, scale, offset_x, offset_y)
+
+    if settings.color_mode == "gray":
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+    else:
+        pix = page.get_pixmap(matrix=mat, alpha=True)
+
+    target = fitz.IRect(0, 0, settings.width, settings.height)
+    if pix.irect == target:
+        return pix
+
+    canvas = fitz.Pixmap(pix.colorspace, target, pix.alpha)
+    if pix.alpha:
+        canvas.clear_with()  # all samples zero, i.e. fully transparent
+    else:
+        canvas.clear_with(255)  # white paper
+    canvas.copy(pix, pix.irect)  # copy() clips to the canvas bounds
+    return canvas
+
+
+def _flatten_to_grayscale(img: Image.Image) -> Image.Image:
+    """Convert an image to 8-bit grayscale, placing transparency on white."""
+    if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+        rgba = img.convert("RGBA")
+        img = Image.new("RGBA", rgba.size, "white")
+        img.alpha_composite(rgba)
+    return img.convert("L")
+
+
+def _load_image_page(image_path: Path, settings: _PageRenderSettings) -> bytes:
+    """Load an image file and encode it as a device-sized page.
+
+    JPEGs are decoded in draft mode: libjpeg scales them down by 1/2, 1/4 or
+    1/8 while decoding (never below the device size), so large photos are not
+    fully decoded only to be shrunk afterwards. Decoding, resizing and
+    encoding release the GIL, so pages can be loaded in threads.
+
+    Args:
+        image_path: Path to the image file
+        settings: Target dimensions and color mode
+
+    Returns:
+        Encoded page image
+    """
+    size = (settings.width, settings.height)
+    with Image.open(image_path) as img:
+        # No-op for formats without draft support
+        img.draft("L" if settings.color_mode == "gray" else "RGB", size)
+        if settings.color_mode == "gray":
+            # Drop to one channel before resizing so every pass is cheaper
+            img = _flatten_to_grayscale(img)
+        if img.size != size:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        return _encode_page_image(img, settings)
+
+
+def _init_render_worker(pdf_path: str) -> None:
+    """Open the PDF once in each rendering worker process."""
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _render_pages_in_worker(
+    page_numbers: List[int],
+    settings: _PageRenderSettings,
+) -> List[bytes]:
+    """Render a batch of pages using the worker's own document handle."""
+    assert _worker_doc is not None, "render worker was not initialized"
+    return [_render_page_to_png(_worker_doc[n], settings) for n in page_numbers]
+
+
+# <KEY:VALUE> metadata tags; values never contain angle brackets
+_TAG_PATTERN = re.compile(r"<([^:<>]+):([^<>]*)>")
+
+
+def _read_block(f: BinaryIO, address: int) -> bytes:
+    """Read the length-prefixed block at address from an open .note file."""
+    f.seek(address)
+    length_field = f.read(4)
+    if len(length_field) != 4:
+        raise ValueError(f"Block address {address} is past the end of the file")
+    length = struct.unpack("<I", length_field)[0]
+    data = f.read(length)
+    if len(data) != length:
+        raise ValueError(f"Block at {address} is truncated")
+    return data
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (size, mtime_ns) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _parse_tags(content: str) -> List[Tuple[str, str]]:
+    """Split metadata content into (key, value) pairs, keeping their order."""
+    return _TAG_PATTERN.findall(content)
+
+
+def _replace_tags(content: str, replacements: dict) -> str:
+    """Replace the values of existing tags, leaving all other tags untouched."""
+    def replace(match: "re.Match[str]") -> str:
+        key = match.group(1)
+        if key in replacements:
+            return f"<{key}:{replacements[key]}>"
+        return match.group(0)
+
+    return _TAG_PATTERN.sub(replace, content)
+
 
 class NoteFileWriter:
     """Create Supernote .note files from PDF files or images.
@@ -64,7 +286,8 @@ class NoteFileWriter:
     ALL_LAYER_NAMES = ["MAINLAYER", "LAYER1", "LAYER2", "LAYER3", "BGLAYER"]
     ACTIVE_LAYERS = ["MAINLAYER", "BGLAYER"]  # Layers with actual content
 
-    # Empty layer RLE data (600 bytes of 0x62 0xff pattern = blank white layer)
+    # Empty A5X2 layer RLE data (600 bytes of 0x62 0xff pattern = blank white
+    # layer); see self.empty_layer_rle for the current device
     EMPTY_LAYER_RLE = bytes([0x62, 0xff] * 300)  # 600 bytes
 
     # Device equipment name mapping (internal codes used by device)
@@ -77,19 +300,84 @@ class NoteFileWriter:
         "Nomad": "A6X2",   # Alias for A6X2
     }
 
+    # Pages handed to a rendering worker at a time; small enough to keep all
+    # workers busy until the end, large enough to amortize the IPC round trip
+    RENDER_BATCH_SIZE = 4
+
+    # PDF page render modes:
+    # - resample: render at the requested DPI, then LANCZOS-resize to the device size
+    # - fit: render directly at device pixels (uniform scale, letterboxed; DPI unused)
+    RENDER_MODES = ("resample", "fit")
+
+    # Background page color modes:
+    # - rgba: full-color PNG with transparency (historic output)
+    # - gray: 8-bit single-channel PNG without alpha, matching the e-ink panel
+    COLOR_MODES = ("rgba", "gray")
+
     def __init__(
         self,
         device: str = "A5X2",
         language: str = "en_GB",
+        workers: int = 1,
+        render_mode: str = "resample",
+        color_mode: str = "rgba",
+        quantize: str = "off",
+        gray_levels: int = DEFAULT_GRAY_LEVELS,
+        streaming: bool = False,
+        page_cache: Optional[PageCache] = None,
+        deterministic: bool = False,
+        template_cache: Optional[TemplateCache] = None,
     ):
         """Initialize the note writer.
 
         Args:
             device: Target Supernote device (A5X, A5X2/Manta, A6X, A6X2/Nomad)
             language: Recognition language (en_GB, en_US, etc.)
+            workers: Number of processes used to render PDF pages, or threads
+                     used to load images (1 works in-process, 0 uses all CPU cores)
+            render_mode: How PDF pages are rasterized ("resample" or "fit")
+            color_mode: Pixel format of background pages ("rgba" or "gray")
+            quantize: Map backgrounds onto the panel's gray levels before encoding
+                      ("off", "levels", "ordered" or "diffusion"); implies gray mode
+            gray_levels: Number of gray levels used when quantizing
+            streaming: Write PDF pages to the .note file as they are rendered
+                       instead of collecting them all in memory first
+            page_cache: Cache of rendered pages; unchanged PDF pages are read
+                        from it instead of being rendered again
+            deterministic: Derive file and page IDs from the page content and
+                           conversion options, so identical input produces an
+                           identical file, and skip writing an output file that
+                           already holds exactly the new bytes
+            template_cache: Registry of prepared PNG templates; a template is
+                            resized and encoded once per device and reused
         """
+        if workers < 0:
+            raise ValueError(f"workers must be >= 0, got {workers}")
+        if render_mode not in self.RENDER_MODES:
+            raise ValueError(
+                f"Unknown render mode '{render_mode}' (expected one of {', '.join(self.RENDER_MODES)})"
+            )
+        if color_mode not in self.COLOR_MODES:
+            raise ValueError(
+                f"Unknown color mode '{color_mode}' (expected one of {', '.join(self.COLOR_MODES)})"
+            )
+        validate_quantize_options(quantize, gray_levels)
+
         self.device = device
         self.language = language
+        self.workers = workers or cpu_count() or 1
+        self.render_mode = render_mode
+        # Quantized pages are always grayscale palette images
+        self.color_mode = "gray" if quantize != "off" else color_mode
+        self.quantize = quantize
+        self.gray_levels = gray_levels
+        self.streaming = streaming
+        self.page_cache = page_cache
+        self.deterministic = deterministic
+        self.template_cache = template_cache
+        # Set when the last write found identical output and left it untouched
+        self.last_write_skipped = False
+        self._id_rng: Optional[random.Random] = None
 
         # Set device-specific dimensions
         if device in self.DEVICE_SPECS:
@@ -98,12 +386,16 @@ class NoteFileWriter:
             # Default to A5X2 (Manta) for unknown devices
             self.template_width, self.template_height, self.native_dpi = self.DEVICE_SPECS["A5X2"]
 
+        # Blank layers must decode to exactly the device's pixel count
+        self.empty_layer_rle = blank_layer_rle(self.template_width, self.template_height)
+
     def convert_pdf_to_note(
         self,
         pdf_path: Path,
         output_path: Path,
         dpi: int | None = None,
         realtime: bool = False,
+        pages: str | None = None,
     ) -> None:
         """Convert a PDF file to a Supernote .note file.
 
@@ -112,6 +404,11 @@ class NoteFileWriter:
             output_path: Path to output .note file
             dpi: DPI for rendering PDF pages (defaults to device native DPI)
             realtime: Enable realtime handwriting recognition mode
+            pages: 1-based pages to convert, e.g. "1-20,45" (default: all);
+                   other pages are not rasterized
+
+        Raises:
+            ValueError: If the page selection is invalid
         """
         pdf_path = Path(pdf_path)
         output_path = Path(output_path)
@@ -119,8 +416,209 @@ class NoteFileWriter:
         # Use device native DPI if not specified
         render_dpi = dpi if dpi is not None else self.native_dpi
 
-        # Read PDF and convert pages to PNG
-        png_pages = self._convert_pdf_to_pngs(pdf_path, render_dpi)
+        page_numbers = self._select_pdf_pages(pdf_path, pages)
+        self._write_pdf_note(
+            output_path,
+            pdf_path,
+            self._iter_pdf_pngs(pdf_path, render_dpi, page_numbers),
+            len(page_numbers),
+            realtime=realtime,
+        )
+
+    def convert_pdf_to_note_progressive(
+        self,
+        pdf_path: Path,
+        output_path: Path,
+        first_pages: int,
+        dpi: int | None = None,
+        realtime: bool = False,
+        pages: str | None = None,
+        on_first_pages: Optional[Callable[[Path, int], None]] = None,
+    ) -> Path:
+        """Convert a PDF to a .note with its first pages right away, then extend it.
+
+        Blocking form of start_pdf_to_note_progressive(): returns once the
+        note has all pages.
+
+        Returns:
+            Path of the complete note (see start_pdf_to_note_progressive())
+
+        Raises:
+            ValueError: If first_pages is not positive or the page selection is invalid
+        """
+        return self.start_pdf_to_note_progressive(
+            pdf_path, output_path, first_pages, dpi=dpi, realtime=realtime,
+            pages=pages, on_first_pages=on_first_pages,
+        ).result()
+
+    def start_pdf_to_note_progressive(
+        self,
+        pdf_path: Path,
+        output_path: Path,
+        first_pages: int,
+        dpi: int | None = None,
+        realtime: bool = False,
+        pages: str | None = None,
+        on_first_pages: Optional[Callable[[Path, int], None]] = None,
+    ) -> "Future[Path]":
+        """Write a .note with the first pages of a PDF, then extend it in the background.
+
+        The first pages are rendered and written to output_path before this
+        returns, so the note can be opened right away. The remaining pages
+        are rendered in a background thread and appended to the note the
+        way the device updates files (see _append_note_update), so
+        handwriting added to the preview pages in the meantime is kept.
+        Every page is rendered once. Don't use the writer for anything else
+        until the returned future is done.
+
+        If the preview was rewritten in a way that can't be extended in
+        place (e.g. sync appended a handwriting archive), the complete note
+        is written next to it as <name>.complete.note instead, and the
+        preview is left alone; the future then resolves to that path, and
+        a warning is logged.
+
+        Args:
+            pdf_path: Path to input PDF file
+            output_path: Path to output .note file
+            first_pages: Number of (selected) pages in the preview note
+            dpi: DPI for rendering PDF pages (defaults to device native DPI)
+            realtime: Enable realtime handwriting recognition mode
+            pages: 1-based pages to convert, e.g. "1-20,45" (default: all)
+            on_first_pages: Called with (output_path, page count) once the
+                            preview note has been written
+
+        Returns:
+            Future resolving to the path of the complete note
+
+        Raises:
+            ValueError: If first_pages is not positive or the page selection is invalid
+        """
+        if first_pages < 1:
+            raise ValueError(f"first_pages must be >= 1, got {first_pages}")
+
+        pdf_path = Path(pdf_path)
+        output_path = Path(output_path)
+        render_dpi = dpi if dpi is not None else self.native_dpi
+
+        page_numbers = self._select_pdf_pages(pdf_path, pages)
+        preview_numbers = page_numbers[:first_pages]
+
+        preview_pngs = list(self._iter_pdf_pngs(pdf_path, render_dpi, preview_numbers))
+        self._write_pdf_note(
+            output_path, pdf_path, preview_pngs, len(preview_numbers), realtime=realtime
+        )
+        preview_stat = _file_signature(output_path)
+        if on_first_pages:
+            on_first_pages(output_path, len(preview_numbers))
+
+        if len(preview_numbers) == len(page_numbers):
+            done: "Future[Path]" = Future()
+            done.set_result(output_path)
+            return done
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="note-extend")
+        future = executor.submit(
+            self._extend_progressive_note,
+            pdf_path,
+            output_path,
+            preview_pngs,
+            page_numbers[len(preview_numbers):],
+            render_dpi,
+            realtime,
+            preview_stat,
+        )
+        # The worker thread finishes the extension; nothing else is queued
+        executor.shutdown(wait=False)
+        return future
+
+    def _extend_progressive_note(
+        self,
+        pdf_path: Path,
+        output_path: Path,
+        preview_pngs: List[bytes],
+        remaining_numbers: List[int],
+        render_dpi: int,
+        realtime: bool,
+        preview_stat: Tuple[int, int],
+    ) -> Path:
+        """Render the remaining pages of a progressive conversion and add them to the note."""
+        png_pages = preview_pngs + list(self._iter_pdf_pngs(pdf_path, render_dpi, remaining_numbers))
+        page_md5s = [hashlib.md5(png).hexdigest() for png in png_pages]
+        pdf_size = pdf_path.stat().st_size
+
+        if self._append_note_update(
+            output_path, png_pages, pdf_path.stem, pdf_size, page_md5s, realtime=realtime
+        ) is not None:
+            return output_path
+
+        # Only replace the preview if nobody touched it since it was written;
+        # otherwise keep it, with whatever was added to it, and write the
+        # complete note next to it
+        if _file_signature(output_path) == preview_stat:
+            complete_path = output_path
+        else:
+            complete_path = output_path.with_name(f"{output_path.stem}.complete{output_path.suffix}")
+            logger.warning(
+                "%s changed since the preview was written and can't be extended in place; "
+                "writing the complete note to %s",
+                output_path,
+                complete_path,
+            )
+
+        # Build the full note next to the target and swap it in, so readers
+        # (sync tools, the device) never see a partially written file
+        temp_path = complete_path.with_name(f".{complete_path.name}.{os.getpid()}.tmp")
+        try:
+            self._write_pdf_note(temp_path, pdf_path, png_pages, len(png_pages), realtime=realtime)
+            os.replace(temp_path, complete_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return complete_path
+
+    def _select_pdf_pages(self, pdf_path: Path, pages: str | None) -> List[int]:
+        """Resolve a page range specification against a PDF's page count.
+
+        Returns:
+            Selected 0-based page numbers, in document order
+
+        Raises:
+            ValueError: If the page selection is invalid
+        """
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+        if pages is None:
+            return list(range(page_count))
+        return parse_page_ranges(pages, page_count)
+
+    def _write_pdf_note(
+        self,
+        output_path: Path,
+        pdf_path: Path,
+        png_pages: Iterable[bytes],
+        num_pages: int,
+        realtime: bool = False,
+    ) -> None:
+        """Write a PDF-based .note file, streaming its pages if enabled.
+
+        Args:
+            output_path: Path to output .note file
+            pdf_path: Path to the source PDF file
+            png_pages: PNG image data of each page, in page order
+            num_pages: Number of pages png_pages will yield
+            realtime: Enable realtime handwriting recognition mode
+        """
+        if self.streaming:
+            self._write_note_file_streaming(
+                output_path,
+                png_pages,
+                num_pages,
+                pdf_path.stem,
+                pdf_path.stat().st_size,
+                realtime=realtime,
+            )
+            return
+
+        png_pages = list(png_pages)
 
         # Calculate PDF hash and size
         pdf_data = pdf_path.read_bytes()
@@ -152,6 +650,8 @@ class NoteFileWriter:
         output_path: Path,
         dpi: int | None = None,
         realtime: bool = False,
+        incremental: bool = False,
+        index: Optional[NoteIndex] = None,
     ) -> None:
         """Update an existing .note file with new template while preserving handwriting.
 
@@ -159,12 +659,22 @@ class NoteFileWriter:
         generates a new template from the PDF, and reassembles the .note file with
         the new template but preserved handwriting annotations.
 
+        In incremental mode, the existing file is instead updated the way the
+        device does it: only the changed background pages, their metadata and a
+        new footer are appended, and everything else stays where it is; pages
+        the PDF gained are added. Files that cannot be updated that way (more
+        pages than the PDF, no trailing footer address) fall back to the full
+        rewrite.
+
         Args:
             existing_note_path: Path to existing .note file with handwriting
             pdf_path: Path to new PDF template
             output_path: Path to write updated .note file
             dpi: DPI for rendering PDF pages (defaults to device native DPI)
             realtime: Enable realtime handwriting recognition mode
+            incremental: Append only the changed pages instead of rewriting the file
+            index: Metadata index of the existing note; a note the index
+                   knows has no handwriting archive is not parsed again
 
         Raises:
             FileNotFoundError: If existing .note file doesn't exist
@@ -180,24 +690,6 @@ class NoteFileWriter:
                 f"Existing .note file not found: {existing_note_path}"
             )
 
-        # Parse existing .note file to extract handwriting
-        print(f"Reading existing .note file: {existing_note_path}")
-        parser = NoteFileParser(existing_note_path)
-        parser.parse()
-
-        # Extract ZIP archive (contains all handwriting data)
-        zip_archive = parser.get_zip_archive()
-        has_handwriting = parser.get_summary()["has_handwriting"]
-
-        if not zip_archive:
-            print("Warning: No handwriting data found in existing .note file")
-            print("Creating new .note file instead of updating")
-            # Fall back to regular conversion if no handwriting to preserve
-            self.convert_pdf_to_note(pdf_path, output_path, dpi, realtime)
-            return
-
-        print(f"Handwriting data: {len(zip_archive)} bytes, Has content: {has_handwriting}")
-
         # Use device native DPI if not specified
         render_dpi = dpi if dpi is not None else self.native_dpi
 
@@ -212,18 +704,64 @@ class NoteFileWriter:
         page_md5s = [hashlib.md5(png).hexdigest() for png in png_pages]
         pdf_md5_to_use = page_md5s[-1] if page_md5s else pdf_md5
 
+        if incremental:
+            if existing_note_path.resolve() != output_path.resolve():
+                shutil.copyfile(existing_note_path, output_path)
+            changed = self._append_note_update(
+                output_path, png_pages, pdf_path.stem, pdf_size, page_md5s, realtime=realtime
+            )
+            if changed is not None:
+                print(f"Incremental update: {changed} new page images for {len(png_pages)} pages")
+                return
+            print("Existing .note file can't be updated incrementally, rewriting it")
+
+        record = index.get(existing_note_path) if index is not None else None
+        if record is not None and record["error"] is None and not record["summary"]["zip_archive_size_kb"]:
+            parser = None
+            zip_archive = None
+        else:
+            # Parse existing .note file to extract handwriting
+            print(f"Reading existing .note file: {existing_note_path}")
+            parser = NoteFileParser(existing_note_path)
+            parser.parse(read_handwriting=False)
+
+            # Extract ZIP archive (contains all handwriting data); it is copied
+            # as a whole, so its page metadata doesn't need to be parsed
+            zip_archive = parser.get_zip_archive()
+
+        if not zip_archive:
+            print("Warning: No handwriting data found in existing .note file")
+            print("Creating new .note file instead of updating")
+            # Fall back to regular conversion if no handwriting to preserve
+            self._write_note_file(
+                output_path,
+                png_pages,
+                pdf_path.stem,
+                pdf_md5_to_use,
+                pdf_size,
+                page_md5s,
+                realtime=realtime,
+            )
+            return
+
+        print(f"Handwriting data: {len(zip_archive)} bytes")
+
         # Write updated .note file with new templates + existing handwriting
         print(f"Writing updated .note file: {output_path}")
-        print(f"Preserving handwriting from {len(parser.zip_contents.get('pages', {}))} pages")
-        self._write_note_file_with_zip(
+        try:
+            handwriting_pages = parser.get_handwriting().page_count
+        except zipfile.BadZipFile:
+            handwriting_pages = 0
+        print(f"Preserving handwriting from {handwriting_pages} pages")
+        self._write_note_file(
             output_path,
             png_pages,
             pdf_path.stem,
             pdf_md5_to_use,
             pdf_size,
             page_md5s,
-            zip_archive,
             realtime=realtime,
+            zip_archive=zip_archive,
         )
 
         print("Update complete - handwriting preserved!")
@@ -236,41 +774,32 @@ class NoteFileWriter:
     ) -> None:
         """Convert a list of images to a Supernote .note file.
 
+        Images are loaded in a thread pool when the writer has more than one
+        worker, and each page is written as soon as it is ready, so only a
+        few decoded images are held in memory at once.
+
         Args:
             image_paths: List of paths to PNG/image files
             output_path: Path to output .note file
             name: Base name for the note
+
+        Raises:
+            ValueError: If image_paths is empty
         """
         output_path = Path(output_path)
+        image_paths = [Path(path) for path in image_paths]
+        if not image_paths:
+            raise ValueError("No images to convert")
 
-        # Load and resize images
-        png_pages = []
-        for img_path in image_paths:
-            img = Image.open(img_path)
-            # Resize to Supernote dimensions if needed
-            if img.size != (self.template_width, self.template_height):
-                img = img.resize(
-                    (self.template_width, self.template_height),
-                    Image.Resampling.LANCZOS,
-                )
-            # Convert to PNG bytes
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            png_pages.append(buffer.getvalue())
+        # The images take the place of the source PDF in the style names
+        source_size = sum(path.stat().st_size for path in image_paths)
 
-        # Generate MD5 hashes
-        page_md5s = [hashlib.md5(png).hexdigest() for png in png_pages]
-        combined_md5 = hashlib.md5(b''.join(png_pages)).hexdigest()
-        total_size = sum(len(png) for png in png_pages)
-
-        # Generate .note file
-        self._write_note_file(
+        self._write_note_file_streaming(
             output_path,
-            png_pages,
+            self._iter_image_pngs(image_paths),
+            len(image_paths),
             name,
-            combined_md5,
-            total_size,
-            page_md5s,
+            source_size,
         )
 
     def convert_png_template_to_note(
@@ -295,23 +824,18 @@ class NoteFileWriter:
         png_path = Path(png_path)
         output_path = Path(output_path)
 
-        # Check if PNG needs resizing
-        img = Image.open(png_path)
-        if img.size == (self.template_width, self.template_height):
-            # Use raw PNG data to preserve exact bytes (avoid re-encoding)
-            png_data = png_path.read_bytes()
+        # Prepared templates are reused per template content and device settings
+        template_data = png_path.read_bytes()
+        cache = self.template_cache
+        cache_key = cache.key(template_data, self._render_settings()) if cache else ""
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None:
+            png_data, png_md5 = cached
         else:
-            # Resize and re-encode
-            img = img.resize(
-                (self.template_width, self.template_height),
-                Image.Resampling.LANCZOS,
-            )
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            png_data = buffer.getvalue()
-
-        # Calculate MD5 of PNG data
-        png_md5 = hashlib.md5(png_data).hexdigest()
+            png_data = self._prepare_png_template(template_data)
+            png_md5 = hashlib.md5(png_data).hexdigest()
+            if cache:
+                cache.put(cache_key, png_data, png_md5)
 
         # Use filename as template name if not specified
         if template_name is None:
@@ -326,6 +850,45 @@ class NoteFileWriter:
             realtime=realtime,
         )
 
+    def _prepare_png_template(self, template_data: bytes) -> bytes:
+        """Resize and re-encode a PNG template for the device if needed.
+
+        Args:
+            template_data: Contents of the template file
+
+        Returns:
+            PNG data of the background page
+        """
+        # Check if PNG needs resizing (or, in gray mode, a color conversion)
+        img = Image.open(BytesIO(template_data))
+        needs_gray = self.color_mode == "gray" and img.mode != "L"
+        needs_encode = needs_gray or self.quantize != "off"
+        if img.size == (self.template_width, self.template_height) and not needs_encode:
+            # Use raw PNG data to preserve exact bytes (avoid re-encoding)
+            return template_data
+
+        if needs_gray:
+            img = _flatten_to_grayscale(img)
+        # Resize and re-encode
+        if img.size != (self.template_width, self.template_height):
+            img = img.resize(
+                (self.template_width, self.template_height),
+                Image.Resampling.LANCZOS,
+            )
+        return _encode_page_image(img, self._render_settings())
+
+    def _render_settings(self, dpi: int | None = None) -> _PageRenderSettings:
+        """Bundle the writer's page rendering options for (worker) render calls."""
+        return _PageRenderSettings(
+            self.template_width,
+            self.template_height,
+            dpi if dpi is not None else self.native_dpi,
+            self.render_mode,
+            self.color_mode,
+            self.quantize,
+            self.gray_levels,
+        )
+
     def _convert_pdf_to_pngs(
         self,
         pdf_path: Path,
@@ -340,38 +903,133 @@ class NoteFileWriter:
         Returns:
             List of PNG image data as bytes
         """
-        render_dpi = dpi if dpi is not None else self.native_dpi
-        png_pages = []
+        return list(self._iter_pdf_pngs(pdf_path, dpi))
+
+    def _iter_pdf_pngs(
+        self,
+        pdf_path: Path,
+        dpi: int | None = None,
+        pages: Optional[Sequence[int]] = None,
+    ) -> Iterator[bytes]:
+        """Render PDF pages to PNG images one at a time, in order.
+
+        Pages found in the writer's page cache are read back instead of
+        rendered. The rest are rendered in-process, or spread across a
+        process pool when the writer was created with more than one worker.
+
+        Args:
+            pdf_path: Path to PDF file
+            dpi: DPI for rendering (defaults to device native DPI)
+            pages: 0-based pages to render, in output order (default: all)
+
+        Yields:
+            PNG image data of each requested page
+        """
+        settings = self._render_settings(dpi)
+        cache = self.page_cache
 
         # Open PDF with PyMuPDF
         doc = fitz.open(pdf_path)
+        rendered: Optional[Iterator[bytes]] = None
+        try:
+            page_numbers = list(range(len(doc)) if pages is None else pages)
+            keys = {}
+            if cache:
+                keys = dict(zip(page_numbers, cache.document_keys(doc, settings, page_numbers)))
+            to_render = [n for n in page_numbers if not (cache and cache.has(keys[n]))]
+
+            workers = min(self.workers, len(to_render))
+            if workers > 1:
+                rendered = self._render_pages_in_pool(pdf_path, to_render, settings, workers)
+            to_render_set = set(to_render)
+
+            for n in page_numbers:
+                png_data = None
+                if n not in to_render_set:
+                    png_data = cache.get(keys[n])
+                if png_data is None:
+                    if rendered is not None and n in to_render_set:
+                        png_data = next(rendered)
+                    else:
+                        png_data = _render_page_to_png(doc[n], settings)
+                    if cache:
+                        cache.put(keys[n], png_data)
+                yield png_data
+        finally:
+            if rendered is not None:
+                rendered.close()
+            doc.close()
+
+    def _render_pages_in_pool(
+        self,
+        pdf_path: Path,
+        page_numbers: List[int],
+        settings: _PageRenderSettings,
+        workers: int,
+    ) -> Iterator[bytes]:
+        """Render pages across a process pool, yielding them in the given order.
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        Each worker opens its own copy of the PDF. Only a bounded window of
+        batches is in flight at once, so rendered pages never pile up ahead
+        of the consumer.
 
-            # Calculate zoom factor for target DPI
-            zoom = render_dpi / 72.0  # PDF is 72 DPI by default
-            mat = fitz.Matrix(zoom, zoom)
+        Args:
+            pdf_path: Path to PDF file
+            page_numbers: Pages to render (0-based)
+            settings: Page render settings
+            workers: Number of worker processes
 
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat, alpha=True)
+        Yields:
+            PNG image data of each requested page
+        """
+        batches = [
+            page_numbers[start : start + self.RENDER_BATCH_SIZE]
+            for start in range(0, len(page_numbers), self.RENDER_BATCH_SIZE)
+        ]
 
-            # Convert to PIL Image
-            img = Image.frombytes("RGBA", [pix.width, pix.height], pix.samples)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(str(pdf_path),),
+        ) as pool:
+            # Keep two batches per worker queued; results are consumed in
+            # submission order, keeping pages in order
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(pool.submit(_render_pages_in_worker, batch, settings))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _iter_image_pngs(self, image_paths: List[Path]) -> Iterator[bytes]:
+        """Load images as device-sized pages, in order.
+
+        With more than one worker the images are loaded in a thread pool;
+        only a bounded window of pages is in flight at once.
 
-            # Resize to Supernote dimensions
-            img = img.resize(
-                (self.template_width, self.template_height),
-                Image.Resampling.LANCZOS,
-            )
+        Args:
+            image_paths: Paths to image files
 
-            # Convert to PNG bytes
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            png_pages.append(buffer.getvalue())
+        Yields:
+            Encoded image data of each page
+        """
+        settings = self._render_settings()
+        workers = min(self.workers, len(image_paths))
+        if workers <= 1:
+            for image_path in image_paths:
+                yield _load_image_page(image_path, settings)
+            return
 
-        doc.close()
-        return png_pages
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Results are consumed in submission order, keeping pages in order
+            pending: Deque[Future] = deque()
+            for image_path in image_paths:
+                pending.append(pool.submit(_load_image_page, image_path, settings))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
 
     def _write_note_file(
         self,
@@ -382,6 +1040,7 @@ class NoteFileWriter:
         pdf_size: int,
         page_md5s: List[str],
         realtime: bool = False,
+        zip_archive: bytes | None = None,
     ) -> None:
         """Write the .note file with correct binary structure.
 
@@ -394,372 +1053,448 @@ class NoteFileWriter:
         6. Empty MAINLAYER RLE data for each page
         7. Layer metadata blocks (MAINLAYER + BGLAYER per page)
         8. Page metadata blocks
-        9. Footer block (no "tail" marker)
+        9. Footer block + "tail" marker
         10. Footer address (4 bytes)
+        11. Handwriting ZIP archive (update mode only)
 
         Args:
             output_path: Path to output file
             png_pages: List of PNG image data
             pdf_name: Name of original PDF (without extension)
-            pdf_md5: MD5 hash of original PDF
+            pdf_md5: MD5 hash used for PDFSTYLEMD5 (last page's MD5)
             pdf_size: Size of original PDF in bytes
             page_md5s: List of MD5 hashes for each page
             realtime: Enable realtime handwriting recognition mode
+            zip_archive: Existing handwriting ZIP archive to append (update mode)
         """
-        num_pages = len(png_pages)
-        file_id = self._generate_file_id()
-
-        # Build header content
-        header_content = self._build_header_content(
-            pdf_name, num_pages, pdf_md5, pdf_size, file_id, realtime=realtime
-        )
-        header_bytes = header_content.encode("utf-8")
-
-        # Build PDFSTYLELIST content (base64-encoded style names, comma-separated)
-        pdfstylelist_entries = []
-        for i, page_md5 in enumerate(page_md5s, start=1):
-            style_name = f"user_pdf_{pdf_name}_{i}_{page_md5}_{pdf_size}"
-            encoded = base64.b64encode(style_name.encode()).decode()
-            pdfstylelist_entries.append(encoded)
-        pdfstylelist_content = ",".join(pdfstylelist_entries) + ","
-        pdfstylelist_bytes = pdfstylelist_content.encode("utf-8")
-
-        # We'll build the file in stages, tracking addresses
-        # Start position after filetype + signature
-        current_pos = len(self.FILETYPE) + len(self.SIGNATURE)
-
-        # Header block starts at position 24 (4 bytes filetype + 20 bytes signature)
-        header_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(header_bytes)
-
-        # PDFSTYLELIST data block
-        pdfstylelist_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(pdfstylelist_bytes)
-
-        # PNG data for each page (BGLAYER content)
-        bglayer_content_addresses = []
-        for png_data in png_pages:
-            bglayer_content_addresses.append(current_pos)
-            current_pos += self.LENGTH_FIELD_SIZE + len(png_data)
-
-        # Default style RLE data (STYLE_style_white_a5x2)
-        style_white_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(self.EMPTY_LAYER_RLE)
-
-        # Empty MAINLAYER RLE data for each page
-        mainlayer_content_addresses = []
-        for _ in range(num_pages):
-            mainlayer_content_addresses.append(current_pos)
-            current_pos += self.LENGTH_FIELD_SIZE + len(self.EMPTY_LAYER_RLE)
-
-        # Layer metadata blocks (MAINLAYER + BGLAYER per page)
-        layer_metadata_addresses = []
-        for page_idx in range(num_pages):
-            page_layer_addrs = {}
-            # MAINLAYER metadata
-            mainlayer_addr = current_pos
-            mainlayer_meta = self._build_layer_metadata(
-                "MAINLAYER",
-                mainlayer_content_addresses[page_idx],
-            )
-            current_pos += self.LENGTH_FIELD_SIZE + len(mainlayer_meta.encode("utf-8"))
-            page_layer_addrs["MAINLAYER"] = mainlayer_addr
-
-            # BGLAYER metadata
-            bglayer_addr = current_pos
-            bglayer_meta = self._build_layer_metadata(
-                "BGLAYER",
-                bglayer_content_addresses[page_idx],
+        self._seed_ids("pdf", pdf_name, pdf_md5, pdf_size, realtime, *page_md5s)
+        layout = NoteLayout()
+        layout.add_raw(self.FILETYPE + self.SIGNATURE)
+
+        header_address = layout.add_block(
+            self._build_header_content(
+                pdf_name, len(png_pages), pdf_md5, pdf_size, self._generate_file_id(),
+                realtime=realtime,
             )
-            current_pos += self.LENGTH_FIELD_SIZE + len(bglayer_meta.encode("utf-8"))
-            page_layer_addrs["BGLAYER"] = bglayer_addr
-
-            # Unused layers have address 0
-            for layer_name in ["LAYER1", "LAYER2", "LAYER3"]:
-                page_layer_addrs[layer_name] = 0
-            layer_metadata_addresses.append(page_layer_addrs)
+        )
+        pdfstylelist_address = layout.add_block(
+            self._build_pdfstylelist_content(pdf_name, page_md5s, pdf_size)
+        )
 
-        # Page metadata blocks
-        page_metadata_addresses = []
-        for page_idx in range(num_pages):
-            page_addr = current_pos
-            page_meta = self._build_page_metadata(
-                page_idx,
-                pdf_name,
-                page_md5s[page_idx],
-                pdf_size,
-                layer_metadata_addresses[page_idx],
-            )
-            current_pos += self.LENGTH_FIELD_SIZE + len(page_meta.encode("utf-8"))
-            page_metadata_addresses.append(page_addr)
+        # PNG data for each page (BGLAYER content); identical pages share a block
+        bglayer_content_addresses = [
+            layout.add_unique_block(png_data, page_md5)
+            for png_data, page_md5 in zip(png_pages, page_md5s)
+        ]
 
-        # Footer block
-        footer_address = current_pos
-        footer_content = self._build_footer_content(
+        self._add_pdf_note_trailer(
+            layout,
             header_address,
-            page_metadata_addresses,
+            pdfstylelist_address,
             bglayer_content_addresses,
             pdf_name,
             page_md5s,
             pdf_size,
-            pdfstylelist_address=pdfstylelist_address,
-            style_white_address=style_white_address,
         )
-        footer_bytes = footer_content.encode("utf-8")
-
-        # Now write the file
-        with open(output_path, "wb") as f:
-            # 1. Filetype (4 bytes)
-            f.write(self.FILETYPE)
-
-            # 2. Signature (20 bytes)
-            f.write(self.SIGNATURE)
-
-            # 3. Header block
-            f.write(struct.pack("<I", len(header_bytes)))
-            f.write(header_bytes)
-
-            # 4. PDFSTYLELIST data block
-            f.write(struct.pack("<I", len(pdfstylelist_bytes)))
-            f.write(pdfstylelist_bytes)
-
-            # 5. PNG data for each page (BGLAYER content)
-            for png_data in png_pages:
-                f.write(struct.pack("<I", len(png_data)))
-                f.write(png_data)
-
-            # 6. Default style RLE data (STYLE_style_white_a5x2)
-            f.write(struct.pack("<I", len(self.EMPTY_LAYER_RLE)))
-            f.write(self.EMPTY_LAYER_RLE)
-
-            # 7. Empty MAINLAYER RLE data for each page
-            for _ in range(num_pages):
-                f.write(struct.pack("<I", len(self.EMPTY_LAYER_RLE)))
-                f.write(self.EMPTY_LAYER_RLE)
-
-            # 8. Layer metadata blocks (MAINLAYER + BGLAYER per page)
-            for page_idx in range(num_pages):
-                # MAINLAYER
-                mainlayer_meta = self._build_layer_metadata(
-                    "MAINLAYER",
-                    mainlayer_content_addresses[page_idx],
-                )
-                f.write(struct.pack("<I", len(mainlayer_meta.encode("utf-8"))))
-                f.write(mainlayer_meta.encode("utf-8"))
 
-                # BGLAYER
-                bglayer_meta = self._build_layer_metadata(
-                    "BGLAYER",
-                    bglayer_content_addresses[page_idx],
-                )
-                f.write(struct.pack("<I", len(bglayer_meta.encode("utf-8"))))
-                f.write(bglayer_meta.encode("utf-8"))
+        # Update mode: the ZIP archive after the footer address carries the
+        # handwriting of the original file
+        if zip_archive:
+            layout.add_raw(zip_archive)
 
-            # 9. Page metadata blocks
-            for page_idx in range(num_pages):
-                page_meta = self._build_page_metadata(
-                    page_idx,
-                    pdf_name,
-                    page_md5s[page_idx],
-                    pdf_size,
-                    layer_metadata_addresses[page_idx],
-                )
-                f.write(struct.pack("<I", len(page_meta.encode("utf-8"))))
-                f.write(page_meta.encode("utf-8"))
+        self.last_write_skipped = not layout.write(output_path, skip_unchanged=self.deterministic)
 
-            # 10. Footer block
-            f.write(struct.pack("<I", len(footer_bytes)))
-            f.write(footer_bytes)
-
-            # 11. "tail" marker
-            f.write(b"tail")
-
-            # 12. Footer address (last 4 bytes)
-            f.write(struct.pack("<I", footer_address))
-
-    def _write_note_file_with_zip(
+    def _write_note_file_streaming(
         self,
         output_path: Path,
-        png_pages: List[bytes],
+        png_pages: Iterable[bytes],
+        num_pages: int,
         pdf_name: str,
-        pdf_md5: str,
         pdf_size: int,
-        page_md5s: List[str],
-        zip_archive: bytes,
         realtime: bool = False,
     ) -> None:
-        """Write .note file with new templates but existing handwriting (ZIP archive).
+        """Write a PDF-based .note file while its pages are still being rendered.
 
-        This is used for update mode - replaces the template/background layers while
-        preserving all handwriting annotations from the existing .note file.
+        Produces the same layout as _write_note_file, but each PNG block is
+        written and hashed as soon as it arrives, so only the page currently
+        being written is held in memory. The header and PDFSTYLELIST blocks
+        precede the pages yet depend on their MD5s; they are written with
+        placeholder hashes of the same length and patched in place at the end.
 
         Args:
             output_path: Path to output file
-            png_pages: List of PNG data (new templates to replace background)
-            pdf_name: Name of PDF (for metadata)
-            pdf_md5: MD5 hash of PDF
-            pdf_size: Size of PDF in bytes
-            page_md5s: MD5 hashes of each page
-            zip_archive: Existing ZIP archive containing handwriting data
+            png_pages: PNG image data of each page, in page order
+            num_pages: Number of pages png_pages will yield
+            pdf_name: Name of original PDF (without extension)
+            pdf_size: Size of original PDF in bytes
             realtime: Enable realtime handwriting recognition mode
-        """
-        # This is identical to _write_note_file except we append the ZIP archive
-        # at the end to preserve handwriting annotations
 
-        num_pages = len(png_pages)
-        file_id = self._generate_file_id()
+        Raises:
+            ValueError: If num_pages is 0 or png_pages does not yield num_pages pages
+        """
+        if num_pages == 0:
+            raise ValueError("Cannot stream a .note file without pages")
 
-        # Build header content
-        header_content = self._build_header_content(file_id, realtime=realtime)
-        header_bytes = header_content.encode("utf-8")
+        def header_blocks(page_md5s: List[str], file_id: str) -> Tuple[bytes, bytes]:
+            # PDF style MD5 uses the last page's MD5 (observed from golden files)
+            header = self._build_header_content(
+                pdf_name, num_pages, page_md5s[-1], pdf_size, file_id, realtime=realtime
+            )
+            pdfstylelist = self._build_pdfstylelist_content(pdf_name, page_md5s, pdf_size)
+            return header.encode("utf-8"), pdfstylelist.encode("utf-8")
 
-        # Calculate addresses (same as _write_note_file)
-        current_pos = len(self.FILETYPE) + len(self.SIGNATURE)
+        # MD5 hex digests and file IDs have a fixed length, so placeholder
+        # blocks have exactly the size of the final ones
+        placeholder_header, placeholder_pdfstylelist = header_blocks(
+            ["0" * 32] * num_pages, "F" + "0" * 32
+        )
 
-        header_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(header_bytes)
+        # Deterministic output may already exist; build the new file next to
+        # it and only replace it if the bytes differ
+        output_path = Path(output_path)
+        compare_existing = self.deterministic and output_path.exists()
+        write_path = (
+            output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+            if compare_existing
+            else output_path
+        )
 
-        # PDFSTYLELIST data
-        pdfstylelist_content = self._build_pdfstylelist_content(pdf_name, pdf_md5, pdf_size)
-        pdfstylelist_bytes = pdfstylelist_content.encode("utf-8")
-        pdfstylelist_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(pdfstylelist_bytes)
+        layout = NoteLayout()
+        page_md5s: List[str] = []
+        bglayer_content_addresses: List[int] = []
+
+        try:
+            with open(write_path, "wb", buffering=0) as f:
+                layout.add_raw(self.FILETYPE + self.SIGNATURE)
+                header_address = layout.add_block(placeholder_header)
+                pdfstylelist_address = layout.add_block(placeholder_pdfstylelist)
+
+                # PNG data for each page (BGLAYER content), written as rendered;
+                # identical pages share a block
+                for png_data in png_pages:
+                    page_md5s.append(hashlib.md5(png_data).hexdigest())
+                    bglayer_content_addresses.append(
+                        layout.add_unique_block(png_data, page_md5s[-1])
+                    )
+                    layout.flush(f)
+
+                if len(page_md5s) != num_pages:
+                    raise ValueError(f"Expected {num_pages} pages, got {len(page_md5s)}")
+
+                # IDs are generated once all pages are known (same seed as _write_note_file)
+                self._seed_ids("pdf", pdf_name, page_md5s[-1], pdf_size, realtime, *page_md5s)
+                file_id = self._generate_file_id()
+
+                self._add_pdf_note_trailer(
+                    layout,
+                    header_address,
+                    pdfstylelist_address,
+                    bglayer_content_addresses,
+                    pdf_name,
+                    page_md5s,
+                    pdf_size,
+                )
+                layout.flush(f)
+
+                # Patch the real file ID and page hashes into the header and PDFSTYLELIST
+                header_bytes, pdfstylelist_bytes = header_blocks(page_md5s, file_id)
+                assert len(header_bytes) == len(placeholder_header)
+                assert len(pdfstylelist_bytes) == len(placeholder_pdfstylelist)
+                f.seek(header_address + self.LENGTH_FIELD_SIZE)
+                f.write(header_bytes)
+                f.seek(pdfstylelist_address + self.LENGTH_FIELD_SIZE)
+                f.write(pdfstylelist_bytes)
+
+            self.last_write_skipped = compare_existing and filecmp.cmp(
+                write_path, output_path, shallow=False
+            )
+            if compare_existing and not self.last_write_skipped:
+                os.replace(write_path, output_path)
+        finally:
+            if compare_existing:
+                write_path.unlink(missing_ok=True)
 
-        # PNG data addresses (BGLAYER content)
-        bglayer_content_addresses = []
-        for png_data in png_pages:
-            bglayer_content_addresses.append(current_pos)
-            current_pos += self.LENGTH_FIELD_SIZE + len(png_data)
+    def _add_pdf_note_trailer(
+        self,
+        layout: NoteLayout,
+        header_address: int,
+        pdfstylelist_address: int,
+        bglayer_content_addresses: List[int],
+        pdf_name: str,
+        page_md5s: List[str],
+        pdf_size: int,
+    ) -> int:
+        """Add everything that follows the page PNGs of a PDF-based note.
 
-        # Default style (STYLE_style_white_a5x2)
-        style_white_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(self.EMPTY_LAYER_RLE)
+        Adds the default style RLE, the empty MAINLAYER RLE of every page,
+        layer metadata (MAINLAYER + BGLAYER per page), page metadata, the
+        footer, the "tail" marker and the trailing footer address.
 
-        # MAINLAYER RLE data for each page
-        mainlayer_content_addresses = []
-        for _ in range(num_pages):
-            mainlayer_content_addresses.append(current_pos)
-            current_pos += self.LENGTH_FIELD_SIZE + len(self.EMPTY_LAYER_RLE)
+        Args:
+            layout: Layout that already holds the header, PDFSTYLELIST and PNG blocks
+            header_address: Address of the header block
+            pdfstylelist_address: Address of the PDFSTYLELIST block
+            bglayer_content_addresses: Address of each page's PNG block
+            pdf_name: Name of original PDF (without extension)
+            page_md5s: MD5 hash of each page's PNG
+            pdf_size: Size of original PDF in bytes
 
-        # Layer metadata addresses
-        layer_metadata_addresses = []
-        for page_idx in range(num_pages):
-            # MAINLAYER metadata
-            mainlayer_meta = self._build_layer_metadata(
-                "MAINLAYER",
-                mainlayer_content_addresses[page_idx],
-            )
-            layer_addr = current_pos
-            current_pos += self.LENGTH_FIELD_SIZE + len(mainlayer_meta.encode("utf-8"))
+        Returns:
+            Address of the footer block
+        """
+        num_pages = len(bglayer_content_addresses)
 
-            # BGLAYER metadata
-            bglayer_meta = self._build_layer_metadata(
-                "BGLAYER",
-                bglayer_content_addresses[page_idx],
-            )
-            current_pos += self.LENGTH_FIELD_SIZE + len(bglayer_meta.encode("utf-8"))
+        # Default style RLE data (STYLE_style_white_a5x2)
+        style_white_address = layout.add_block(self.empty_layer_rle)
 
-            layer_metadata_addresses.append(layer_addr)
+        # Empty MAINLAYER RLE data for each page
+        mainlayer_content_addresses = [
+            layout.add_block(self.empty_layer_rle) for _ in range(num_pages)
+        ]
 
-        # Page metadata addresses
-        page_metadata_addresses = []
+        # Layer metadata blocks (MAINLAYER + BGLAYER per page)
+        layer_metadata_addresses = []
         for page_idx in range(num_pages):
-            page_addr = current_pos
-            page_meta = self._build_page_metadata(
-                page_idx,
-                pdf_name,
-                page_md5s[page_idx],
-                pdf_size,
-                layer_metadata_addresses[page_idx],
-            )
-            current_pos += self.LENGTH_FIELD_SIZE + len(page_meta.encode("utf-8"))
-            page_metadata_addresses.append(page_addr)
+            layer_metadata_addresses.append({
+                "MAINLAYER": layout.add_block(
+                    self._build_layer_metadata("MAINLAYER", mainlayer_content_addresses[page_idx])
+                ),
+                "BGLAYER": layout.add_block(
+                    self._build_layer_metadata("BGLAYER", bglayer_content_addresses[page_idx])
+                ),
+                # Unused layers have address 0
+                "LAYER1": 0,
+                "LAYER2": 0,
+                "LAYER3": 0,
+            })
 
-        # Footer block
-        footer_address = current_pos
-        footer_content = self._build_footer_content(
-            header_address,
-            page_metadata_addresses,
-            bglayer_content_addresses,
-            pdf_name,
-            page_md5s,
-            pdf_size,
-            pdfstylelist_address=pdfstylelist_address,
-            style_white_address=style_white_address,
-        )
-        footer_bytes = footer_content.encode("utf-8")
-
-        # Write the file (same as _write_note_file but with ZIP appended)
-        with open(output_path, "wb") as f:
-            # 1-2. Filetype + Signature
-            f.write(self.FILETYPE)
-            f.write(self.SIGNATURE)
-
-            # 3. Header block
-            f.write(struct.pack("<I", len(header_bytes)))
-            f.write(header_bytes)
-
-            # 4. PDFSTYLELIST data block
-            f.write(struct.pack("<I", len(pdfstylelist_bytes)))
-            f.write(pdfstylelist_bytes)
-
-            # 5. PNG data for each page (BGLAYER content - NEW TEMPLATES)
-            for png_data in png_pages:
-                f.write(struct.pack("<I", len(png_data)))
-                f.write(png_data)
-
-            # 6. Default style RLE data
-            f.write(struct.pack("<I", len(self.EMPTY_LAYER_RLE)))
-            f.write(self.EMPTY_LAYER_RLE)
-
-            # 7. Empty MAINLAYER RLE data for each page
-            for _ in range(num_pages):
-                f.write(struct.pack("<I", len(self.EMPTY_LAYER_RLE)))
-                f.write(self.EMPTY_LAYER_RLE)
-
-            # 8. Layer metadata blocks
-            for page_idx in range(num_pages):
-                # MAINLAYER
-                mainlayer_meta = self._build_layer_metadata(
-                    "MAINLAYER",
-                    mainlayer_content_addresses[page_idx],
-                )
-                f.write(struct.pack("<I", len(mainlayer_meta.encode("utf-8"))))
-                f.write(mainlayer_meta.encode("utf-8"))
-
-                # BGLAYER
-                bglayer_meta = self._build_layer_metadata(
-                    "BGLAYER",
-                    bglayer_content_addresses[page_idx],
-                )
-                f.write(struct.pack("<I", len(bglayer_meta.encode("utf-8"))))
-                f.write(bglayer_meta.encode("utf-8"))
-
-            # 9. Page metadata blocks
-            for page_idx in range(num_pages):
-                page_meta = self._build_page_metadata(
+        # Page metadata blocks
+        page_metadata_addresses = [
+            layout.add_block(
+                self._build_page_metadata(
                     page_idx,
                     pdf_name,
                     page_md5s[page_idx],
                     pdf_size,
                     layer_metadata_addresses[page_idx],
                 )
-                f.write(struct.pack("<I", len(page_meta.encode("utf-8"))))
-                f.write(page_meta.encode("utf-8"))
+            )
+            for page_idx in range(num_pages)
+        ]
+
+        # Footer block, "tail" marker and footer address
+        footer_address = layout.add_block(
+            self._build_footer_content(
+                header_address,
+                page_metadata_addresses,
+                bglayer_content_addresses,
+                pdf_name,
+                page_md5s,
+                pdf_size,
+                pdfstylelist_address=pdfstylelist_address,
+                style_white_address=style_white_address,
+            )
+        )
+        layout.add_raw(b"tail")
+        layout.add_address(footer_address)
+        return footer_address
 
-            # 10. Footer block
-            f.write(struct.pack("<I", len(footer_bytes)))
-            f.write(footer_bytes)
+    def _append_note_update(
+        self,
+        note_path: Path,
+        png_pages: List[bytes],
+        pdf_name: str,
+        pdf_size: int,
+        page_md5s: List[str],
+        realtime: bool = False,
+    ) -> Optional[int]:
+        """Update a PDF-based .note file in place by appending to it.
+
+        For every page whose background changed, a new PNG block, BGLAYER
+        metadata and page metadata block are appended; the new page metadata
+        is a copy of the old one with only the style and BGLAYER tags
+        replaced, so handwriting layers keep pointing at their existing data.
+        Page images are content-addressed: a page whose image already exists
+        in the file (or earlier in the update) reuses that PNG block, even if
+        its style name changed with the PDF size.
+        Pages past the file's last page are added as new pages with an empty
+        main layer, so a note can also be extended with more pages.
+        A new header, PDFSTYLELIST and footer follow, and the trailing footer
+        address is re-pointed. Unchanged blocks are neither read nor moved.
 
-            # 11. "tail" marker
-            f.write(b"tail")
+        Args:
+            note_path: .note file to update (modified in place)
+            png_pages: New PNG image data of each page (at least as many as
+                       the file has pages)
+            pdf_name: Name of the new PDF (without extension)
+            pdf_size: Size of the new PDF in bytes
+            page_md5s: MD5 hash of each new page
+            realtime: Enable realtime handwriting recognition mode
 
-            # 12. Footer address
-            f.write(struct.pack("<I", footer_address))
+        Returns:
+            Number of PNG blocks appended, or None if the file can't be
+            updated incrementally (nothing is written then)
+        """
+        num_pages = len(png_pages)
+        recogn_type = "1" if realtime else "0"
+        recogn_language = self.language if realtime else "none"
+
+        with open(note_path, "r+b", buffering=0) as f:
+            file_size = f.seek(0, os.SEEK_END)
+            if file_size < 32 or num_pages == 0:
+                return None
+
+            # Files we or the device wrote end with "tail" + footer address;
+            # anything else (e.g. a trailing handwriting ZIP) needs a rewrite
+            f.seek(file_size - 8)
+            trailer = f.read(8)
+            if trailer[:4] != b"tail":
+                return None
+
+            try:
+                footer_address = struct.unpack("<I", trailer[4:])[0]
+                footer = _read_block(f, footer_address).decode("utf-8")
+                footer_tags = _parse_tags(footer)
+                footer_values = dict(footer_tags)
+
+                page_addresses = sorted(
+                    (int(key[4:]), int(value))
+                    for key, value in footer_tags
+                    if re.fullmatch(r"PAGE\d+", key)
+                )
+                existing_pages = len(page_addresses)
+                if not 0 < existing_pages <= num_pages:
+                    return None
+                if [n for n, _ in page_addresses] != list(range(1, existing_pages + 1)):
+                    return None
+
+                header_address = int(footer_values["FILE_FEATURE"])
+                header = _read_block(f, header_address).decode("utf-8")
+                if "PDFSTYLE" not in dict(_parse_tags(header)):
+                    return None
+
+                old_pages = [
+                    _read_block(f, address).decode("utf-8") for _, address in page_addresses
+                ]
+            except (KeyError, ValueError, UnicodeDecodeError, struct.error):
+                return None
+
+            layout = NoteLayout(start=file_size)
+            old_png_addresses = []
+            for old_page in old_pages:
+                old_values = dict(_parse_tags(old_page))
+                style_key = "STYLE_{}{}".format(
+                    old_values.get("PAGESTYLE", ""), old_values.get("PAGESTYLEMD5", "")
+                )
+                old_png_addresses.append(int(footer_values.get(style_key, 0)))
+                # Any existing page image can be shared by the new pages
+                if old_png_addresses[-1]:
+                    layout.register_unique_block(
+                        old_values.get("PAGESTYLEMD5", "").split("_")[0], old_png_addresses[-1]
+                    )
+
+            new_page_addresses = []
+            png_addresses = []
+
+            # Page IDs of added pages follow the new content (deterministic writers)
+            self._seed_ids("append", pdf_name, pdf_size, realtime, *page_md5s)
+
+            for page_idx, (_, old_address) in enumerate(page_addresses):
+                page_style = f"user_pdf_{pdf_name}_{page_idx + 1}"
+                page_style_md5 = f"{page_md5s[page_idx]}_{pdf_size}"
+                old_page = old_pages[page_idx]
+                old_values = dict(_parse_tags(old_page))
+                if (
+                    old_values.get("PAGESTYLE") == page_style
+                    and old_values.get("PAGESTYLEMD5") == page_style_md5
+                    and old_png_addresses[page_idx]
+                ):
+                    new_page_addresses.append(old_address)
+                    png_addresses.append(old_png_addresses[page_idx])
+                    continue
+
+                png_address = layout.add_unique_block(png_pages[page_idx], page_md5s[page_idx])
+                png_addresses.append(png_address)
+
+                # Pages showing the same image under a new style name (e.g. the
+                # PDF size changed) only need new page metadata
+                replacements = {"PAGESTYLE": page_style, "PAGESTYLEMD5": page_style_md5}
+                if png_address != old_png_addresses[page_idx]:
+                    replacements["BGLAYER"] = layout.add_block(
+                        self._build_layer_metadata("BGLAYER", png_address)
+                    )
+                new_page_addresses.append(layout.add_block(_replace_tags(old_page, replacements)))
+
+            for page_idx in range(existing_pages, num_pages):
+                png_address = layout.add_unique_block(png_pages[page_idx], page_md5s[page_idx])
+                png_addresses.append(png_address)
+                mainlayer_address = layout.add_block(self.empty_layer_rle)
+                layer_addresses = {
+                    "MAINLAYER": layout.add_block(
+                        self._build_layer_metadata("MAINLAYER", mainlayer_address)
+                    ),
+                    "BGLAYER": layout.add_block(
+                        self._build_layer_metadata("BGLAYER", png_address)
+                    ),
+                    "LAYER1": 0,
+                    "LAYER2": 0,
+                    "LAYER3": 0,
+                }
+                new_page_addresses.append(layout.add_block(self._build_page_metadata(
+                    page_idx, pdf_name, page_md5s[page_idx], pdf_size, layer_addresses
+                )))
+
+            appended_pngs = len({address for address in png_addresses if address >= file_size})
+
+            new_header = _replace_tags(header, {
+                "FILE_RECOGN_TYPE": recogn_type,
+                "FILE_RECOGN_LANGUAGE": recogn_language,
+                "PDFSTYLE": f"user_pdf_{pdf_name}_{num_pages}",
+                "PDFSTYLEMD5": f"{page_md5s[-1]}_{pdf_size}",
+            })
+            if layout.size == file_size and new_header == header:
+                return 0
+
+            new_header_address = layout.add_block(new_header)
+            pdfstylelist_address = layout.add_block(
+                self._build_pdfstylelist_content(pdf_name, page_md5s, pdf_size)
+            )
 
-            # 13. APPEND EXISTING ZIP ARCHIVE (HANDWRITING DATA) - This is the key difference!
-            # The ZIP archive contains all the handwriting from the original file
-            f.write(zip_archive)
+            style_tags = [
+                f"<STYLE_user_pdf_{pdf_name}_{page_idx + 1}{page_md5}_{pdf_size}:{address}>"
+                for page_idx, (page_md5, address) in enumerate(zip(page_md5s, png_addresses))
+            ]
+
+            footer_tags_out = [
+                f"<PAGE{i}:{address}>" for i, address in enumerate(new_page_addresses, start=1)
+            ]
+            for key, value in footer_tags:
+                if re.fullmatch(r"PAGE\d+", key):
+                    continue
+                if key.startswith("STYLE_user_pdf_"):
+                    footer_tags_out.extend(style_tags)
+                    style_tags = []
+                    continue
+                if key == "FILE_FEATURE":
+                    value = new_header_address
+                elif key == "PDFSTYLELIST":
+                    value = pdfstylelist_address
+                footer_tags_out.append(f"<{key}:{value}>")
+            footer_tags_out.extend(style_tags)
+
+            new_footer_address = layout.add_block("".join(footer_tags_out))
+            layout.add_raw(b"tail")
+            layout.add_address(new_footer_address)
+
+            # Restore the original file if the append fails part way
+            f.seek(file_size)
+            try:
+                layout.flush(f)
+            except BaseException:
+                f.truncate(file_size)
+                raise
+
+        return appended_pngs
 
     def _write_png_template_note_file(
         self,
@@ -779,7 +1514,7 @@ class NoteFileWriter:
         5. MAINLAYER metadata
         6. BGLAYER metadata
         7. Page metadata
-        8. Footer (simpler - no PDFSTYLELIST, no COVER_0)
+        8. Footer (simpler - no PDFSTYLELIST, no COVER_0) + "tail" marker
         9. Footer address (4 bytes)
 
         Args:
@@ -789,108 +1524,45 @@ class NoteFileWriter:
             png_md5: MD5 hash of PNG data
             realtime: Enable realtime handwriting recognition mode
         """
-        file_id = self._generate_file_id()
-
-        # Build header content (PNG template format - simpler than PDF)
-        header_content = self._build_png_header_content(file_id, realtime=realtime)
-        header_bytes = header_content.encode("utf-8")
-
-        # Calculate addresses
-        # Start position after filetype + signature
-        current_pos = len(self.FILETYPE) + len(self.SIGNATURE)
-
-        # Header block at position 24
-        header_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(header_bytes)
-
-        # PNG data for BGLAYER
-        bglayer_content_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(png_data)
-
-        # Empty MAINLAYER RLE data
-        mainlayer_content_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(self.EMPTY_LAYER_RLE)
+        self._seed_ids("png", template_name, png_md5, realtime)
+        layout = NoteLayout()
+        layout.add_raw(self.FILETYPE + self.SIGNATURE)
 
-        # MAINLAYER metadata
-        mainlayer_meta = self._build_layer_metadata("MAINLAYER", mainlayer_content_address)
-        mainlayer_meta_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(mainlayer_meta.encode("utf-8"))
-
-        # BGLAYER metadata
-        bglayer_meta = self._build_layer_metadata("BGLAYER", bglayer_content_address)
-        bglayer_meta_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(bglayer_meta.encode("utf-8"))
+        header_address = layout.add_block(
+            self._build_png_header_content(self._generate_file_id(), realtime=realtime)
+        )
+        bglayer_content_address = layout.add_block(png_data)
+        mainlayer_content_address = layout.add_block(self.empty_layer_rle)
 
-        # Layer addresses dict
         layer_addresses = {
-            "MAINLAYER": mainlayer_meta_address,
+            "MAINLAYER": layout.add_block(
+                self._build_layer_metadata("MAINLAYER", mainlayer_content_address)
+            ),
             "LAYER1": 0,
             "LAYER2": 0,
             "LAYER3": 0,
-            "BGLAYER": bglayer_meta_address,
+            "BGLAYER": layout.add_block(
+                self._build_layer_metadata("BGLAYER", bglayer_content_address)
+            ),
         }
 
-        # Page metadata (PNG template format)
-        page_meta = self._build_png_page_metadata(
-            template_name,
-            png_md5,
-            layer_addresses,
+        page_metadata_address = layout.add_block(
+            self._build_png_page_metadata(template_name, png_md5, layer_addresses)
         )
-        page_metadata_address = current_pos
-        current_pos += self.LENGTH_FIELD_SIZE + len(page_meta.encode("utf-8"))
 
-        # Footer (PNG template format - simpler)
-        footer_address = current_pos
-        footer_content = self._build_png_footer_content(
-            header_address,
-            page_metadata_address,
-            bglayer_content_address,
-            template_name,
-            png_md5,
+        footer_address = layout.add_block(
+            self._build_png_footer_content(
+                header_address,
+                page_metadata_address,
+                bglayer_content_address,
+                template_name,
+                png_md5,
+            )
         )
-        footer_bytes = footer_content.encode("utf-8")
-
-        # Write the file
-        with open(output_path, "wb") as f:
-            # 1. Filetype (4 bytes)
-            f.write(self.FILETYPE)
-
-            # 2. Signature (20 bytes)
-            f.write(self.SIGNATURE)
-
-            # 3. Header block
-            f.write(struct.pack("<I", len(header_bytes)))
-            f.write(header_bytes)
-
-            # 4. PNG data for BGLAYER
-            f.write(struct.pack("<I", len(png_data)))
-            f.write(png_data)
+        layout.add_raw(b"tail")
+        layout.add_address(footer_address)
 
-            # 5. Empty MAINLAYER RLE data
-            f.write(struct.pack("<I", len(self.EMPTY_LAYER_RLE)))
-            f.write(self.EMPTY_LAYER_RLE)
-
-            # 6. MAINLAYER metadata
-            f.write(struct.pack("<I", len(mainlayer_meta.encode("utf-8"))))
-            f.write(mainlayer_meta.encode("utf-8"))
-
-            # 7. BGLAYER metadata
-            f.write(struct.pack("<I", len(bglayer_meta.encode("utf-8"))))
-            f.write(bglayer_meta.encode("utf-8"))
-
-            # 8. Page metadata
-            f.write(struct.pack("<I", len(page_meta.encode("utf-8"))))
-            f.write(page_meta.encode("utf-8"))
-
-            # 9. Footer block
-            f.write(struct.pack("<I", len(footer_bytes)))
-            f.write(footer_bytes)
-
-            # 10. "tail" marker (PNG template format has this)
-            f.write(b"tail")
-
-            # 11. Footer address (last 4 bytes)
-            f.write(struct.pack("<I", footer_address))
+        self.last_write_skipped = not layout.write(output_path, skip_unchanged=self.deterministic)
 
     def _build_png_header_content(self, file_id: str, realtime: bool = False) -> str:
         """Build header content for PNG template format.
@@ -1087,6 +1759,28 @@ class NoteFileWriter:
 
         return "".join(tags)
 
+    def _build_pdfstylelist_content(
+        self,
+        pdf_name: str,
+        page_md5s: List[str],
+        pdf_size: int,
+    ) -> str:
+        """Build PDFSTYLELIST content (base64-encoded style names, comma-separated).
+
+        Args:
+            pdf_name: Name of PDF file
+            page_md5s: MD5 hash of each page's PNG
+            pdf_size: Size of PDF in bytes
+
+        Returns:
+            PDFSTYLELIST content string
+        """
+        entries = []
+        for i, page_md5 in enumerate(page_md5s, start=1):
+            style_name = f"user_pdf_{pdf_name}_{i}_{page_md5}_{pdf_size}"
+            entries.append(base64.b64encode(style_name.encode()).decode())
+        return ",".join(entries) + ","
+
     def _build_layer_metadata(
         self,
         layer_name: str,
@@ -1241,25 +1935,59 @@ class NoteFileWriter:
         # No "tail" marker - real files don't have it
         return "".join(tags)
 
+    def _seed_ids(self, *parts: object) -> None:
+        """Start a new deterministic ID sequence for the file about to be written.
+
+        Does nothing unless the writer is deterministic. The seed covers the
+        given content identifiers plus every option that shapes the output.
+        """
+        if not self.deterministic:
+            return
+        seed = hashlib.sha256(
+            repr((self.device, self.language, self._render_settings(), parts)).encode()
+        ).digest()
+        self._id_rng = random.Random(seed)
+
+    def _generate_id_parts(self) -> Tuple[str, str]:
+        """Return the timestamp and random suffix of a file or page ID."""
+        if self._id_rng is None:
+            timestamp = datetime.now()
+            rng = random
+        else:
+            # A well-formed timestamp (2020-2029) drawn from the seeded sequence
+            rng = self._id_rng
+            timestamp = datetime(2020, 1, 1) + timedelta(
+                milliseconds=rng.randrange(10 * 365 * 24 * 3600 * 1000)
+            )
+        suffix = "".join(rng.choices(string.ascii_letters + string.digits, k=15))
+        return timestamp.strftime("%Y%m%d%H%M%S%f")[:17], suffix
+
     def _generate_file_id(self) -> str:
         """Generate unique file ID."""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")[:17]
-        suffix = "".join(random.choices(string.ascii_letters + string.digits, k=15))
+        timestamp, suffix = self._generate_id_parts()
         return f"F{timestamp}{suffix}"
 
     def _generate_page_id(self) -> str:
         """Generate unique page ID (P + timestamp + random suffix)."""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")[:17]
-        suffix = "".join(random.choices(string.ascii_letters + string.digits, k=15))
+        timestamp, suffix = self._generate_id_parts()
         return f"P{timestamp}{suffix}"
 
-
 def convert_pdf_to_note(
     pdf_path: str | Path,
     output_path: str | Path,
     device: str = "A5X2",
     language: str = "en_GB",
     realtime: bool = False,
+    workers: int = 1,
+    render_mode: str = "resample",
+    color_mode: str = "rgba",
+    quantize: str = "off",
+    gray_levels: int = DEFAULT_GRAY_LEVELS,
+    streaming: bool = False,
+    cache_dir: str | Path | None = None,
+    deterministic: bool = False,
+    pages: str | None = None,
+    first_pages: int = 0,
 ) -> None:
     """Convert PDF to .note file.
 
@@ -1269,9 +1997,36 @@ def convert_pdf_to_note(
         device: Target device (A5X, A5X2/Manta, A6X, A6X2/Nomad)
         language: Recognition language (used when realtime=True)
         realtime: Enable realtime handwriting recognition mode
+        workers: Number of processes used to render pages (0 = all CPU cores)
+        render_mode: How PDF pages are rasterized ("resample" or "fit")
+        color_mode: Pixel format of background pages ("rgba" or "gray")
+        quantize: Gray-level quantization ("off", "levels", "ordered", "diffusion")
+        gray_levels: Number of gray levels used when quantizing
+        streaming: Write pages to the .note file as they are rendered
+        cache_dir: Directory of the rendered-page cache (None disables caching)
+        deterministic: Reproducible IDs; an identical existing output is left untouched
+        pages: 1-based pages to convert, e.g. "1-20,45" (default: all)
+        first_pages: Write a note with this many pages first, then extend it
+                     with the remaining pages (0 writes the note once)
     """
-    writer = NoteFileWriter(device=device, language=language)
-    writer.convert_pdf_to_note(Path(pdf_path), Path(output_path), realtime=realtime)
+    writer = NoteFileWriter(
+        device=device,
+        language=language,
+        workers=workers,
+        render_mode=render_mode,
+        color_mode=color_mode,
+        quantize=quantize,
+        gray_levels=gray_levels,
+        streaming=streaming,
+        page_cache=get_page_cache(cache_dir) if cache_dir else None,
+        deterministic=deterministic,
+    )
+    if first_pages:
+        writer.convert_pdf_to_note_progressive(
+            Path(pdf_path), Path(output_path), first_pages, realtime=realtime, pages=pages
+        )
+    else:
+        writer.convert_pdf_to_note(Path(pdf_path), Path(output_path), realtime=realtime, pages=pages)
 
 
 def convert_png_to_note(
@@ -1281,6 +2036,11 @@ def convert_png_to_note(
     template_name: str | None = None,
     language: str = "en_GB",
     realtime: bool = False,
+    color_mode: str = "rgba",
+    quantize: str = "off",
+    gray_levels: int = DEFAULT_GRAY_LEVELS,
+    deterministic: bool = False,
+    cache_dir: str | Path | None = None,
 ) -> None:
     """Convert PNG template to .note file.
 
@@ -1295,8 +2055,22 @@ def convert_png_to_note(
         template_name: Template name (defaults to PNG filename)
         language: Recognition language (used when realtime=True)
         realtime: Enable realtime handwriting recognition mode
+        color_mode: Pixel format of the background page ("rgba" or "gray")
+        quantize: Gray-level quantization ("off", "levels", "ordered", "diffusion")
+        gray_levels: Number of gray levels used when quantizing
+        deterministic: Reproducible IDs; an identical existing output is left untouched
+        cache_dir: Directory of the on-disk cache; the device-sized template is
+                   prepared once and reused by later conversions and processes
     """
-    writer = NoteFileWriter(device=device, language=language)
+    writer = NoteFileWriter(
+        device=device,
+        language=language,
+        color_mode=color_mode,
+        quantize=quantize,
+        gray_levels=gray_levels,
+        deterministic=deterministic,
+        template_cache=get_template_cache(cache_dir) if cache_dir else None,
+    )
     writer.convert_png_template_to_note(Path(png_path), Path(output_path), template_name, realtime=realtime)
 
 
@@ -1311,6 +2085,16 @@ def convert_markdown_to_note(
     font_size: int = 11,
     use_frontmatter: bool = True,
     update_markdown: bool = True,
+    workers: int = 1,
+    render_mode: str = "resample",
+    color_mode: str = "rgba",
+    quantize: str = "off",
+    gray_levels: int = DEFAULT_GRAY_LEVELS,
+    streaming: bool = False,
+    incremental: bool = False,
+    cache_dir: str | Path | None = None,
+    deterministic: bool = False,
+    index_path: str | Path | None = None,
 ) -> None:
     """Convert Markdown file to .note file with frontmatter support.
 
@@ -1349,6 +2133,17 @@ def convert_markdown_to_note(
         font_size: Base font size in points
         use_frontmatter: Whether to read frontmatter properties (default: True)
         update_markdown: Whether to update markdown with .note file reference (default: True)
+        workers: Number of processes used to render pages (0 = all CPU cores)
+        render_mode: How PDF pages are rasterized ("resample" or "fit")
+        color_mode: Pixel format of background pages ("rgba" or "gray")
+        quantize: Gray-level quantization ("off", "levels", "ordered", "diffusion")
+        gray_levels: Number of gray levels used when quantizing
+        streaming: Write pages to the .note file as they are rendered
+        incremental: In update mode, append only the changed pages to the existing file
+        cache_dir: Directory of the rendered-page cache (None disables caching)
+        deterministic: Reproducible IDs; an identical existing output is left untouched
+        index_path: SQLite note index (see NoteIndex) consulted in update
+                    mode before the existing .note file is parsed
     """
     markdown_path = Path(markdown_path).resolve()
     output_path = Path(output_path).resolve()
@@ -1398,17 +2193,35 @@ def convert_markdown_to_note(
         pandoc.convert(markdown_path, tmp_pdf_path)
 
         # Convert PDF to .note (with update mode if existing file found)
-        writer = NoteFileWriter(device=device, language=language)
+        writer = NoteFileWriter(
+            device=device,
+            language=language,
+            workers=workers,
+            render_mode=render_mode,
+            color_mode=color_mode,
+            quantize=quantize,
+            gray_levels=gray_levels,
+            streaming=streaming,
+            page_cache=get_page_cache(cache_dir) if cache_dir else None,
+            deterministic=deterministic,
+        )
 
         if existing_note_path:
             # UPDATE MODE: Preserve handwriting while replacing template
             print("Using UPDATE mode - preserving handwriting annotations")
-            writer.update_note_file(
-                existing_note_path,
-                tmp_pdf_path,
-                output_path,
-                realtime=final_realtime,
-            )
+            index = NoteIndex(index_path) if index_path else None
+            try:
+                writer.update_note_file(
+                    existing_note_path,
+                    tmp_pdf_path,
+                    output_path,
+                    realtime=final_realtime,
+                    incremental=incremental,
+                    index=index,
+                )
+            finally:
+                if index is not None:
+                    index.close()
         else:
             # CREATE MODE: Create new .note file
             writer.convert_pdf_to_note(tmp_pdf_path, output_path, realtime=final_realtime)
@@ -0,0 +1,290 @@
+"""On-disk cache of rendered PDF pages.
+
+Re-converting a document after a small edit usually leaves most pages
+untouched, so rendering them again is wasted work. Each rendered page is
+stored under a key derived from what the page draws - its content stream,
+geometry and every resource it references (fonts, images, forms), hashed by
+content rather than by PDF object number - plus the render settings. A page
+whose key is cached is read back instead of being rasterized.
+
+The cache is bounded in size; when it grows past the limit the least
+recently used entries (by file modification time, refreshed on every hit)
+are removed.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import fitz  # PyMuPDF
+
+# Bump when the key derivation or the stored format changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_SIZE_MB = 512
+
+# Indirect object references ("12 0 R")
+_REFERENCE_PATTERN = re.compile(r"(\d+) (\d+) R\b")
+
+# Keys that point back up the page tree; following them would make every
+# page depend on the whole document
+_BACK_REFERENCE_PATTERN = re.compile(r"/(Parent|P)\s+\d+ \d+ R")
+
+
+class PageCache:
+    """Size-bounded LRU cache of encoded page images in a directory.
+
+    Example:
+        cache = PageCache(Path("~/.cache/obsidian-supernote/pages").expanduser())
+        keys = cache.document_keys(doc, settings)
+        if cache.has(keys[0]):
+            png = cache.get(keys[0])
+
+    Hit and miss counters cover the lifetime of the instance.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: int = DEFAULT_CACHE_SIZE_MB):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached pages (created if missing)
+            max_size_mb: Size limit in megabytes before old entries are evicted
+
+        Raises:
+            ValueError: If max_size_mb is not positive
+        """
+        if max_size_mb <= 0:
+            raise ValueError(f"max_size_mb must be > 0, got {max_size_mb}")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def document_keys(
+        self,
+        doc: fitz.Document,
+        settings: Any,
+        pages: Optional[Sequence[int]] = None,
+    ) -> List[str]:
+        """Compute the cache keys of the pages of a document.
+
+        Args:
+            doc: Open PDF document
+            settings: Render settings; their repr() is part of the key
+            pages: 0-based pages to compute keys for (default: all pages)
+
+        Returns:
+            One hex key per requested page, in the requested order
+        """
+        prefix = f"{CACHE_FORMAT_VERSION}|{fitz.VersionBind}|{settings!r}|".encode()
+        memo: Dict[int, str] = {}
+        return [
+            hashlib.sha256(prefix + _page_digest(doc, doc[n], memo).encode()).hexdigest()
+            for n in (range(len(doc)) if pages is None else pages)
+        ]
+
+    def has(self, key: str) -> bool:
+        """Check whether a page is cached, counting the lookup as a hit or miss."""
+        found = self._path(key).exists()
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a cached page and mark it as recently used.
+
+        Returns:
+            Encoded page image, or None if the entry is missing (e.g. evicted)
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a rendered page, evicting old entries if the cache is full."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # An entry that is overwritten no longer counts towards the size
+        replaced_size = _file_size(path)
+
+        # Write atomically so concurrent readers never see partial entries
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if self._size_bytes is None:
+                # Counted from disk, which already holds the new entry
+                size = self._current_size()
+            else:
+                size = self._size_bytes - replaced_size + len(data)
+            self._size_bytes = size
+            if size > self.max_size_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached page."""
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self._size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters and the current size of the cache."""
+        with self._lock:
+            entries = self._entries()
+            size = sum(_file_size(path) for path in entries)
+            self._size_bytes = size
+            return {
+                "cache_dir": str(self.cache_dir),
+                "entries": len(entries),
+                "size_bytes": size,
+                "max_size_bytes": self.max_size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def _entries(self) -> List[Path]:
+        return list(self.cache_dir.glob("??/*.png"))
+
+    def _current_size(self) -> int:
+        if self._size_bytes is None:
+            self._size_bytes = sum(_file_size(path) for path in self._entries())
+        return self._size_bytes
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its limit."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            self.evictions += 1
+        self._size_bytes = size
+
+
+# Caches shared within this process, keyed by resolved directory
+_caches: Dict[Path, PageCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_page_cache(cache_dir: str | Path, max_size_mb: int = DEFAULT_CACHE_SIZE_MB) -> PageCache:
+    """Return the process-wide cache for a directory, creating it on first use.
+
+    Sharing one instance per directory keeps the hit/miss counters of all
+    conversions (e.g. of the API server) in one place.
+
+    Args:
+        cache_dir: Directory holding cached pages
+        max_size_mb: Size limit used when the cache is created
+
+    Returns:
+        PageCache for the directory
+    """
+    path = Path(cache_dir).expanduser().resolve()
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = PageCache(path, max_size_mb)
+        return _caches[path]
+
+
+def page_cache_stats() -> List[Dict[str, Any]]:
+    """Return the statistics of every cache used in this process."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _page_digest(doc: fitz.Document, page: fitz.Page, memo: Dict[int, str]) -> str:
+    """Hash what a page draws, independently of PDF object numbering."""
+    h = hashlib.sha256()
+    h.update(page.read_contents())
+    h.update(repr((tuple(page.rect), tuple(page.mediabox), page.rotation)).encode())
+
+    # Resources and annotations may be inherited or indirect; hash them by content
+    for key in ("Resources", "Annots"):
+        value = _inherited_key(doc, page.xref, key)
+        h.update(f"/{key}".encode())
+        h.update(_canonical_value(doc, value, memo).encode())
+    return h.hexdigest()
+
+
+def _inherited_key(doc: fitz.Document, xref: int, key: str) -> str:
+    """Look up a page dictionary key, following the page tree for inherited values."""
+    seen = set()
+    while xref and xref not in seen:
+        seen.add(xref)
+        value_type, value = doc.xref_get_key(xref, key)
+        if value_type != "null":
+            return value
+        parent_type, parent = doc.xref_get_key(xref, "Parent")
+        if parent_type != "xref":
+            break
+        xref = int(parent.split()[0])
+    return ""
+
+
+def _canonical_value(doc: fitz.Document, value: str, memo: Dict[int, str]) -> str:
+    """Replace object references in a PDF value with digests of their content."""
+    value = _BACK_REFERENCE_PATTERN.sub("", value)
+    return _REFERENCE_PATTERN.sub(
+        lambda match: _object_digest(doc, int(match.group(1)), memo), value
+    )
+
+
+def _object_digest(doc: fitz.Document, xref: int, memo: Dict[int, str]) -> str:
+    """Hash an indirect object and everything it references."""
+    if xref in memo:
+        return memo[xref]
+    # Placeholder for reference cycles (e.g. annotations pointing at each other)
+    memo[xref] = f"<cycle {xref}>"
+
+    h = hashlib.sha256()
+    if 0 < xref < doc.xref_length():
+        h.update(_canonical_value(doc, doc.xref_object(xref, compressed=True), memo).encode())
+        if doc.xref_is_stream(xref):
+            h.update(doc.xref_stream_raw(xref) or b"")
+    memo[xref] = h.hexdigest()
+    return memo[xref]
@@ -0,0 +1,135 @@
+"""Encode exported .note pages in compact image formats.
+
+Rendered pages are mostly white paper with dark ink, so a full-color PNG
+written with default settings spends most of its bytes (and encode time)
+on information the page doesn't have. Each output profile trades encode
+speed against file size:
+
+- png: RGB PNG with default settings (zlib level 6)
+- png-fast: RGB PNG at zlib level 1; fastest, about 3x larger
+- png-small: RGB PNG with Pillow's optimizer (zlib level 9, filter search)
+- gray4: 16-level grayscale as a 4-bit palette PNG, matching the e-ink panel
+- bw: black and white 1-bit PNG (threshold at mid-gray); smallest PNG
+- webp: lossless WebP; smallest files, slowest to encode
+
+The gray4 and bw profiles drop color: pages drawn with colored pens are
+stored as their gray values.
+"""
+
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from PIL import Image
+
+from obsidian_supernote.converters.quantize import (
+    DEFAULT_GRAY_LEVELS,
+    gray_palette,
+    png_bit_depth,
+)
+
+# Profile name -> (file suffix, Pillow format, save options)
+_PROFILES: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "png": (".png", "PNG", {}),
+    "png-fast": (".png", "PNG", {"compress_level": 1}),
+    "png-small": (".png", "PNG", {"optimize": True}),
+    "gray4": (".png", "PNG", {"bits": png_bit_depth(DEFAULT_GRAY_LEVELS), "compress_level": 9}),
+    "bw": (".png", "PNG", {"compress_level": 9}),
+    "webp": (".webp", "WEBP", {"lossless": True, "quality": 80, "method": 4}),
+}
+
+IMAGE_PROFILES = tuple(_PROFILES)
+DEFAULT_IMAGE_PROFILE = "png"
+
+# Lookup tables mapping 8-bit gray onto palette indices and black/white
+_GRAY_INDEX_LUT = [round(p * (DEFAULT_GRAY_LEVELS - 1) / 255) for p in range(256)]
+_GRAY_PALETTE = [value for gray in gray_palette(DEFAULT_GRAY_LEVELS) for value in (gray,) * 3]
+_THRESHOLD_LUT = [255 if p >= 128 else 0 for p in range(256)]
+
+
+def validate_image_profile(profile: str) -> None:
+    """Check an image profile name.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in _PROFILES:
+        raise ValueError(
+            f"Unknown image profile '{profile}' (expected one of {', '.join(IMAGE_PROFILES)})"
+        )
+
+
+def image_suffix(profile: str) -> str:
+    """Return the file suffix of images written with a profile."""
+    validate_image_profile(profile)
+    return _PROFILES[profile][0]
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Composite transparent areas onto white paper."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, "white")
+        return Image.alpha_composite(background, rgba).convert("RGB")
+    return img
+
+
+def encode_page_image(
+    img: Image.Image, profile: str
+) -> Tuple[Image.Image, str, Dict[str, Any]]:
+    """Convert a rendered page to the image mode and save options of a profile.
+
+    Args:
+        img: Rendered page
+        profile: One of IMAGE_PROFILES
+
+    Returns:
+        Tuple of (image to save, Pillow format, save options)
+    """
+    validate_image_profile(profile)
+    _, image_format, options = _PROFILES[profile]
+
+    if profile == "gray4":
+        # Index through a lookup table instead of quantize(): a fixed gray
+        # ramp needs no palette search and no NumPy
+        indices = _flatten(img).convert("L").point(_GRAY_INDEX_LUT)
+        img = Image.frombytes("P", indices.size, indices.tobytes())
+        img.putpalette(_GRAY_PALETTE)
+    elif profile == "bw":
+        # Threshold rather than dither: dithered paper compresses poorly
+        img = _flatten(img).convert("L").point(_THRESHOLD_LUT, "1")
+    else:
+        img = _flatten(img)
+    return img, image_format, options
+
+
+def save_page_image(img: Image.Image, output_path: Path, profile: str = DEFAULT_IMAGE_PROFILE) -> Path:
+    """Save a rendered page with an output profile.
+
+    Args:
+        img: Rendered page
+        output_path: Image file to write (its suffix should match image_suffix())
+        profile: One of IMAGE_PROFILES
+
+    Returns:
+        Path to the saved image
+    """
+    img, image_format, options = encode_page_image(img, profile)
+    img.save(output_path, image_format, **options)
+    return Path(output_path)
+
+
+def page_image_bytes(img: Image.Image, profile: str = DEFAULT_IMAGE_PROFILE) -> bytes:
+    """Encode a rendered page with an output profile.
+
+    Args:
+        img: Rendered page
+        profile: One of IMAGE_PROFILES
+
+    Returns:
+        Encoded image data
+    """
+    img, image_format, options = encode_page_image(img, profile)
+    buffer = BytesIO()
+    img.save(buffer, image_format, **options)
+    return buffer.getvalue()
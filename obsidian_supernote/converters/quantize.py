@@ -0,0 +1,138 @@
+"""Quantize background pages to the gray levels of the Supernote e-ink panel.
+
+Supernote screens show a small number of gray levels (16 on current
+devices), so storing 8-bit or full-color backgrounds wastes space: a page
+mapped onto the panel's levels can be stored as a 4-bit palette PNG, which
+is several times smaller and cheaper to encode.
+
+Three quantization modes are supported:
+- levels: map every pixel to the nearest gray level (no dithering)
+- ordered: 8x8 Bayer ordered dithering, fully vectorized with NumPy
+- diffusion: Floyd-Steinberg error diffusion (Pillow's C implementation)
+
+NumPy is an optional dependency, only needed for "levels" and "ordered".
+"""
+
+from io import BytesIO
+from typing import List
+
+from PIL import Image
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    NUMPY_AVAILABLE = False
+
+
+# "off" disables the quantization stage entirely
+QUANTIZE_MODES = ("off", "levels", "ordered", "diffusion")
+
+# Gray levels of the Supernote e-ink panels
+DEFAULT_GRAY_LEVELS = 16
+
+# 8x8 Bayer index matrix (values 0..63)
+_BAYER_8X8 = [
+    [0, 32, 8, 40, 2, 34, 10, 42],
+    [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38],
+    [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41],
+    [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37],
+    [63, 31, 55, 23, 61, 29, 53, 21],
+]
+
+
+def validate_quantize_options(mode: str, levels: int) -> None:
+    """Check quantization options before any page is rendered.
+
+    Args:
+        mode: One of QUANTIZE_MODES
+        levels: Number of gray levels (2-256)
+
+    Raises:
+        ValueError: If the mode or level count is invalid
+        RuntimeError: If the mode requires NumPy and it is not installed
+    """
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(
+            f"Unknown quantize mode '{mode}' (expected one of {', '.join(QUANTIZE_MODES)})"
+        )
+    if not 2 <= levels <= 256:
+        raise ValueError(f"gray levels must be between 2 and 256, got {levels}")
+    if mode in ("levels", "ordered") and not NUMPY_AVAILABLE:
+        raise RuntimeError(
+            f"Quantize mode '{mode}' requires NumPy. Install it with: pip install obsidian-supernote[eink]"
+        )
+
+
+def gray_palette(levels: int) -> List[int]:
+    """Return the gray values of evenly spaced levels from black to white."""
+    return [round(i * 255 / (levels - 1)) for i in range(levels)]
+
+
+def png_bit_depth(levels: int) -> int:
+    """Return the smallest PNG palette bit depth that can index all levels."""
+    for bits in (1, 2, 4):
+        if levels <= 1 << bits:
+            return bits
+    return 8
+
+
+def quantize_gray_image(img: Image.Image, levels: int, mode: str) -> Image.Image:
+    """Map an 8-bit grayscale image onto evenly spaced gray levels.
+
+    Args:
+        img: Image in mode "L"
+        levels: Number of gray levels (2-256)
+        mode: Quantization mode ("levels", "ordered" or "diffusion")
+
+    Returns:
+        Palette ("P") image whose indices address the gray levels
+    """
+    palette = gray_palette(levels)
+    rgb_palette = [channel for value in palette for channel in (value, value, value)]
+
+    if mode == "diffusion":
+        # Error diffusion is sequential per pixel, so leave it to Pillow's C code.
+        # Pillow only maps RGB images onto a fixed palette reliably.
+        palette_img = Image.new("P", (1, 1))
+        palette_img.putpalette(rgb_palette)
+        quantized = img.convert("RGB").quantize(
+            palette=palette_img, dither=Image.Dither.FLOYDSTEINBERG
+        )
+    else:
+        pixels = np.asarray(img, dtype=np.uint32)
+        if mode == "ordered":
+            # floor(p * (levels - 1) / 255 + (b + 0.5) / 64), in integer arithmetic
+            height, width = pixels.shape
+            bayer = np.asarray(_BAYER_8X8, dtype=np.uint32)
+            threshold = np.tile(bayer, (height // 8 + 1, width // 8 + 1))[:height, :width]
+            indices = (pixels * ((levels - 1) * 128) + (2 * threshold + 1) * 255) // (255 * 128)
+            indices = np.minimum(indices, levels - 1).astype(np.uint8)
+        else:
+            lut = np.rint(np.arange(256) * (levels - 1) / 255).astype(np.uint8)
+            indices = lut[pixels]
+        quantized = Image.frombytes("P", img.size, np.ascontiguousarray(indices).tobytes())
+
+    quantized.putpalette(rgb_palette)
+    return quantized
+
+
+def encode_quantized_png(img: Image.Image, levels: int, mode: str) -> bytes:
+    """Quantize a grayscale image and encode it as a low-bit-depth palette PNG.
+
+    Args:
+        img: Image in mode "L"
+        levels: Number of gray levels (2-256)
+        mode: Quantization mode ("levels", "ordered" or "diffusion")
+
+    Returns:
+        PNG image data as bytes (4-bit palette for 16 levels)
+    """
+    quantized = quantize_gray_image(img, levels, mode)
+    buffer = BytesIO()
+    quantized.save(buffer, format="PNG", bits=png_bit_depth(levels))
+    return buffer.getvalue()
@@ -0,0 +1,142 @@
+"""Registry of device-ready PNG templates.
+
+Creating a note from a MyStyle template reads the PNG, resizes or re-encodes
+it for the target device and hashes the result - the same work every time
+the same template is used. The registry keeps the prepared PNG and its MD5
+per template content and render settings (device size, color mode,
+quantization): in memory for repeated conversions within one process, and
+in a PageCache directory so other processes (CLI runs, the API server) reuse
+them as well.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from obsidian_supernote.converters.page_cache import PageCache, get_page_cache
+
+# Bump when the key derivation or the prepared template format changes
+TEMPLATE_FORMAT_VERSION = 1
+
+# Prepared templates kept in memory per registry
+DEFAULT_MEMORY_ENTRIES = 32
+
+
+class TemplateCache:
+    """Prepared PNG templates keyed by template content and render settings.
+
+    Example:
+        cache = get_template_cache("~/.cache/obsidian-supernote")
+        key = cache.key(png_path.read_bytes(), settings)
+        cached = cache.get(key)
+        if cached is None:
+            cache.put(key, png_data, png_md5)
+    """
+
+    def __init__(self, store: Optional[PageCache] = None, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """Initialize the registry.
+
+        Args:
+            store: On-disk cache shared with other processes (memory only if None)
+            max_entries: Number of prepared templates kept in memory
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be > 0, got {max_entries}")
+
+        self.store = store
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(template_data: bytes, settings: Any) -> str:
+        """Compute the key of a template file for the given render settings.
+
+        Args:
+            template_data: Contents of the template file
+            settings: Render settings; their repr() is part of the key
+
+        Returns:
+            Hex key
+        """
+        prefix = f"template|{TEMPLATE_FORMAT_VERSION}|{settings!r}|".encode()
+        return hashlib.sha256(prefix + template_data).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Look up a prepared template, counting the lookup as a hit or miss.
+
+        Returns:
+            Tuple of (PNG data, MD5 hex digest), or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        png_data = self.store.get(key) if self.store else None
+        if png_data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        entry = (png_data, hashlib.md5(png_data).hexdigest())
+        with self._lock:
+            self.hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, png_data: bytes, png_md5: str) -> None:
+        """Store a prepared template in memory and in the on-disk store."""
+        with self._lock:
+            self._remember(key, (png_data, png_md5))
+        if self.store:
+            self.store.put(key, png_data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters of the registry."""
+        with self._lock:
+            return {
+                "cache_dir": str(self.store.cache_dir) if self.store else None,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, entry: Tuple[bytes, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Registries shared within this process, keyed by resolved directory
+_caches: Dict[Optional[Path], TemplateCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_template_cache(cache_dir: str | Path | None = None) -> TemplateCache:
+    """Return the process-wide template registry for a directory.
+
+    Prepared templates are stored in the same directory (and size limit) as
+    the rendered-page cache.
+
+    Args:
+        cache_dir: On-disk cache directory; None keeps templates in memory only
+
+    Returns:
+        TemplateCache for the directory
+    """
+    path = Path(cache_dir).expanduser().resolve() if cache_dir is not None else None
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = TemplateCache(get_page_cache(path) if path else None)
+        return _caches[path]
@@ -6,8 +6,22 @@ This module provides parsers for reading and understanding different file format
 - Markdown frontmatter parser
 """
 
-from obsidian_supernote.parsers.note_parser import NoteFileParser
+from obsidian_supernote.parsers.handwriting import HandwritingIndex
+from obsidian_supernote.parsers.note_index import NoteIndex
+from obsidian_supernote.parsers.note_parser import (
+    NoteFileParser,
+    iter_note_summaries,
+    read_note_metadata,
+    read_note_page,
+    read_note_summary,
+)
 
 __all__ = [
+    "HandwritingIndex",
     "NoteFileParser",
+    "NoteIndex",
+    "iter_note_summaries",
+    "read_note_metadata",
+    "read_note_page",
+    "read_note_summary",
 ]
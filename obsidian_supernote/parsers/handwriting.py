@@ -0,0 +1,163 @@
+"""Lazy access to the handwriting archive of a .note file.
+
+Notes written on a computer carry their handwriting as a ZIP archive
+(MyScript iink format) appended to the note data: a meta.json and
+rel.json at the root, and per page a pages/<id>/meta.json and the ink
+strokes in pages/<id>/ink.bink. The index opens the archive through a
+zero-copy view of the file, reads only its central directory, and parses
+page metadata when it is asked for. Ink data is decompressed one page at
+a time as it is streamed out.
+"""
+
+import io
+import json
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable file object over a buffer; reads copy only what is requested."""
+
+    def __init__(self, buffer: Any):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise OSError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, target: Any) -> int:
+        chunk = self._view[self._position : self._position + len(target)]
+        size = len(chunk)
+        target[:size] = chunk
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class HandwritingIndex:
+    """Index of the pages in a handwriting archive, read on demand.
+
+    Example:
+        with NoteFileParser(note_path, lazy=True) as parser:
+            parser.parse(read_handwriting=False)
+            handwriting = parser.get_handwriting()
+            for page_id in handwriting.page_ids:
+                if handwriting.has_content(page_id):
+                    handwriting.extract_ink(page_id, out_dir / f"{page_id}.bink")
+    """
+
+    def __init__(self, archive: Any):
+        """Open a handwriting archive, reading its central directory only.
+
+        Args:
+            archive: Archive content (bytes, memoryview or mmap; not copied)
+
+        Raises:
+            zipfile.BadZipFile: If the data is not a ZIP archive
+        """
+        self._reader = _BufferReader(archive)
+        self._zip = zipfile.ZipFile(self._reader)
+        self.files: List[str] = self._zip.namelist()
+        self._names = set(self.files)
+        self._page_meta: Dict[str, Dict[str, Any]] = {}
+
+        # Pages are the directories with page metadata, in archive order
+        self.page_ids: List[str] = list(dict.fromkeys(
+            filename.split("/")[1]
+            for filename in self.files
+            if filename.startswith("pages/") and filename.endswith("meta.json")
+        ))
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages with handwriting metadata."""
+        return len(self.page_ids)
+
+    def read_json(self, filename: str) -> Optional[Any]:
+        """Parse a JSON file of the archive.
+
+        Returns:
+            Parsed JSON, or None if the archive has no such file
+        """
+        if filename not in self._names:
+            return None
+        return json.loads(self._zip.read(filename))
+
+    def page_meta(self, page_id: str) -> Dict[str, Any]:
+        """Get a page's metadata, parsing it on first use.
+
+        Raises:
+            KeyError: If the page does not exist
+        """
+        if page_id not in self._page_meta:
+            if page_id not in self.page_ids:
+                raise KeyError(f"No handwriting page '{page_id}'")
+            self._page_meta[page_id] = self.read_json(f"pages/{page_id}/meta.json") or {}
+        return self._page_meta[page_id]
+
+    def has_content(self, page_id: str) -> bool:
+        """Check whether the page metadata marks the page as written on."""
+        return bool(self.page_meta(page_id).get("pageHasContent", False))
+
+    def ink_size(self, page_id: str) -> Optional[int]:
+        """Get the uncompressed size of a page's ink data, without reading it.
+
+        Returns:
+            Size in bytes, or None if the page has no ink file
+        """
+        ink_file = f"pages/{page_id}/ink.bink"
+        if ink_file not in self._names:
+            return None
+        return self._zip.getinfo(ink_file).file_size
+
+    def open_ink(self, page_id: str) -> BinaryIO:
+        """Open a page's ink data for streaming; it is decompressed as it is read.
+
+        Raises:
+            KeyError: If the page has no ink file
+        """
+        return self._zip.open(f"pages/{page_id}/ink.bink")
+
+    def extract_ink(self, page_id: str, output_path: Path) -> Path:
+        """Stream a page's ink data to a file.
+
+        Raises:
+            KeyError: If the page has no ink file
+        """
+        output_path = Path(output_path)
+        with self.open_ink(page_id) as source, output_path.open("wb") as target:
+            shutil.copyfileobj(source, target)
+        return output_path
+
+    def close(self) -> None:
+        """Close the archive and release the view of its data."""
+        self._zip.close()
+        self._reader.close()
+
+    def __enter__(self) -> "HandwritingIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,233 @@
+"""Persistent metadata index of .note files.
+
+Reading a note's metadata blocks is cheap, but a vault holds thousands of
+notes and most of them have not changed since the last look. The index
+stores each note's summary, header metadata and per-page metadata (page
+IDs, background style MD5s, content hashes, handwriting flags) in a SQLite
+database, keyed by path, size and modification time. A note is read again
+only when its size or mtime differs from the stored entry, so refreshing
+the index costs one stat() per unchanged file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from obsidian_supernote.parsers.note_parser import read_note_metadata
+
+# Bump when the stored record format changes; older databases are rebuilt
+INDEX_FORMAT_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    summary TEXT,
+    metadata TEXT,
+    pages TEXT,
+    has_handwriting INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    indexed_at REAL NOT NULL
+)
+"""
+
+
+class NoteIndex:
+    """SQLite index of .note metadata, refreshed from stale files only.
+
+    Records are dictionaries with the note's path, size, mtime_ns, summary
+    (as read_note_summary()), metadata, pages (with a content hash per page,
+    see page_content_hash()) and error. Unreadable files
+    are recorded with an error message (and no summary) so they are not
+    read again until they change.
+
+    Example:
+        with NoteIndex("~/.cache/obsidian-supernote/notes.sqlite") as index:
+            index.refresh(vault_dir)
+            for record in index.records(vault_dir):
+                print(record["path"], record["summary"]["pages_count"])
+
+    Hit and miss counters cover the lifetime of the instance.
+    """
+
+    def __init__(self, db_path: str | Path = ":memory:"):
+        """Open (or create) the index database.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a temporary index)
+        """
+        if str(db_path) != ":memory:":
+            db_path = Path(db_path).expanduser()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_FORMAT_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS notes")
+                self._connection.execute(f"PRAGMA user_version = {INDEX_FORMAT_VERSION}")
+            self._connection.execute(_SCHEMA)
+
+    def get(self, note_file: str | Path) -> Dict[str, Any]:
+        """Get the record of a note, reading the note only if it changed.
+
+        Args:
+            note_file: Path to .note file
+
+        Returns:
+            Record of the note
+
+        Raises:
+            OSError: If the file can't be accessed
+        """
+        path = Path(note_file).resolve()
+        stat = path.stat()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM notes WHERE path = ?", (str(path),)
+            ).fetchone()
+        if row is not None and (row[1], row[2]) == (stat.st_size, stat.st_mtime_ns):
+            with self._lock:
+                self.hits += 1
+            return self._record(row)
+
+        with self._lock:
+            self.misses += 1
+        return self._index_file(path, stat)
+
+    def refresh(self, root: str | Path, pattern: str = "*.note") -> Dict[str, int]:
+        """Bring the index up to date with the notes in a directory.
+
+        New and changed notes are read, unchanged ones only stat()ed, and
+        entries of notes that no longer exist under root are removed.
+
+        Args:
+            root: Directory searched recursively
+            pattern: File name pattern of notes
+
+        Returns:
+            Counts of "indexed", "unchanged", "removed" and "failed" notes
+        """
+        root = Path(root).resolve()
+        stored = {
+            row[0]: (row[1], row[2])
+            for row in self._rows_under(root, "SELECT path, size, mtime_ns FROM notes")
+        }
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+
+        for path in root.rglob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if stored.pop(str(path), None) == (stat.st_size, stat.st_mtime_ns):
+                counts["unchanged"] += 1
+                continue
+            record = self._index_file(path, stat)
+            counts["failed" if record["error"] else "indexed"] += 1
+
+        with self._lock:
+            self.hits += counts["unchanged"]
+            self.misses += counts["indexed"] + counts["failed"]
+
+        if stored:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "DELETE FROM notes WHERE path = ?", [(path,) for path in stored]
+                )
+            counts["removed"] = len(stored)
+        return counts
+
+    def records(self, root: str | Path | None = None) -> List[Dict[str, Any]]:
+        """Return the stored records, without checking the files.
+
+        Args:
+            root: Only return notes under this directory (default: all)
+
+        Returns:
+            Records sorted by path
+        """
+        if root is None:
+            with self._lock:
+                rows = self._connection.execute("SELECT * FROM notes ORDER BY path").fetchall()
+        else:
+            rows = self._rows_under(Path(root).resolve(), "SELECT * FROM notes", "ORDER BY path")
+        return [self._record(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters of the index."""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+            return {
+                "db_path": str(self.db_path),
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "NoteIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _index_file(self, path: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Read a note's metadata and store it under its current size and mtime."""
+        try:
+            data: Optional[Dict[str, Any]] = read_note_metadata(path, content_hashes=True)
+            error = None
+        except (OSError, ValueError) as e:
+            data = None
+            error = str(e)
+
+        row = (
+            str(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            json.dumps(data["summary"]) if data else None,
+            json.dumps(data["metadata"]) if data else None,
+            json.dumps(data["pages"]) if data else None,
+            int(bool(data and data["summary"]["has_handwriting"])),
+            error,
+            time.time(),
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+        return self._record(row)
+
+    def _rows_under(self, root: Path, query: str, suffix: str = "") -> Iterable[tuple]:
+        """Run a query restricted to paths under root."""
+        prefix = os.path.join(str(root), "")
+        with self._lock:
+            return self._connection.execute(
+                f"{query} WHERE substr(path, 1, ?) = ? {suffix}", (len(prefix), prefix)
+            ).fetchall()
+
+    @staticmethod
+    def _record(row: tuple) -> Dict[str, Any]:
+        path, size, mtime_ns, summary, metadata, pages, _, error, _ = row
+        return {
+            "path": path,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "summary": json.loads(summary) if summary else None,
+            "metadata": json.loads(metadata) if metadata else None,
+            "pages": json.loads(pages) if pages else [],
+            "error": error,
+        }
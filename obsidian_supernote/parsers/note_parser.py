@@ -1,14 +1,107 @@
 """Parse and inspect Supernote .note files."""
 
 import zipfile
+import hashlib
 import json
+import math
+import mmap
 import re
+import struct
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from os import cpu_count
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
 from io import BytesIO
 
 from PIL import Image
 
+from obsidian_supernote.parsers.handwriting import HandwritingIndex
+
+# Header metadata tags (format: <TAG_NAME:value>)
+_HEADER_TAG_PATTERN = re.compile(r"<([A-Z_]+):([^>]+)>")
+
+# Any <KEY:VALUE> tag of a metadata block; values never contain angle brackets
+_TAG_PATTERN = re.compile(r"<([^:<>]+):([^<>]*)>")
+
+# Base64-encoded page references (comma-separated, from PDFSTYLELIST)
+_PAGE_REFERENCE_PATTERN = re.compile(rb"([A-Za-z0-9+/=]{20,}),")
+
+# Raw file content: bytes, or zero-copy memoryview slices of a memory-mapped file
+Buffer = Union[bytes, memoryview]
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_FILE_TYPE = b"note"
+_SIGNATURE_PATTERN = re.compile(rb"SN_FILE_VER_(\d{8})")
+_TAIL_MARKER = b"tail"
+_LAYER_NAMES = ("MAINLAYER", "LAYER1", "LAYER2", "LAYER3", "BGLAYER")
+# Page tags that change how a page renders, besides its layers (the style
+# MD5 is left out: it also covers the source size, and the background layer
+# itself is hashed)
+_RENDERED_PAGE_TAGS = ("PAGESTYLE", "LAYERINFO", "LAYERSEQ", "ORIENTATION")
+_PAGE_KEY_PATTERN = re.compile(r"PAGE(\d+)$")
+
+# ZIP end of central directory record: signature, then (after 8 bytes of
+# disk and entry counts) the central directory size and offset
+_ZIP_EOCD_SIGNATURE = b"PK\x05\x06"
+_ZIP_EOCD_SIZE = 22
+_ZIP_MAX_COMMENT = 0xFFFF
+
+# Page sizes (width, height): A5X2 (equipment "N5") and all other devices
+_A5X2_PAGE_SIZE = (1920, 2560)
+_DEFAULT_PAGE_SIZE = (1404, 1872)
+_ORIENTATION_HORIZONTAL = "1090"
+
+# Files from this signature version on use the X2 gray color codes
+_X2_SIGNATURE_VERSION = 20230015
+
+# Size of the built-in blank white style background, whose 0xff run
+# lengths stand for 0x400 instead of 0x4000 pixels
+_BLANK_STYLE_BLOCK_SIZE = 0x140E
+
+
+def _find_zip_start(tail: Any, file_size: int) -> Optional[int]:
+    """Locate a ZIP archive at the end of a file through its end record.
+
+    Args:
+        tail: The last bytes of the file (at least the last 64 KiB + 22 bytes,
+              where the end record must be), or the whole file
+        file_size: Size of the file
+
+    Returns:
+        Offset of the archive in the file, or None if the file does not end with one
+    """
+    tail_offset = file_size - len(tail)
+    search_start = max(0, len(tail) - _ZIP_EOCD_SIZE - _ZIP_MAX_COMMENT)
+    eocd = tail.rfind(_ZIP_EOCD_SIGNATURE, search_start)
+    if eocd == -1 or eocd + _ZIP_EOCD_SIZE > len(tail):
+        return None
+    directory_size, directory_offset, comment_size = struct.unpack_from(
+        "<IIH", tail, eocd + 12
+    )
+    if eocd + _ZIP_EOCD_SIZE + comment_size != len(tail):
+        return None
+    zip_start = tail_offset + eocd - directory_size - directory_offset
+    if zip_start < 0:
+        return None
+    return zip_start
+
+
+def _parse_header_tags(header: bytes) -> Dict[str, str]:
+    """Parse header tags into metadata with lowercase keys."""
+    return {
+        match.group(1).lower(): match.group(2)
+        for match in _HEADER_TAG_PATTERN.finditer(header.decode("utf-8", errors="ignore"))
+    }
+
+
+def _page_keys(footer: Dict[str, str]) -> List[Tuple[int, str]]:
+    """Return (page number, footer key) of every page, in page order."""
+    return sorted(
+        (int(match.group(1)), key)
+        for key in footer
+        if (match := _PAGE_KEY_PATTERN.match(key))
+    )
+
 
 class NoteFileParser:
     """Parser for Supernote .note files.
@@ -17,31 +110,99 @@ class NoteFileParser:
     1. Binary header with metadata
     2. Embedded PNG images (PDF template pages)
     3. ZIP archive with handwriting data (MyScript iink format)
+
+    Two parsing modes are available:
+    - structured: follow the footer address at the end of the file to the
+      footer, header, page and layer metadata blocks, and read each layer
+      (PNG or RATTA_RLE) through its length prefix. Only metadata is
+      scanned, so the cost grows with the number of pages, not the file size.
+    - scan: search the whole file for PNG and ZIP signatures. Works on
+      damaged files without a valid footer.
+    The default "auto" mode parses structurally and falls back to scanning.
+
+    By default the file is read into memory and images are copied out of
+    it. With lazy=True the file is memory-mapped instead: images, layers and
+    the ZIP archive are memoryview slices of the mapping, so only the pages
+    of the file that are actually read get loaded, and nothing is copied
+    until an image is decoded. Close lazy parsers (or use them as a context
+    manager) to release the mapping.
+
+    The handwriting ZIP archive is never copied by parsing: get_handwriting()
+    opens it in place and reads page metadata on demand.
     """
 
-    def __init__(self, note_file: Path):
+    PARSE_MODES = ("auto", "structured", "scan")
+
+    def __init__(self, note_file: Path, mode: str = "auto", lazy: bool = False):
         """Initialize the parser.
 
         Args:
             note_file: Path to .note file
+            mode: Parsing mode ("auto", "structured" or "scan")
+            lazy: Memory-map the file instead of reading it into memory
+
+        Raises:
+            ValueError: If the mode is unknown
         """
+        if mode not in self.PARSE_MODES:
+            raise ValueError(
+                f"Unknown parse mode '{mode}' (expected one of {', '.join(self.PARSE_MODES)})"
+            )
         self.note_file = Path(note_file)
-        self.file_data = self.note_file.read_bytes()
+        self.mode = mode
+        self.lazy = lazy
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self.file_data: Union[bytes, mmap.mmap] = b""
+        if lazy:
+            self._file = self.note_file.open("rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                pass  # Empty files can't be mapped
+            else:
+                self.file_data = self._mmap
+                self._view = memoryview(self._mmap)
+        else:
+            self.file_data = self.note_file.read_bytes()
         self.metadata: Dict[str, Any] = {}
-        self.png_images: List[bytes] = []
-        self.zip_data: Optional[bytes] = None
+        self.png_images: List[Buffer] = []
         self.zip_contents: Dict[str, Any] = {}
+        self._zip_start: Optional[int] = None
+        self._zip_bytes: Optional[bytes] = None
+        self._handwriting: Optional[HandwritingIndex] = None
+        # Filled by structured parsing only
+        self.footer: Dict[str, str] = {}
+        self.pages: List[Dict[str, Any]] = []
+        self.parsed_structurally = False
 
-    def parse(self) -> Dict[str, Any]:
+    def parse(self, read_handwriting: bool = True) -> Dict[str, Any]:
         """Parse the entire .note file.
 
+        Args:
+            read_handwriting: Parse the metadata of every handwriting page into
+                              zip_contents (get_handwriting() reads it on demand)
+
         Returns:
             Dictionary containing all parsed information
+
+        Raises:
+            ValueError: In structured mode, if the file's block structure is invalid
         """
-        self._parse_header()
-        self._extract_png_images()
-        self._extract_zip_archive()
-        self._parse_zip_contents()
+        if self.mode != "scan":
+            try:
+                self._parse_structured()
+            except ValueError:
+                if self.mode == "structured":
+                    raise
+                self._reset()
+        if not self.parsed_structurally:
+            self._parse_header()
+            self._extract_png_images()
+            self._extract_zip_archive()
+        if read_handwriting:
+            self._parse_zip_contents()
 
         return {
             "file_path": str(self.note_file),
@@ -49,10 +210,262 @@ class NoteFileParser:
             "metadata": self.metadata,
             "png_count": len(self.png_images),
             "png_images": self.png_images,
-            "zip_size": len(self.zip_data) if self.zip_data else 0,
+            "zip_size": self._zip_size(),
             "zip_contents": self.zip_contents,
         }
 
+    @property
+    def zip_data(self) -> Optional[Buffer]:
+        """Raw handwriting ZIP archive (a memoryview for lazy parsers), or None."""
+        if self._zip_start is None:
+            return None
+        if self._view is not None:
+            return self._view[self._zip_start :]
+        if self._zip_bytes is None:
+            self._zip_bytes = self.file_data[self._zip_start :]
+        return self._zip_bytes
+
+    def _zip_size(self) -> int:
+        if self._zip_start is None:
+            return 0
+        return len(self.file_data) - self._zip_start
+
+    def get_handwriting(self) -> Optional[HandwritingIndex]:
+        """Get the index of the handwriting archive, opened without copying it.
+
+        Only the archive's central directory is read; page metadata and ink
+        data are read when they are asked for.
+
+        Returns:
+            HandwritingIndex, or None if the file has no handwriting archive
+
+        Raises:
+            zipfile.BadZipFile: If the archive is corrupt
+        """
+        if self._zip_start is None:
+            return None
+        if self._handwriting is None:
+            source = self._view if self._view is not None else memoryview(self.file_data)
+            self._handwriting = HandwritingIndex(source[self._zip_start :])
+        return self._handwriting
+
+    def close(self) -> None:
+        """Release the memory mapping of a lazy parser.
+
+        Slices handed out by the parser keep the mapping alive until they are
+        released themselves.
+        """
+        self.png_images = []
+        self._close_handwriting()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Closed when the remaining slices are garbage collected
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "NoteFileParser":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _slice(self, start: int, end: int) -> Buffer:
+        """Return file content without copying it when the file is mapped."""
+        if self._view is not None:
+            return self._view[start:end]
+        return self.file_data[start:end]
+
+    def _close_handwriting(self) -> None:
+        if self._handwriting is not None:
+            self._handwriting.close()
+            self._handwriting = None
+        self._zip_start = None
+        self._zip_bytes = None
+
+    def _reset(self) -> None:
+        """Discard the results of a failed structured parse."""
+        self.metadata = {}
+        self.png_images = []
+        self._close_handwriting()
+        self.footer = {}
+        self.pages = []
+        self.parsed_structurally = False
+
+    def _parse_structured(self) -> None:
+        """Parse the file by following block addresses from the footer.
+
+        Raises:
+            ValueError: If the file does not have a valid block structure
+        """
+        data = self.file_data
+        signature = _SIGNATURE_PATTERN.match(data, len(_FILE_TYPE))
+        if data[: len(_FILE_TYPE)] != _FILE_TYPE or signature is None:
+            raise ValueError("Not a .note file (missing file type or signature)")
+        self.metadata["file_version"] = signature.group(1).decode()
+
+        # A handwriting ZIP archive may follow the footer address
+        zip_start = _find_zip_start(data, len(data))
+        note_end = zip_start if zip_start is not None else len(data)
+        if note_end < signature.end() + 8 or data[note_end - 8 : note_end - 4] != _TAIL_MARKER:
+            raise ValueError("Missing 'tail' marker before the footer address")
+        footer_address = struct.unpack_from("<I", data, note_end - 4)[0]
+        self.footer = self._read_tags(footer_address, note_end)
+
+        if "FILE_FEATURE" not in self.footer:
+            raise ValueError("Footer does not reference the header block")
+        header = bytes(self._read_block(int(self.footer["FILE_FEATURE"]), note_end))
+        self.metadata.update(_parse_header_tags(header))
+
+        if "PDFSTYLELIST" in self.footer:
+            references = _PAGE_REFERENCE_PATTERN.findall(
+                bytes(self._read_block(int(self.footer["PDFSTYLELIST"]), note_end))
+            )
+            if references:
+                self.metadata["page_references"] = [ref.decode() for ref in references]
+
+        png_addresses = set()
+        for number, key in _page_keys(self.footer):
+            page_address = int(self.footer[key])
+            page_metadata = self._read_tags(page_address, note_end)
+            layers = {}
+            for layer_name in _LAYER_NAMES:
+                layer_address = int(page_metadata.get(layer_name, 0) or 0)
+                if not layer_address:
+                    continue
+                layer_metadata = self._read_tags(layer_address, note_end)
+                bitmap_address = int(layer_metadata.get("LAYERBITMAP", 0) or 0)
+                if not bitmap_address:
+                    continue
+                size = self._block_size(bitmap_address, note_end)
+                protocol = layer_metadata.get("LAYERPROTOCOL", "")
+                if self._is_png_block(bitmap_address):
+                    protocol = "PNG"
+                    png_addresses.add(bitmap_address)
+                layers[layer_name] = {
+                    "protocol": protocol,
+                    "address": bitmap_address,
+                    "size": size,
+                }
+            self.pages.append({
+                "number": number,
+                "address": page_address,
+                "metadata": page_metadata,
+                "layers": layers,
+            })
+
+        # Embedded PNGs in file order; pages sharing a background share one PNG
+        self.png_images = [
+            self._read_block(address, note_end) for address in sorted(png_addresses)
+        ]
+        self._zip_start = zip_start
+        self.parsed_structurally = True
+
+    def _block_size(self, address: int, end: int) -> int:
+        """Return the length of the block at address, checking it fits before end."""
+        if address < 0 or address + 4 > end:
+            raise ValueError(f"Block address {address} is outside the file")
+        size = struct.unpack_from("<I", self.file_data, address)[0]
+        if address + 4 + size > end:
+            raise ValueError(f"Block at {address} is truncated")
+        return size
+
+    def _read_block(self, address: int, end: Optional[int] = None) -> Buffer:
+        """Read the content of the length-prefixed block at address."""
+        size = self._block_size(address, len(self.file_data) if end is None else end)
+        return self._slice(address + 4, address + 4 + size)
+
+    def _read_tags(self, address: int, end: int) -> Dict[str, str]:
+        """Read a metadata block as a dictionary of its tags."""
+        content = bytes(self._read_block(address, end)).decode("utf-8", errors="ignore")
+        return dict(_TAG_PATTERN.findall(content))
+
+    def _is_png_block(self, address: int) -> bool:
+        return self.file_data[address + 4 : address + 4 + len(_PNG_SIGNATURE)] == _PNG_SIGNATURE
+
+    def get_page_size(self, page_index: int = 0) -> Tuple[int, int]:
+        """Get the pixel size (width, height) of a page's layers.
+
+        Args:
+            page_index: Index of the page (0-based)
+
+        Returns:
+            Page size in pixels, swapped for horizontal pages
+        """
+        width, height = (
+            _A5X2_PAGE_SIZE
+            if self.metadata.get("apply_equipment") == "N5"
+            else _DEFAULT_PAGE_SIZE
+        )
+        page = self.pages[page_index] if 0 <= page_index < len(self.pages) else None
+        if page and page["metadata"].get("ORIENTATION") == _ORIENTATION_HORIZONTAL:
+            width, height = height, width
+        return width, height
+
+    def get_layer_data(self, page_index: int, layer_name: str = "BGLAYER") -> Optional[Buffer]:
+        """Get the raw content (PNG or RATTA_RLE) of a page layer.
+
+        Requires a structured parse.
+
+        Args:
+            page_index: Index of the page (0-based)
+            layer_name: MAINLAYER, LAYER1-3 or BGLAYER
+
+        Returns:
+            Layer content (a memoryview for lazy parsers), or None if the
+            page or layer does not exist
+        """
+        if not 0 <= page_index < len(self.pages):
+            return None
+        layer = self.pages[page_index]["layers"].get(layer_name)
+        if layer is None:
+            return None
+        return self._read_block(layer["address"])
+
+    def get_layer_image(self, page_index: int, layer_name: str = "BGLAYER") -> Optional[Image.Image]:
+        """Decode a page layer to an image.
+
+        PNG layers are opened as they are; RATTA_RLE layers are decoded to
+        an 8-bit grayscale image (255 is transparent), which requires NumPy.
+
+        Args:
+            page_index: Index of the page (0-based)
+            layer_name: MAINLAYER, LAYER1-3 or BGLAYER
+
+        Returns:
+            Layer image, or None if the page or layer does not exist
+
+        Raises:
+            ValueError: If the layer uses an unsupported protocol or is corrupt
+        """
+        data = self.get_layer_data(page_index, layer_name)
+        if data is None:
+            return None
+        layer = self.pages[page_index]["layers"][layer_name]
+        if layer["protocol"] == "PNG":
+            return Image.open(BytesIO(data))
+        if layer["protocol"] != "RATTA_RLE":
+            raise ValueError(f"Unsupported layer protocol '{layer['protocol']}'")
+
+        # Imported here: the converters package imports this module
+        from obsidian_supernote.converters.ratta_rle import codes_to_gray, decode_rle
+
+        width, height = self.get_page_size(page_index)
+        all_blank = (
+            layer_name == "BGLAYER"
+            and self.pages[page_index]["metadata"].get("PAGESTYLE") == "style_white"
+            and len(data) == _BLANK_STYLE_BLOCK_SIZE
+        )
+        x2 = int(self.metadata.get("file_version", 0)) >= _X2_SIGNATURE_VERSION
+        codes = decode_rle(data, width, height, all_blank=all_blank)
+        return Image.fromarray(codes_to_gray(codes, x2), mode="L")
+
     def _parse_header(self) -> None:
         """Parse the binary header section (Section 1)."""
         # Find the first PNG signature (marks end of header)
@@ -121,7 +534,7 @@ class NoteFileParser:
             png_end += 8
 
             # Extract PNG data
-            png_data = self.file_data[png_start:png_end]
+            png_data = self._slice(png_start, png_end)
             self.png_images.append(png_data)
 
             offset = png_end
@@ -148,49 +561,48 @@ class NoteFileParser:
 
         if zip_start == -1:
             # No ZIP archive found
-            self.zip_data = None
+            self._zip_start = None
             return
 
-        self.zip_data = self.file_data[zip_start:]
+        self._zip_start = zip_start
 
     def _parse_zip_contents(self) -> None:
         """Parse the ZIP archive contents."""
-        if not self.zip_data:
+        try:
+            handwriting = self.get_handwriting()
+        except zipfile.BadZipFile as e:
+            self.zip_contents["error"] = f"Bad ZIP file: {e}"
+            return
+        if handwriting is None:
             return
 
         try:
-            with zipfile.ZipFile(BytesIO(self.zip_data)) as zf:
-                # Get file list
-                file_list = zf.namelist()
-                self.zip_contents["files"] = file_list
-
-                # Parse root-level JSON files
-                if "meta.json" in file_list:
-                    meta_json = json.loads(zf.read("meta.json"))
-                    self.zip_contents["meta"] = meta_json
-
-                if "rel.json" in file_list:
-                    rel_json = json.loads(zf.read("rel.json"))
-                    self.zip_contents["relationships"] = rel_json
-
-                # Parse page metadata
-                pages = {}
-                for filename in file_list:
-                    if filename.startswith("pages/") and filename.endswith("meta.json"):
-                        page_id = filename.split("/")[1]
-                        page_meta = json.loads(zf.read(filename))
-                        pages[page_id] = {
-                            "meta": page_meta,
-                            "has_content": page_meta.get("pageHasContent", False),
-                        }
-
-                        # Check for ink data
-                        ink_file = f"pages/{page_id}/ink.bink"
-                        if ink_file in file_list:
-                            ink_size = zf.getinfo(ink_file).file_size
-                            pages[page_id]["ink_size"] = ink_size
-
-                self.zip_contents["pages"] = pages
+            self.zip_contents["files"] = handwriting.files
+
+            # Parse root-level JSON files
+            meta_json = handwriting.read_json("meta.json")
+            if meta_json is not None:
+                self.zip_contents["meta"] = meta_json
+
+            rel_json = handwriting.read_json("rel.json")
+            if rel_json is not None:
+                self.zip_contents["relationships"] = rel_json
+
+            # Parse page metadata
+            pages = {}
+            for page_id in handwriting.page_ids:
+                page_meta = handwriting.page_meta(page_id)
+                pages[page_id] = {
+                    "meta": page_meta,
+                    "has_content": page_meta.get("pageHasContent", False),
+                }
+
+                # Check for ink data
+                ink_size = handwriting.ink_size(page_id)
+                if ink_size is not None:
+                    pages[page_id]["ink_size"] = ink_size
+
+            self.zip_contents["pages"] = pages
 
         except zipfile.BadZipFile as e:
             self.zip_contents["error"] = f"Bad ZIP file: {e}"
@@ -233,6 +645,9 @@ class NoteFileParser:
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of the .note file structure.
 
+        Only sizes of the embedded images are used, so for lazy parsers the
+        image data is never read.
+
         Returns:
             Dictionary with summary information
         """
@@ -249,8 +664,8 @@ class NoteFileParser:
             "png_images_size_mb": round(
                 sum(len(png) for png in self.png_images) / 1024 / 1024, 2
             ),
-            "zip_archive_size_kb": round(len(self.zip_data) / 1024, 2)
-            if self.zip_data
+            "zip_archive_size_kb": round(self._zip_size() / 1024, 2)
+            if self._zip_start is not None
             else 0,
             "pages_count": len(self.zip_contents.get("pages", {})),
             "has_handwriting": any(
@@ -259,7 +674,7 @@ class NoteFileParser:
             ),
         }
 
-    def get_zip_archive(self) -> Optional[bytes]:
+    def get_zip_archive(self) -> Optional[Buffer]:
         """Get the raw ZIP archive data.
 
         This contains all handwriting layers, annotations, and page metadata
@@ -267,7 +682,8 @@ class NoteFileParser:
         updating the template/background.
 
         Returns:
-            Raw ZIP archive bytes, or None if no handwriting data exists
+            Raw ZIP archive bytes (a memoryview for lazy parsers), or None if
+            no handwriting data exists
         """
         return self.zip_data
 
@@ -283,3 +699,358 @@ def inspect_note_file(note_file: str | Path) -> Dict[str, Any]:
     """
     parser = NoteFileParser(Path(note_file))
     return parser.parse()
+
+
+# Bytes read from the end of the file to find the footer address and a ZIP
+# end record (the record plus the longest possible archive comment)
+_SUMMARY_TAIL_SIZE = _ZIP_EOCD_SIZE + _ZIP_MAX_COMMENT
+
+# Largest metadata block (footer, header, page) read for a summary
+_SUMMARY_MAX_BLOCK = 1024 * 1024
+
+
+def _read_file_block(
+    f: BinaryIO, address: int, end: int, max_size: Optional[int] = _SUMMARY_MAX_BLOCK
+) -> bytes:
+    """Read a length-prefixed block from an open file.
+
+    Args:
+        f: Open .note file
+        address: Address of the block's length field
+        end: End of the note data (start of an appended ZIP archive)
+        max_size: Largest plausible block size (None = no limit)
+
+    Raises:
+        ValueError: If the block is outside the note data or implausibly large
+    """
+    if address <= 0 or address + 4 > end:
+        raise ValueError(f"Block address {address} is outside the file")
+    f.seek(address)
+    size = struct.unpack("<I", f.read(4))[0]
+    if address + 4 + size > end or (max_size is not None and size > max_size):
+        raise ValueError(f"Block at {address} is truncated or not a metadata block")
+    return f.read(size)
+
+
+def _read_file_footer(f: BinaryIO, file_size: int) -> Tuple[re.Match, Dict[str, str], Optional[int]]:
+    """Check the signature of an open .note file and read its footer.
+
+    Returns:
+        Tuple of (signature match, footer tags, start of an appended ZIP
+        archive or None)
+
+    Raises:
+        ValueError: If the file is not a .note file or its footer is invalid
+    """
+    f.seek(0)
+    head = f.read(len(_FILE_TYPE) + 20)
+    signature = _SIGNATURE_PATTERN.match(head, len(_FILE_TYPE))
+    if head[: len(_FILE_TYPE)] != _FILE_TYPE or signature is None:
+        raise ValueError("Not a .note file (missing file type or signature)")
+
+    f.seek(max(0, file_size - _SUMMARY_TAIL_SIZE))
+    zip_start = _find_zip_start(f.read(), file_size)
+    note_end = zip_start if zip_start is not None else file_size
+    if note_end < signature.end() + 8:
+        raise ValueError("Missing 'tail' marker before the footer address")
+    f.seek(note_end - 8)
+    trailer = f.read(8)
+    if trailer[:4] != _TAIL_MARKER:
+        raise ValueError("Missing 'tail' marker before the footer address")
+
+    footer_address = struct.unpack("<I", trailer[4:])[0]
+    footer = _read_file_tags(f, footer_address, note_end)
+    if "FILE_FEATURE" not in footer:
+        raise ValueError("Footer does not reference the header block")
+    return signature, footer, zip_start
+
+
+def read_note_summary(note_file: str | Path) -> Dict[str, Any]:
+    """Summarize a .note file from its metadata blocks only.
+
+    Unlike NoteFileParser.get_summary(), no images are read: the file's
+    signature, the end of the file (footer address, ZIP end record), the
+    footer and header blocks and the small per-page metadata blocks are
+    enough. This keeps summarizing thousands of notes fast.
+
+    Args:
+        note_file: Path to .note file
+
+    Returns:
+        Dictionary with summary information; pages_count is the number of
+        pages in the note
+
+    Raises:
+        ValueError: If the file is not a .note file or its footer is invalid
+    """
+    return read_note_metadata(note_file)["summary"]
+
+
+def page_content_hash(
+    page_metadata: Dict[str, str],
+    layers: Iterable[Tuple[str, str, Buffer]],
+    key: str = "",
+) -> str:
+    """Hash what a page's image is made from.
+
+    The hash covers the page tags that affect rendering and the content of
+    every layer, so it changes when handwriting or the background changes.
+
+    Args:
+        page_metadata: Page tags
+        layers: (layer name, protocol, content) of each layer with content
+        key: Mixed into the hash first (e.g. renderer settings)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256(key.encode())
+    for tag in _RENDERED_PAGE_TAGS:
+        digest.update(f"{tag}={page_metadata.get(tag, '')}\n".encode())
+    for layer_name, protocol, data in sorted(layers, key=lambda layer: layer[0]):
+        digest.update(f"{layer_name}:{protocol}:{len(data)}\n".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def read_note_metadata(note_file: str | Path, content_hashes: bool = False) -> Dict[str, Any]:
+    """Read the summary, header metadata and page metadata of a .note file.
+
+    Reads the same metadata blocks as read_note_summary(), plus every
+    page's layer blocks if content hashes are requested.
+
+    Args:
+        note_file: Path to .note file
+        content_hashes: Also hash the content of every page (see
+                        page_content_hash())
+
+    Returns:
+        Dictionary with "summary" (as read_note_summary()), "metadata"
+        (header tags, as NoteFileParser.metadata without page references)
+        and "pages": number, PAGEID, background style and its MD5, whether
+        the page has strokes and, if requested, its "content_hash", for
+        every page in order
+
+    Raises:
+        ValueError: If the file is not a .note file or its footer is invalid
+    """
+    note_file = Path(note_file)
+    file_size = note_file.stat().st_size
+
+    with note_file.open("rb") as f:
+        signature, footer, zip_start = _read_file_footer(f, file_size)
+        note_end = zip_start if zip_start is not None else file_size
+        metadata = {"file_version": signature.group(1).decode()}
+        metadata.update(_parse_header_tags(
+            _read_file_block(f, int(footer["FILE_FEATURE"]), note_end)
+        ))
+
+        pages = []
+        for number, key in _page_keys(footer):
+            page_metadata = _read_file_tags(f, int(footer[key]), note_end)
+            page = {
+                "number": number,
+                "page_id": page_metadata.get("PAGEID", ""),
+                "style": page_metadata.get("PAGESTYLE", ""),
+                "style_md5": page_metadata.get("PAGESTYLEMD5", ""),
+                # Device notes keep strokes in their layers; pages with
+                # strokes reference their path data
+                "has_handwriting": page_metadata.get("TOTALPATH", "0") not in ("", "0"),
+            }
+            if content_hashes:
+                page["content_hash"] = page_content_hash(
+                    page_metadata, _read_file_layers(f, page_metadata, note_end)
+                )
+            pages.append(page)
+
+        if zip_start is not None:
+            has_handwriting = _zip_has_handwriting(f)
+        else:
+            has_handwriting = any(page["has_handwriting"] for page in pages)
+
+    summary = {
+        "file_name": note_file.name,
+        "file_size_mb": round(file_size / 1024 / 1024, 2),
+        "format_version": metadata.get("file_version", "Unknown"),
+        "file_type": metadata.get("file_type", "Unknown"),
+        "device": metadata.get("apply_equipment", "Unknown"),
+        "language": metadata.get("file_recogn_language", "Unknown"),
+        "pdf_template": metadata.get("pdfstyle", "None"),
+        "pdf_template_md5": metadata.get("pdfstylemd5", "None"),
+        "zip_archive_size_kb": round((file_size - zip_start) / 1024, 2)
+        if zip_start is not None
+        else 0,
+        "pages_count": len(pages),
+        "has_handwriting": has_handwriting,
+    }
+    return {"summary": summary, "metadata": metadata, "pages": pages}
+
+
+def _read_file_layers(
+    f: BinaryIO, page_metadata: Dict[str, str], end: int
+) -> List[Tuple[str, str, bytes]]:
+    """Read (name, protocol, content) of a page's layers with content, as the structured parse."""
+    layers = []
+    for layer_name in _LAYER_NAMES:
+        layer_address = int(page_metadata.get(layer_name, 0) or 0)
+        if not layer_address:
+            continue
+        layer_metadata = _read_file_tags(f, layer_address, end)
+        bitmap_address = int(layer_metadata.get("LAYERBITMAP", 0) or 0)
+        if not bitmap_address:
+            continue
+        data = _read_file_block(f, bitmap_address, end, max_size=None)
+        protocol = "PNG" if data.startswith(_PNG_SIGNATURE) else layer_metadata.get("LAYERPROTOCOL", "")
+        layers.append((layer_name, protocol, data))
+    return layers
+
+
+def read_note_page(note_file: str | Path, page_index: int) -> Dict[str, Any]:
+    """Read one page of a .note file without reading the other pages.
+
+    Follows the footer's page address table to the page, so only the
+    signature, the end of the file, the footer, the header and the page's
+    own metadata and layer blocks are read. Apart from the footer, which
+    holds one address per page, the amount read does not depend on the
+    number of pages.
+
+    Args:
+        note_file: Path to .note file
+        page_index: Index of the page (0-based)
+
+    Returns:
+        Dictionary with "signature" (e.g. SN_FILE_VER_20230015), "header"
+        and "footer" (raw tags), "page_count", and the page's "number",
+        "metadata" (raw page tags) and "layers": the page's layer tags in
+        file order, each with "name" (MAINLAYER, LAYER1-3 or BGLAYER),
+        "metadata" (raw layer tags, empty for unused layers) and "data"
+        (layer content, or None), empty for pages without layers; and
+        "data", the content of the DATA bitmap of a page without layers
+        (None for layered pages)
+
+    Raises:
+        IndexError: If the note has no such page
+        ValueError: If the file is not a .note file or a block is invalid
+    """
+    note_file = Path(note_file)
+    file_size = note_file.stat().st_size
+
+    with note_file.open("rb") as f:
+        signature, footer, zip_start = _read_file_footer(f, file_size)
+        note_end = zip_start if zip_start is not None else file_size
+        page_keys = _page_keys(footer)
+        if not 0 <= page_index < len(page_keys):
+            raise IndexError(f"Page index {page_index} out of range (note has {len(page_keys)} pages)")
+
+        header = _read_file_tags(f, int(footer["FILE_FEATURE"]), note_end)
+        number, key = page_keys[page_index]
+        page_metadata = _read_file_tags(f, int(footer[key]), note_end)
+
+        layers = []
+        for name in page_metadata:
+            if name not in _LAYER_NAMES:
+                continue
+            layer_address = int(page_metadata[name] or 0)
+            layer_metadata = _read_file_tags(f, layer_address, note_end) if layer_address else {}
+            bitmap_address = int(layer_metadata.get("LAYERBITMAP", 0) or 0)
+            layers.append({
+                "name": name,
+                "metadata": layer_metadata,
+                "data": _read_file_block(f, bitmap_address, note_end, max_size=None)
+                if bitmap_address
+                else None,
+            })
+
+        # Pages without layers keep a single bitmap under DATA
+        data_address = int(page_metadata.get("DATA", 0) or 0) if not layers else 0
+        data = _read_file_block(f, data_address, note_end, max_size=None) if data_address else None
+
+    return {
+        "signature": signature.group(0).decode(),
+        "header": header,
+        "footer": footer,
+        "page_count": len(page_keys),
+        "number": number,
+        "metadata": page_metadata,
+        "layers": layers,
+        "data": data,
+    }
+
+
+# Notes summarized per worker task
+_SUMMARY_BATCH_SIZE = 32
+
+
+def iter_note_summaries(
+    note_files: Iterable[str | Path],
+    workers: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """Summarize many .note files, across a process pool if requested.
+
+    Results are yielded as soon as they are ready, so with several workers
+    they don't follow the input order. Only a bounded number of batches is
+    in flight at once.
+
+    Args:
+        note_files: Paths to .note files
+        workers: Number of worker processes (0 = all CPU cores, 1 = this process)
+
+    Yields:
+        Dictionaries with "path", "summary" (as read_note_summary(), or
+        None) and "error" (message if the file could not be read, or None)
+    """
+    paths = [str(path) for path in note_files]
+    workers = min(workers or cpu_count() or 1, len(paths))
+    if workers <= 1:
+        yield from _summarize_batch(paths)
+        return
+
+    # Small inputs are split finer so that every worker gets some
+    batch_size = max(1, min(_SUMMARY_BATCH_SIZE, math.ceil(len(paths) / (4 * workers))))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        for start in range(0, len(paths), batch_size):
+            pending.add(pool.submit(_summarize_batch, paths[start : start + batch_size]))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _summarize_batch(paths: List[str]) -> List[Dict[str, Any]]:
+    """Summarize a batch of notes (runs in worker processes)."""
+    results = []
+    for path in paths:
+        try:
+            results.append({"path": path, "summary": read_note_summary(path), "error": None})
+        except (OSError, ValueError) as e:
+            results.append({"path": path, "summary": None, "error": str(e)})
+    return results
+
+
+def _read_file_tags(f: BinaryIO, address: int, end: int) -> Dict[str, str]:
+    """Read a metadata block from an open file as a dictionary of its tags."""
+    return dict(_TAG_PATTERN.findall(
+        _read_file_block(f, address, end).decode("utf-8", errors="ignore")
+    ))
+
+
+def _zip_has_handwriting(f: BinaryIO) -> bool:
+    """Check the page metadata of an appended handwriting ZIP for content.
+
+    zipfile only reads the central directory and the small page meta.json
+    files; ink data is not touched.
+    """
+    try:
+        with zipfile.ZipFile(f) as zf:
+            for filename in zf.namelist():
+                if filename.startswith("pages/") and filename.endswith("meta.json"):
+                    if json.loads(zf.read(filename)).get("pageHasContent", False):
+                        return True
+    except (zipfile.BadZipFile, ValueError):
+        pass
+    return False
@@ -6,6 +6,7 @@ This module provides common utilities:
 - Configuration loading
 - Logging setup
 - Frontmatter parsing for Obsidian markdown files
+- Page range selection
 """
 
 from obsidian_supernote.utils.frontmatter import (
@@ -16,6 +17,7 @@ from obsidian_supernote.utils.frontmatter import (
     format_note_file_reference,
     update_frontmatter_file_reference,
 )
+from obsidian_supernote.utils.page_ranges import parse_page_ranges
 
 __all__ = [
     "FrontmatterProperties",
@@ -24,4 +26,5 @@ __all__ = [
     "read_markdown_with_frontmatter",
     "format_note_file_reference",
     "update_frontmatter_file_reference",
+    "parse_page_ranges",
 ]
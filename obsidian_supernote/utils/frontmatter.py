@@ -290,5 +290,6 @@ def update_frontmatter_file_reference(
     # Rebuild markdown with updated frontmatter
     new_content = f"---\n{yaml_content}---\n\n{content}"
 
-    # Write back to file
-    markdown_path.write_text(new_content, encoding="utf-8")
+    # Write back to file (unless nothing changed, to avoid waking file watchers)
+    if new_content != markdown_content:
+        markdown_path.write_text(new_content, encoding="utf-8")
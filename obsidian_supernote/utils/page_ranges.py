@@ -0,0 +1,44 @@
+"""Page range selection for multi-page conversions.
+
+Page ranges use the familiar print-dialog syntax with 1-based page numbers:
+"1-20,45" selects pages 1 to 20 and page 45, "40-" selects page 40 to the
+end and "-5" the first five pages.
+"""
+
+from typing import List
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """Parse a page range specification.
+
+    Args:
+        spec: Comma-separated pages and ranges, e.g. "1-20,45" or "40-"
+        page_count: Number of pages in the document
+
+    Returns:
+        Selected pages as 0-based indices, in document order without duplicates
+
+    Raises:
+        ValueError: If the specification is malformed, a range is reversed, or
+                    a page does not exist
+    """
+    selected = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            raise ValueError(f"Empty page range in '{spec}'")
+
+        start_text, dash, end_text = part.partition("-")
+        try:
+            start = int(start_text) if start_text.strip() else 1
+            end = (int(end_text) if end_text.strip() else page_count) if dash else start
+        except ValueError:
+            raise ValueError(f"Invalid page range '{part}' (expected e.g. 1-20,45)") from None
+
+        if start < 1 or end > page_count:
+            raise ValueError(f"Page range '{part}' is outside pages 1-{page_count}")
+        if start > end:
+            raise ValueError(f"Page range '{part}' is reversed")
+        selected.update(range(start - 1, end))
+
+    return sorted(selected)
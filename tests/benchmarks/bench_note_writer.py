@@ -0,0 +1,395 @@
+"""Benchmark NoteFileWriter on synthetic PDF corpora.
+
+Generates PDFs with PyMuPDF (no network or external files needed) in three
+flavors - text-heavy, image-heavy and vector-heavy - at several page counts,
+converts each one for every device in NoteFileWriter.DEVICE_SPECS and
+records per-stage wall time (render, resize, encode, hash, write), peak RSS
+and output size as JSON.
+
+Each conversion runs in a fresh process, so peak RSS belongs to that run
+alone. Stage times come from wrapping the functions that implement each
+stage; when stages nest (e.g. a render helper calling get_pixmap) only the
+outermost one is counted, so the stages add up to at most the total time.
+
+Usage:
+    python tests/benchmarks/bench_note_writer.py --output bench.json
+    python tests/benchmarks/bench_note_writer.py --pages 1,10 --kinds text --devices A5X2
+    python tests/benchmarks/bench_note_writer.py --compare baseline.json --output bench.json
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from io import BytesIO
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Allow running from a source checkout without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import fitz  # PyMuPDF
+import PIL
+from PIL import Image
+
+from obsidian_supernote.converters import note_layout, note_writer
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+KINDS = ("text", "image", "vector")
+PAGE_COUNTS = (1, 10, 100, 500)
+STAGES = ("render", "resize", "encode", "hash", "write")
+
+# Bump when the corpus generators change, so cached corpora are rebuilt
+CORPUS_VERSION = 1
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent / ".corpus"
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpora
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "note supernote obsidian sync page layer template handwriting export vault "
+    "markdown render device stroke recognition library reference chapter figure"
+).split()
+
+
+def _text_page(page: fitz.Page, rng: random.Random, number: int) -> None:
+    """Fill a page with dense body text in several font sizes."""
+    page.insert_text((50, 60), f"Chapter {number}", fontsize=20)
+    y = 90
+    while y < page.rect.height - 40:
+        line = " ".join(rng.choice(_WORDS) for _ in range(12))
+        page.insert_text((50, y), line, fontsize=rng.choice((8, 9, 10)))
+        y += 13
+
+
+def _image_page(page: fitz.Page, rng: random.Random, number: int) -> None:
+    """Place a few photo-like raster images (noise over gradients) on a page."""
+    for index in range(3):
+        size = (600, 400)
+        gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+        noise = Image.effect_noise(size, 40 + 10 * index).convert("RGB")
+        img = Image.blend(gradient, noise, 0.5)
+        data = BytesIO()
+        img.save(data, format="JPEG", quality=85)
+        top = 40 + index * 180
+        page.insert_image(fitz.Rect(40, top, 380, top + 160), stream=data.getvalue())
+    page.insert_text((40, 30), f"Figure page {number}", fontsize=12)
+
+
+def _vector_page(page: fitz.Page, rng: random.Random, number: int) -> None:
+    """Draw many curves, polygons and filled shapes on a page."""
+    width, height = page.rect.width, page.rect.height
+    shape = page.new_shape()
+    for _ in range(400):
+        points = [fitz.Point(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(4)]
+        shape.draw_bezier(*points)
+        shape.finish(color=(rng.random(), rng.random(), rng.random()), width=rng.uniform(0.3, 2))
+    for _ in range(80):
+        x, y = rng.uniform(0, width - 60), rng.uniform(0, height - 60)
+        shape.draw_rect(fitz.Rect(x, y, x + rng.uniform(5, 60), y + rng.uniform(5, 60)))
+        shape.finish(color=(0, 0, 0), fill=(rng.random(), rng.random(), rng.random()))
+    shape.commit()
+    page.insert_text((40, 30), f"Diagram page {number}", fontsize=12)
+
+
+_PAGE_GENERATORS: Dict[str, Callable[[fitz.Page, random.Random, int], None]] = {
+    "text": _text_page,
+    "image": _image_page,
+    "vector": _vector_page,
+}
+
+
+def make_corpus_pdf(corpus_dir: Path, kind: str, page_count: int) -> Path:
+    """Generate (or reuse) a synthetic A5 PDF.
+
+    Args:
+        corpus_dir: Directory holding generated PDFs
+        kind: One of KINDS
+        page_count: Number of pages
+
+    Returns:
+        Path to the PDF
+    """
+    path = corpus_dir / f"{kind}_{page_count}_v{CORPUS_VERSION}.pdf"
+    if path.exists():
+        return path
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(f"{kind}-{page_count}")
+    doc = fitz.open()
+    for number in range(1, page_count + 1):
+        _PAGE_GENERATORS[kind](doc.new_page(width=420, height=595), rng, number)
+    temp_path = path.with_suffix(".tmp")
+    doc.save(temp_path, garbage=3, deflate=True)
+    doc.close()
+    temp_path.replace(path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Stage timing
+# ---------------------------------------------------------------------------
+
+
+class StageTimer:
+    """Accumulate wall time per stage, counting only the outermost active stage."""
+
+    def __init__(self) -> None:
+        self.totals = {stage: 0.0 for stage in STAGES}
+        self._active = False
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            if self._active:
+                return func(*args, **kwargs)
+            self._active = True
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+                self._active = False
+
+        return timed
+
+
+class _TimedHashlib:
+    """Stand-in for the hashlib module that times MD5 hashing."""
+
+    def __init__(self, timer: StageTimer) -> None:
+        self.md5 = timer.wrap("hash", hashlib.md5)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(hashlib, name)
+
+
+@contextmanager
+def _patched(owner: Any, name: str, replacement: Any) -> Iterator[None]:
+    original = getattr(owner, name)
+    setattr(owner, name, replacement)
+    try:
+        yield
+    finally:
+        setattr(owner, name, original)
+
+
+@contextmanager
+def instrument(timer: StageTimer) -> Iterator[None]:
+    """Time the writer's stages for the duration of the block."""
+    targets = [
+        ("render", fitz.Page, "get_pixmap"),
+        ("render", note_writer, "_render_page_fitted"),
+        ("resize", Image.Image, "resize"),
+        ("encode", note_writer, "_encode_page_image"),
+        ("encode", fitz.Pixmap, "tobytes"),
+        ("write", note_layout.NoteLayout, "flush"),
+        ("write", note_layout.NoteLayout, "matches_file"),
+    ]
+    with ExitStack() as stack:
+        for stage, owner, name in targets:
+            stack.enter_context(_patched(owner, name, timer.wrap(stage, getattr(owner, name))))
+        stack.enter_context(_patched(note_writer, "hashlib", _TimedHashlib(timer)))
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(pdf_path: str, output_path: str, device: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one PDF and measure it (runs in a fresh worker process).
+
+    Args:
+        pdf_path: Path to the corpus PDF
+        output_path: Path of the .note file to write
+        device: Key of NoteFileWriter.DEVICE_SPECS
+        options: NoteFileWriter keyword arguments plus "dpi"
+
+    Returns:
+        Measurements of the run
+    """
+    options = dict(options)
+    dpi = options.pop("dpi", None)
+    timer = StageTimer()
+    writer = NoteFileWriter(device=device, **options)
+
+    with instrument(timer):
+        start = time.perf_counter()
+        writer.convert_pdf_to_note(Path(pdf_path), Path(output_path), dpi=dpi)
+        wall = time.perf_counter() - start
+
+    stages = {stage: round(seconds, 4) for stage, seconds in timer.totals.items()}
+    stages["other"] = round(max(wall - sum(timer.totals.values()), 0.0), 4)
+    return {
+        "wall_s": round(wall, 4),
+        "stages_s": stages,
+        "peak_rss_mb": _peak_rss_mb(),
+        "output_bytes": Path(output_path).stat().st_size,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(
+    kinds: List[str],
+    page_counts: List[int],
+    devices: List[str],
+    options: Dict[str, Any],
+    corpus_dir: Path,
+    work_dir: Path,
+) -> Dict[str, Any]:
+    """Run every (kind, page count, device) combination.
+
+    Returns:
+        Benchmark report with environment metadata and one entry per run
+    """
+    runs = []
+    spawn = get_context("spawn")
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    for kind in kinds:
+        for page_count in page_counts:
+            pdf_path = make_corpus_pdf(corpus_dir, kind, page_count)
+            for device in devices:
+                output_path = work_dir / f"{kind}_{page_count}_{device}.note"
+                # A fresh process per run keeps peak RSS per run
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    result = pool.submit(
+                        run_case, str(pdf_path), str(output_path), device, options
+                    ).result()
+                output_path.unlink(missing_ok=True)
+
+                run = {"kind": kind, "pages": page_count, "device": device, **result}
+                runs.append(run)
+                print(
+                    f"{kind:>6} {page_count:>4}p {device:>6}: {result['wall_s']:8.2f}s "
+                    f"rss {result['peak_rss_mb']} MB, {result['output_bytes'] / 1e6:.2f} MB",
+                    flush=True,
+                )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "pillow": PIL.__version__,
+            "corpus_version": CORPUS_VERSION,
+            "options": options,
+        },
+        "runs": runs,
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Describe the wall time change of every run present in both reports."""
+    def key(run: Dict[str, Any]) -> tuple:
+        return run["kind"], run["pages"], run["device"]
+
+    previous = {key(run): run for run in baseline["runs"]}
+    lines = []
+    for run in current["runs"]:
+        before = previous.get(key(run))
+        if before is None or not before["wall_s"]:
+            continue
+        change = (run["wall_s"] - before["wall_s"]) / before["wall_s"] * 100
+        lines.append(
+            f"{run['kind']:>6} {run['pages']:>4}p {run['device']:>6}: "
+            f"{before['wall_s']:8.2f}s -> {run['wall_s']:8.2f}s ({change:+.1f}%)"
+        )
+    return lines
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--kinds", type=_csv, default=list(KINDS), help="Corpus kinds (text,image,vector)")
+    parser.add_argument(
+        "--pages", type=lambda v: [int(n) for n in _csv(v)], default=list(PAGE_COUNTS),
+        help="Page counts (default: 1,10,100,500)",
+    )
+    parser.add_argument(
+        "--devices", type=_csv, default=list(NoteFileWriter.DEVICE_SPECS),
+        help="Devices (default: every device in DEVICE_SPECS)",
+    )
+    parser.add_argument("--dpi", type=int, default=None, help="Render DPI (default: device native)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--render-mode", choices=NoteFileWriter.RENDER_MODES, default="resample")
+    parser.add_argument("--color-mode", choices=NoteFileWriter.COLOR_MODES, default="rgba")
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_CORPUS_DIR / "out")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON report to compare with")
+    args = parser.parse_args(argv)
+
+    for kind in args.kinds:
+        if kind not in KINDS:
+            parser.error(f"unknown kind '{kind}' (expected one of {', '.join(KINDS)})")
+    for device in args.devices:
+        if device not in NoteFileWriter.DEVICE_SPECS:
+            parser.error(f"unknown device '{device}'")
+
+    options = {
+        "dpi": args.dpi,
+        "workers": args.workers,
+        "render_mode": args.render_mode,
+        "color_mode": args.color_mode,
+        "streaming": args.streaming,
+    }
+    report = run_benchmarks(
+        args.kinds, args.pages, args.devices, options, args.corpus_dir, args.work_dir
+    )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report written to {args.output}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit')}):")
+        for line in compare_reports(baseline, report):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Tests for the lazy handwriting archive index."""
+
+import json
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.parsers.handwriting import HandwritingIndex
+from obsidian_supernote.parsers.note_parser import NoteFileParser
+
+
+def _make_archive() -> bytes:
+    """Create a handwriting archive with one written and one empty page."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("meta.json", json.dumps({"Application": "test"}))
+        archive.writestr("pages/p1/meta.json", json.dumps({"pageHasContent": True}))
+        archive.writestr("pages/p1/ink.bink", bytes(range(256)) * 100)
+        archive.writestr("pages/p2/meta.json", json.dumps({"pageHasContent": False}))
+    return buffer.getvalue()
+
+
+def test_index_reads_page_metadata_on_demand(tmp_path: Path) -> None:
+    """Test page listing, lazy metadata and streaming one page's ink."""
+    with HandwritingIndex(memoryview(_make_archive())) as handwriting:
+        assert handwriting.page_ids == ["p1", "p2"]
+        assert handwriting.page_count == 2
+        assert handwriting.ink_size("p1") == 25600
+        assert handwriting.ink_size("p2") is None
+        assert handwriting._page_meta == {}
+
+        assert handwriting.has_content("p1")
+        assert not handwriting.has_content("p2")
+        assert handwriting.read_json("meta.json") == {"Application": "test"}
+        assert handwriting.read_json("rel.json") is None
+
+        output = handwriting.extract_ink("p1", tmp_path / "p1.bink")
+        assert output.read_bytes() == bytes(range(256)) * 100
+        with pytest.raises(KeyError):
+            handwriting.page_meta("p3")
+
+
+def test_index_rejects_corrupt_archive() -> None:
+    """Test that data without a ZIP directory is rejected."""
+    with pytest.raises(zipfile.BadZipFile):
+        HandwritingIndex(b"PK\x03\x04 not really")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_parser_opens_archive_in_place(tmp_path: Path, lazy: bool) -> None:
+    """Test that parsing without handwriting metadata leaves the archive unread."""
+    note = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X")
+    image = BytesIO()
+    Image.new("RGB", (writer.template_width, writer.template_height), "white").save(image, "PNG")
+    png = image.getvalue()
+    writer._write_note_file(note, [png], "sample", "0" * 32, 1, ["0" * 32], zip_archive=_make_archive())
+
+    with NoteFileParser(note, lazy=lazy) as parser:
+        data = parser.parse(read_handwriting=False)
+        assert data["zip_size"] == len(_make_archive())
+        assert parser.zip_contents == {}
+        assert parser._zip_bytes is None
+
+        handwriting = parser.get_handwriting()
+        assert handwriting.page_count == 2
+        assert handwriting.has_content("p1")
+        assert bytes(parser.get_zip_archive()) == _make_archive()
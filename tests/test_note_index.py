@@ -0,0 +1,107 @@
+"""Tests for the persistent .note metadata index."""
+
+import os
+import shutil
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytest
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.parsers.note_index import NoteIndex
+from obsidian_supernote.parsers.note_parser import read_note_summary
+
+
+@pytest.fixture(scope="module")
+def sample_note(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a two-page .note file."""
+    directory = tmp_path_factory.mktemp("source")
+    pdf_path = directory / "sample.pdf"
+    doc = fitz.open()
+    for i in range(2):
+        doc.new_page(width=420, height=595).insert_text((72, 72), f"Page {i + 1}")
+    doc.save(pdf_path)
+    doc.close()
+
+    note_path = directory / "sample.note"
+    NoteFileWriter(device="A6X").convert_pdf_to_note(pdf_path, note_path, dpi=72)
+    return note_path
+
+
+@pytest.fixture
+def vault(tmp_path: Path, sample_note: Path) -> Path:
+    """Create a directory with two notes and an unreadable one."""
+    (tmp_path / "sub").mkdir()
+    shutil.copyfile(sample_note, tmp_path / "a.note")
+    shutil.copyfile(sample_note, tmp_path / "sub" / "b.note")
+    (tmp_path / "broken.note").write_bytes(b"not a note")
+    return tmp_path
+
+
+def test_refresh_reads_only_changed_notes(vault: Path, tmp_path: Path) -> None:
+    """Test that refreshing re-reads new and changed notes only."""
+    with NoteIndex(tmp_path / "index.sqlite") as index:
+        assert index.refresh(vault) == {"indexed": 2, "unchanged": 0, "removed": 0, "failed": 1}
+        assert index.refresh(vault) == {"indexed": 0, "unchanged": 3, "removed": 0, "failed": 0}
+
+        note = vault / "a.note"
+        stat = note.stat()
+        os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (vault / "sub" / "b.note").unlink()
+        assert index.refresh(vault) == {"indexed": 1, "unchanged": 1, "removed": 1, "failed": 0}
+
+
+def test_records_survive_reopening(vault: Path, tmp_path: Path) -> None:
+    """Test that stored records match the notes and persist in the database."""
+    db_path = tmp_path / "index.sqlite"
+    with NoteIndex(db_path) as index:
+        index.refresh(vault)
+
+    with NoteIndex(db_path) as index:
+        records = {Path(record["path"]).name: record for record in index.records(vault)}
+        assert set(records) == {"a.note", "b.note", "broken.note"}
+        assert "signature" in records["broken.note"]["error"]
+
+        record = records["a.note"]
+        assert record["error"] is None
+        assert record["summary"] == read_note_summary(vault / "a.note")
+        assert record["metadata"]["apply_equipment"] == "A6X"
+        assert [page["number"] for page in record["pages"]] == [1, 2]
+        assert len({page["style_md5"] for page in record["pages"]}) == 2
+        assert index.records(vault / "sub")[0]["path"].endswith("b.note")
+
+
+def test_get_uses_stored_record_until_file_changes(vault: Path) -> None:
+    """Test that get() only reads a note when its size or mtime changed."""
+    note = vault / "a.note"
+    with NoteIndex() as index:
+        first = index.get(note)
+        assert index.get(note) == first
+        assert index.stats()["hits"] == 1
+
+        note.write_bytes(note.read_bytes()[:-8])
+        assert index.get(note)["error"] is not None
+        assert index.stats()["misses"] == 2
+
+
+def test_pages_store_content_hashes(vault: Path) -> None:
+    """Test that page records carry the hash of the page's layer contents."""
+    from obsidian_supernote.parsers.note_parser import NoteFileParser, page_content_hash
+
+    with NoteIndex() as index:
+        pages = index.get(vault / "a.note")["pages"]
+
+    with NoteFileParser(vault / "a.note", mode="structured") as parser:
+        parser.parse(read_handwriting=False)
+        expected = [
+            page_content_hash(
+                page["metadata"],
+                [
+                    (name, layer["protocol"], parser.get_layer_data(i, name))
+                    for name, layer in page["layers"].items()
+                ],
+            )
+            for i, page in enumerate(parser.pages)
+        ]
+    assert [page["content_hash"] for page in pages] == expected
+    assert len(set(expected)) == 2
@@ -0,0 +1,91 @@
+"""Tests for the .note block layout engine."""
+
+import os
+import struct
+from pathlib import Path
+
+import pytest
+
+from obsidian_supernote.converters import note_layout
+from obsidian_supernote.converters.note_layout import NoteLayout
+
+
+def _sample_layout() -> NoteLayout:
+    layout = NoteLayout()
+    layout.add_raw(b"note")
+    first = layout.add_block("<TAG:é>")
+    second = layout.add_block(b"\x00" * 100)
+    footer = layout.add_block(f"<FIRST:{first}><SECOND:{second}>")
+    layout.add_raw(b"tail")
+    layout.add_address(footer)
+    return layout
+
+
+def test_addresses_follow_length_prefixed_blocks() -> None:
+    """Test that blocks get the addresses of their length fields."""
+    layout = NoteLayout()
+    assert layout.add_raw(b"note") == 0
+    assert layout.add_block("<TAG:é>") == 4
+    # 4-byte length + 8 UTF-8 bytes
+    assert layout.add_block(b"data") == 16
+    assert layout.size == 24
+
+    data = layout.to_bytes()
+    assert struct.unpack_from("<I", data, 4)[0] == len("<TAG:é>".encode("utf-8"))
+    assert data[20:24] == b"data"
+
+
+def test_write_matches_to_bytes(tmp_path: Path) -> None:
+    """Test that the vectored write produces the planned bytes."""
+    expected = _sample_layout().to_bytes()
+    output = tmp_path / "layout.note"
+    _sample_layout().write(output)
+    assert output.read_bytes() == expected
+
+
+def test_write_resumes_after_short_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that partial writev results are continued where they stopped."""
+    if not hasattr(os, "writev"):
+        pytest.skip("os.writev not available")
+    real_writev = os.writev
+
+    def short_writev(fd, buffers):
+        return real_writev(fd, [bytes(buffers[0])[:3]])
+
+    monkeypatch.setattr(note_layout.os, "writev", short_writev)
+    expected = _sample_layout().to_bytes()
+    output = tmp_path / "short.note"
+    _sample_layout().write(output)
+    assert output.read_bytes() == expected
+
+
+def test_write_without_writev(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the coalescing fallback used where os.writev is missing."""
+    monkeypatch.delattr(note_layout.os, "writev", raising=False)
+    monkeypatch.setattr(note_layout, "_COALESCE_LIMIT", 16)
+    expected = _sample_layout().to_bytes()
+    output = tmp_path / "fallback.note"
+    _sample_layout().write(output)
+    assert output.read_bytes() == expected
+
+
+def test_flush_keeps_counting_addresses(tmp_path: Path) -> None:
+    """Test that addresses continue across flushes."""
+    output = tmp_path / "flushed.note"
+    layout = NoteLayout()
+    with open(output, "wb", buffering=0) as f:
+        layout.add_raw(b"note")
+        layout.flush(f)
+        assert layout.add_block(b"abc") == 4
+        layout.flush(f)
+    assert output.read_bytes() == b"note" + struct.pack("<I", 3) + b"abc"
+
+
+def test_unique_blocks_are_stored_once() -> None:
+    """Test that blocks with the same key share one address."""
+    layout = NoteLayout(start=100)
+    layout.register_unique_block("old", 40)
+    first = layout.add_unique_block(b"page", "abc")
+    assert layout.add_unique_block(b"page", "abc") == first == 100
+    assert layout.add_unique_block(b"other", "old") == 40
+    assert layout.size == 108
@@ -1,8 +1,19 @@
 """Tests for Supernote .note file parser."""
 
+import hashlib
+import json
+import zipfile
+from io import BytesIO
+
 import pytest
 from pathlib import Path
-from obsidian_supernote.parsers.note_parser import NoteFileParser
+from obsidian_supernote.converters.ratta_rle import NUMPY_AVAILABLE
+from obsidian_supernote.parsers.note_parser import (
+    NoteFileParser,
+    iter_note_summaries,
+    read_note_page,
+    read_note_summary,
+)
 
 
 def test_parser_requires_valid_file() -> None:
@@ -82,3 +93,237 @@ def test_extract_png_images() -> None:
         assert img is not None
         assert img.width > 0
         assert img.height > 0
+
+
+def _write_sample_note(path: Path, page_count: int = 3, zip_archive: bytes | None = None) -> Path:
+    """Write a .note file from a small generated PDF with the note writer."""
+    import fitz  # PyMuPDF
+
+    from obsidian_supernote.converters.note_writer import NoteFileWriter
+
+    pdf_path = path.with_suffix(".pdf")
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page(width=420, height=595)
+        page.insert_text((72, 72), f"Page {i + 1}", fontsize=24)
+    doc.save(pdf_path)
+    doc.close()
+
+    writer = NoteFileWriter(device="A6X")
+    png_pages = writer._convert_pdf_to_pngs(pdf_path, dpi=72)
+    md5s = [hashlib.md5(png).hexdigest() for png in png_pages]
+    writer._write_note_file(
+        path, png_pages, "sample", md5s[-1], pdf_path.stat().st_size, md5s,
+        zip_archive=zip_archive,
+    )
+    return path
+
+
+def _make_zip(has_content: bool = False) -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("pages/p1/meta.json", json.dumps({"pageHasContent": has_content}))
+        archive.writestr("pages/p1/ink.bink", b"\x00" * 64)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("with_zip", [False, True])
+def test_structured_parse_matches_scan(tmp_path: Path, with_zip: bool) -> None:
+    """Test that both parsing modes find the same metadata, images and handwriting."""
+    note = _write_sample_note(tmp_path / "sample.note", zip_archive=_make_zip() if with_zip else None)
+
+    scan = NoteFileParser(note, mode="scan")
+    scan.parse()
+    structured = NoteFileParser(note, mode="structured")
+    structured.parse()
+
+    assert structured.parsed_structurally
+    assert structured.metadata == scan.metadata
+    assert structured.png_images == scan.png_images
+    assert structured.zip_data == scan.zip_data
+    assert (structured.zip_data is not None) == with_zip
+    assert [page["number"] for page in structured.pages] == [1, 2, 3]
+    assert structured.pages[0]["layers"]["BGLAYER"]["protocol"] == "PNG"
+
+
+def test_structured_parse_ignores_signatures_inside_blocks(tmp_path: Path) -> None:
+    """Test that PNG and ZIP signatures in layer data don't split the file."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=1)
+    data = bytearray(note.read_bytes())
+    # Overwrite the tail of the PNG background with fake signatures
+    parser = NoteFileParser(note, mode="structured")
+    parser.parse()
+    layer = parser.pages[0]["layers"]["BGLAYER"]
+    end = layer["address"] + 4 + layer["size"]
+    fake = b"\x89PNG\r\n\x1a\nPK\x03\x04"
+    data[end - 40 : end - 40 + len(fake)] = fake
+    note.write_bytes(bytes(data))
+
+    parser = NoteFileParser(note, mode="structured")
+    parser.parse()
+    assert len(parser.png_images) == 1
+    assert parser.zip_data is None
+
+
+def test_auto_mode_falls_back_to_scanning(tmp_path: Path) -> None:
+    """Test that a file without a valid footer is still parsed by scanning."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=2)
+    note.write_bytes(note.read_bytes()[:-4] + b"\xff\xff\xff\x7f")
+
+    with pytest.raises(ValueError):
+        NoteFileParser(note, mode="structured").parse()
+
+    parser = NoteFileParser(note)
+    parser.parse()
+    assert not parser.parsed_structurally
+    assert len(parser.png_images) == 2
+
+
+def test_parser_rejects_unknown_mode() -> None:
+    """Test that an unknown parsing mode is rejected."""
+    with pytest.raises(ValueError, match="parse mode"):
+        NoteFileParser(Path("sample.note"), mode="fast")
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+def test_layer_images_decode_png_and_rle(tmp_path: Path) -> None:
+    """Test decoding a PNG background and a RATTA_RLE main layer."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=1)
+    parser = NoteFileParser(note)
+    parser.parse()
+
+    background = parser.get_layer_image(0, "BGLAYER")
+    assert background.size == (1404, 1872)
+
+    main = parser.get_layer_image(0, "MAINLAYER")
+    assert main.mode == "L"
+    assert main.size == (1404, 1872)
+    assert main.getextrema() == (255, 255)  # blank layer is all transparent
+
+    assert parser.get_layer_image(0, "LAYER3") is None
+    assert parser.get_layer_data(5) is None
+
+
+@pytest.mark.parametrize("mode", ["structured", "scan"])
+def test_lazy_parser_matches_eager_parser(tmp_path: Path, mode: str) -> None:
+    """Test that a memory-mapped parser returns the same content without copying it."""
+    note = _write_sample_note(tmp_path / "sample.note", zip_archive=_make_zip())
+    eager = NoteFileParser(note, mode=mode)
+    eager.parse()
+
+    with NoteFileParser(note, mode=mode, lazy=True) as lazy:
+        data = lazy.parse()
+        assert lazy.metadata == eager.metadata
+        assert all(isinstance(png, memoryview) for png in lazy.png_images)
+        assert [bytes(png) for png in lazy.png_images] == eager.png_images
+        assert bytes(lazy.get_zip_archive()) == eager.get_zip_archive()
+        assert data["zip_contents"] == eager.zip_contents
+        assert lazy.get_summary() == eager.get_summary()
+        assert lazy.get_png_image(0).size == eager.get_png_image(0).size
+        # A slice still in use doesn't prevent closing the parser
+        layer = lazy.get_layer_data(0) if mode == "structured" else lazy.png_images[0]
+
+    assert bytes(layer)[:8] == b"\x89PNG\r\n\x1a\n"
+
+
+def test_lazy_parser_handles_empty_file(tmp_path: Path) -> None:
+    """Test that an empty file is parsed without mapping it."""
+    note = tmp_path / "empty.note"
+    note.write_bytes(b"")
+
+    with NoteFileParser(note, lazy=True) as parser:
+        with pytest.raises(ValueError, match="header boundary"):
+            parser.parse()
+
+
+@pytest.mark.parametrize("has_content", [False, True])
+def test_fast_summary_matches_full_summary(tmp_path: Path, has_content: bool) -> None:
+    """Test that the metadata-only summary agrees with a full parse."""
+    note = _write_sample_note(tmp_path / "sample.note", zip_archive=_make_zip(has_content))
+    parser = NoteFileParser(note)
+    parser.parse()
+    full = parser.get_summary()
+
+    summary = read_note_summary(note)
+    assert summary["pages_count"] == 3
+    assert summary["has_handwriting"] is has_content
+    for key, value in summary.items():
+        if key != "pages_count":
+            assert full[key] == value, key
+
+
+def test_fast_summary_detects_device_handwriting(tmp_path: Path) -> None:
+    """Test handwriting detection from page metadata of notes without a ZIP."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=2)
+    assert read_note_summary(note)["has_handwriting"] is False
+
+    data = note.read_bytes()
+    # Same length, so every block address stays valid
+    note.write_bytes(data.replace(b"<TOTALPATH:0>", b"<TOTALPATH:9>", 1))
+    assert read_note_summary(note)["has_handwriting"] is True
+
+
+def test_fast_summary_rejects_invalid_files(tmp_path: Path) -> None:
+    """Test that non-.note files and broken footers are reported."""
+    other = tmp_path / "other.note"
+    other.write_bytes(b"%PDF-1.7")
+    with pytest.raises(ValueError, match="Not a .note file"):
+        read_note_summary(other)
+
+    note = _write_sample_note(tmp_path / "sample.note", page_count=1)
+    note.write_bytes(note.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="tail"):
+        read_note_summary(note)
+
+
+def test_parallel_summaries_match_serial(tmp_path: Path) -> None:
+    """Test that summarizing across processes gives the same results."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=1)
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"copy{i}.note"
+        path.write_bytes(note.read_bytes())
+        paths.append(path)
+    (tmp_path / "broken.note").write_bytes(b"broken")
+    paths.append(tmp_path / "broken.note")
+
+    serial = list(iter_note_summaries(paths, workers=1))
+    parallel = list(iter_note_summaries(paths, workers=2))
+
+    assert [result["path"] for result in serial] == [str(path) for path in paths]
+    assert sorted(parallel, key=lambda result: result["path"]) == sorted(
+        serial, key=lambda result: result["path"]
+    )
+    assert serial[-1]["summary"] is None and "signature" in serial[-1]["error"]
+
+
+def test_read_page_matches_structured_parse(tmp_path: Path) -> None:
+    """Test that one page is read through the address table, ignoring the others."""
+    note = _write_sample_note(tmp_path / "sample.note", page_count=3)
+    with NoteFileParser(note, mode="structured") as parser:
+        parser.parse(read_handwriting=False)
+        expected = parser.pages[2]
+        layer_data = {name: bytes(parser.get_layer_data(2, name)) for name in expected["layers"]}
+        first_page_address = parser.pages[0]["address"]
+
+    # Break the first page's block; reading the last page must not notice
+    data = bytearray(note.read_bytes())
+    data[first_page_address : first_page_address + 4] = b"\xff\xff\xff\xff"
+    note.write_bytes(bytes(data))
+
+    page = read_note_page(note, 2)
+    assert page["signature"] == "SN_FILE_VER_20230015"
+    assert page["page_count"] == 3
+    assert page["number"] == expected["number"]
+    assert page["metadata"] == expected["metadata"]
+    assert [layer["name"] for layer in page["layers"]] == [
+        "MAINLAYER", "LAYER1", "LAYER2", "LAYER3", "BGLAYER"
+    ]
+    assert {
+        layer["name"]: layer["data"] for layer in page["layers"] if layer["data"] is not None
+    } == layer_data
+
+    with pytest.raises(ValueError):
+        read_note_page(note, 0)
+    with pytest.raises(IndexError):
+        read_note_page(note, 3)
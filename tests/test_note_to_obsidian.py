@@ -0,0 +1,224 @@
+"""Tests for exporting .note files to PNG and Markdown."""
+
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from obsidian_supernote.converters.note_to_obsidian import (
+    NoteToObsidianConverter,
+    render_note_page,
+)
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+
+
+def _write_note(path: Path, texts: list) -> Path:
+    """Write a .note file with one page per text."""
+    pdf_path = path.with_suffix(".pdf")
+    doc = fitz.open()
+    for text in texts:
+        doc.new_page(width=420, height=595).insert_text((72, 72), text, fontsize=24)
+    doc.save(pdf_path)
+    doc.close()
+    NoteFileWriter(device="A6X").convert_pdf_to_note(pdf_path, path, dpi=72)
+    return path
+
+
+@pytest.fixture(scope="module")
+def sample_note(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a three-page .note file."""
+    directory = tmp_path_factory.mktemp("source")
+    return _write_note(directory / "sample.note", ["Page 1", "Page 2", "Page 3"])
+
+
+def test_converter_rejects_negative_workers(sample_note: Path) -> None:
+    """Test that a negative worker count is rejected."""
+    with pytest.raises(ValueError):
+        NoteToObsidianConverter(sample_note, workers=-1)
+
+
+def test_parallel_export_matches_serial(sample_note: Path, tmp_path: Path) -> None:
+    """Test that a process-pool export writes the same files in page order."""
+    serial = NoteToObsidianConverter(sample_note).convert_all_pages_to_png(tmp_path / "serial")
+    parallel = NoteToObsidianConverter(sample_note, workers=2).convert_all_pages_to_png(
+        tmp_path / "parallel"
+    )
+
+    assert [path.name for path in serial] == [
+        "sample_page_01.png",
+        "sample_page_02.png",
+        "sample_page_03.png",
+    ]
+    assert [path.name for path in parallel] == [path.name for path in serial]
+    for serial_path, parallel_path in zip(serial, parallel):
+        assert parallel_path.read_bytes() == serial_path.read_bytes()
+
+
+def test_incremental_export_renders_changed_pages_only(tmp_path: Path) -> None:
+    """Test that unchanged pages and an identical Markdown file are left alone."""
+    note = _write_note(tmp_path / "notes.note", ["One", "Two", "Three"])
+    markdown = tmp_path / "vault" / "notes.md"
+
+    converter = NoteToObsidianConverter(note)
+    converter.convert_to_markdown(markdown, incremental=True)
+    assert converter.rendered_pages == [0, 1, 2]
+    first_stats = {path.name: path.stat().st_mtime_ns for path in markdown.parent.iterdir()}
+
+    converter = NoteToObsidianConverter(note)
+    converter.convert_to_markdown(markdown, incremental=True)
+    assert converter.rendered_pages == []
+    assert markdown.stat().st_mtime_ns == first_stats["notes.md"]
+
+    _write_note(note, ["One", "Changed"])
+    converter = NoteToObsidianConverter(note)
+    converter.convert_to_markdown(markdown, incremental=True)
+    assert converter.rendered_pages == [1]
+
+    images = sorted(path.name for path in markdown.parent.glob("*.png"))
+    assert images == ["notes_page_01.png", "notes_page_02.png"]
+    assert (markdown.parent / "notes_page_01.png").stat().st_mtime_ns == first_stats["notes_page_01.png"]
+    assert "notes_page_03.png" not in markdown.read_text(encoding="utf-8")
+
+
+def test_incremental_export_restores_missing_images(sample_note: Path, tmp_path: Path) -> None:
+    """Test that a deleted image is rendered again even though its page is unchanged."""
+    converter = NoteToObsidianConverter(sample_note)
+    paths = converter.convert_all_pages_to_png(tmp_path, incremental=True)
+    paths[2].unlink()
+
+    converter.convert_all_pages_to_png(tmp_path, incremental=True)
+    assert converter.rendered_pages == [2]
+    assert paths[2].exists()
+
+
+def test_incremental_export_ignores_tampered_manifest(sample_note: Path, tmp_path: Path) -> None:
+    """Test that only this note's page images are deleted through the manifest."""
+    import json
+
+    export_dir = tmp_path / "export"
+    converter = NoteToObsidianConverter(sample_note)
+    converter.convert_all_pages_to_png(export_dir, incremental=True)
+
+    victims = [tmp_path / "Daily.md", export_dir / "other_page_04.png", export_dir / "sample_page_04.md"]
+    for victim in victims:
+        victim.write_text("keep me", encoding="utf-8")
+    stale = export_dir / "sample_page_04.png"
+    stale.write_bytes(b"")
+
+    manifest_path = export_dir / ".sample.export.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    for name in ["../Daily.md", str(tmp_path / "Daily.md"), "other_page_04.png",
+                 "sample_page_04.md", "sample_page_04.png"]:
+        manifest["pages"][name] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    converter.convert_all_pages_to_png(export_dir, incremental=True)
+    assert all(victim.exists() for victim in victims)
+    assert not stale.exists()
+
+
+@pytest.mark.parametrize(
+    ("profile", "suffix", "mode"),
+    [("png-fast", ".png", "RGB"), ("gray4", ".png", "P"), ("bw", ".png", "1"), ("webp", ".webp", "RGB")],
+)
+def test_image_profiles(sample_note: Path, tmp_path: Path, profile: str, suffix: str, mode: str) -> None:
+    """Test that pages are saved in the format of the image profile."""
+    converter = NoteToObsidianConverter(sample_note, image_profile=profile)
+    markdown = converter.convert_to_markdown(tmp_path / "sample.md")
+
+    assert sorted(path.suffix for path in tmp_path.glob("sample_page_*")) == [suffix] * 3
+    assert f"sample_page_01{suffix}" in markdown.read_text(encoding="utf-8")
+    with Image.open(tmp_path / f"sample_page_01{suffix}") as img:
+        assert img.mode == mode
+        assert img.size == converter.image_converter.convert(0).size
+
+
+def test_gray_profiles_are_smaller(sample_note: Path, tmp_path: Path) -> None:
+    """Test that the gray and black-and-white profiles shrink the default PNG."""
+    sizes = {
+        profile: NoteToObsidianConverter(sample_note, image_profile=profile)
+        .convert_page_to_png(0, tmp_path / f"{profile}.img")
+        .stat()
+        .st_size
+        for profile in ("png", "gray4", "bw")
+    }
+    assert sizes["bw"] < sizes["gray4"] < sizes["png"]
+
+
+def test_incremental_export_follows_profile_change(sample_note: Path, tmp_path: Path) -> None:
+    """Test that switching profiles re-renders pages and removes the old files."""
+    NoteToObsidianConverter(sample_note).convert_all_pages_to_png(tmp_path, incremental=True)
+
+    converter = NoteToObsidianConverter(sample_note, image_profile="webp")
+    converter.convert_all_pages_to_png(tmp_path, incremental=True)
+    assert converter.rendered_pages == [0, 1, 2]
+    assert sorted(path.suffix for path in tmp_path.glob("sample_page_*")) == [".webp"] * 3
+
+    converter = NoteToObsidianConverter(sample_note, image_profile="gray4")
+    converter.convert_all_pages_to_png(tmp_path, incremental=True)
+    assert converter.rendered_pages == [0, 1, 2]
+
+
+def test_converter_rejects_unknown_profile(sample_note: Path) -> None:
+    """Test that an unknown image profile is rejected."""
+    with pytest.raises(ValueError):
+        NoteToObsidianConverter(sample_note, image_profile="jpeg")
+
+
+def test_render_single_page_matches_notebook_render(sample_note: Path) -> None:
+    """Test that rendering one page on its own gives the notebook's rendering."""
+    converter = NoteToObsidianConverter(sample_note)
+    for page_num in range(converter.page_count):
+        expected = converter.image_converter.convert(page_num)
+        image = render_note_page(sample_note, page_num)
+        assert (image.mode, image.size) == (expected.mode, expected.size)
+        assert image.tobytes() == expected.tobytes()
+
+    with pytest.raises(IndexError):
+        render_note_page(sample_note, converter.page_count)
+
+
+def test_render_single_page_without_layers(sample_note: Path, tmp_path: Path) -> None:
+    """Test that a page keeping its bitmap under DATA is not rendered blank."""
+    import re
+    import struct
+
+    from obsidian_supernote.converters.ratta_rle import (
+        COLORCODE_BACKGROUND,
+        COLORCODE_BLACK,
+        _encode_run,
+    )
+
+    data = bytearray(sample_note.read_bytes())
+
+    def block(address: int) -> str:
+        length = struct.unpack_from("<I", data, address)[0]
+        return bytes(data[address + 4 : address + 4 + length]).decode("utf-8")
+
+    def add(content: bytes) -> int:
+        address = len(data)
+        data.extend(struct.pack("<I", len(content)) + content)
+        return address
+
+    # Rewrite page 2 like a pre-layer note: one RLE bitmap under DATA
+    footer = block(struct.unpack("<I", data[-4:])[0])
+    page_address = int(re.search(r"<PAGE2:(\d+)>", footer).group(1))
+    width, height = 1404, 1872
+    bitmap_address = add(
+        _encode_run(COLORCODE_BLACK, width * 100)
+        + _encode_run(COLORCODE_BACKGROUND, width * (height - 100))
+    )
+    page = re.sub(r"<(MAINLAYER|LAYER[1-3]|BGLAYER):\d+>", "", block(page_address))
+    new_page_address = add(f"{page}<PROTOCOL:RATTA_RLE><DATA:{bitmap_address}>".encode("utf-8"))
+    footer_address = add(
+        footer.replace(f"<PAGE2:{page_address}>", f"<PAGE2:{new_page_address}>").encode("utf-8")
+    )
+    data.extend(b"tail" + struct.pack("<I", footer_address))
+    note = tmp_path / "legacy.note"
+    note.write_bytes(bytes(data))
+
+    image = render_note_page(note, 1).convert("L")
+    assert image.size == (width, height)
+    assert image.getpixel((10, 10)) == 0
+    assert image.getpixel((10, 500)) == 255
@@ -0,0 +1,601 @@
+"""Tests for Supernote .note file writer."""
+
+import pytest
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.parsers.note_parser import NoteFileParser
+
+
+def _make_pdf(path: Path, page_count: int) -> Path:
+    """Create a small A5 PDF with a numbered heading on every page."""
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page(width=420, height=595)
+        page.insert_text((72, 72), f"Page {i + 1}", fontsize=24)
+        page.draw_rect(fitz.Rect(72, 100, 72 + 20 * (i + 1), 140), color=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def sample_pdf(tmp_path: Path) -> Path:
+    """Create a five-page sample PDF."""
+    return _make_pdf(tmp_path / "sample.pdf", 5)
+
+
+def test_writer_rejects_negative_workers() -> None:
+    """Test that a negative worker count is rejected."""
+    with pytest.raises(ValueError):
+        NoteFileWriter(workers=-1)
+
+
+def test_parallel_rendering_matches_serial(sample_pdf: Path) -> None:
+    """Test that process-pool rendering returns the same pages in order."""
+    serial = NoteFileWriter(device="A6X", workers=1)._convert_pdf_to_pngs(sample_pdf, dpi=72)
+    parallel = NoteFileWriter(device="A6X", workers=2)._convert_pdf_to_pngs(sample_pdf, dpi=72)
+
+    assert len(serial) == 5
+    assert parallel == serial
+
+
+def test_convert_pdf_to_note_with_workers(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test a full PDF conversion using multiple workers."""
+    output = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X", workers=2)
+    writer.convert_pdf_to_note(sample_pdf, output, dpi=72)
+
+    parser = NoteFileParser(output)
+    parser.parse()
+    assert len(parser.png_images) == 5
+    img = parser.get_png_image(0)
+    assert img is not None
+    assert img.size == (1404, 1872)
+
+
+def test_writer_rejects_unknown_render_mode() -> None:
+    """Test that an unknown render mode is rejected."""
+    with pytest.raises(ValueError):
+        NoteFileWriter(render_mode="bicubic")
+
+
+def test_fit_render_mode_outputs_device_size(sample_pdf: Path) -> None:
+    """Test that fit mode renders straight to device pixels with letterboxing."""
+    from PIL import Image
+    from io import BytesIO
+
+    writer = NoteFileWriter(device="A5X2", render_mode="fit")
+    png_pages = writer._convert_pdf_to_pngs(sample_pdf)
+
+    img = Image.open(BytesIO(png_pages[0]))
+    assert img.size == (1920, 2560)
+
+    # A5 is taller than the Manta screen, so the sides are letterboxed
+    assert img.getpixel((0, 1280))[3] == 0
+    assert img.getpixel((1919, 1280))[3] == 0
+
+
+@pytest.mark.parametrize("render_mode", ["resample", "fit"])
+def test_gray_color_mode_writes_single_channel_pngs(sample_pdf: Path, render_mode: str) -> None:
+    """Test that gray mode produces 8-bit grayscale PNGs without alpha."""
+    from PIL import Image
+    from io import BytesIO
+
+    writer = NoteFileWriter(device="A6X", render_mode=render_mode, color_mode="gray")
+    png_pages = writer._convert_pdf_to_pngs(sample_pdf, dpi=72)
+
+    img = Image.open(BytesIO(png_pages[0]))
+    assert img.mode == "L"
+    assert img.size == (1404, 1872)
+
+
+def test_gray_png_template_flattens_transparency(tmp_path: Path) -> None:
+    """Test that transparent template pixels become white in gray mode."""
+    from PIL import Image
+
+    template = tmp_path / "template.png"
+    Image.new("RGBA", (1404, 1872), (0, 0, 0, 0)).save(template)
+
+    output = tmp_path / "template.note"
+    NoteFileWriter(device="A6X", color_mode="gray").convert_png_template_to_note(template, output)
+
+    parser = NoteFileParser(output)
+    parser.parse()
+    img = parser.get_png_image(0)
+    assert img is not None
+    assert img.mode == "L"
+    assert img.getpixel((0, 0)) == 255
+
+
+GOLDEN_PNG_NOTE = Path("examples/golden_sources/png_template/01_standard_png_blank.note")
+
+
+def _block_tags(data: bytes, address: int) -> list:
+    """Return the tag names of the length-prefixed metadata block at address."""
+    import re
+    import struct
+
+    length = struct.unpack_from("<I", data, address)[0]
+    text = data[address + 4 : address + 4 + length].decode("utf-8", errors="replace")
+    return re.findall(r"<([^:>]+):", text)
+
+
+@pytest.mark.skipif(not GOLDEN_PNG_NOTE.exists(), reason="Requires golden .note files")
+def test_gray_png_template_matches_golden_structure(tmp_path: Path) -> None:
+    """Test that a gray-mode template note keeps the device's tag layout."""
+    import struct
+
+    golden = GOLDEN_PNG_NOTE.read_bytes()
+    golden_png = NoteFileParser(GOLDEN_PNG_NOTE)
+    golden_png.parse()
+    template = tmp_path / "template.png"
+    template.write_bytes(golden_png.png_images[0])
+
+    output = tmp_path / "generated.note"
+    NoteFileWriter(device="A5X2", color_mode="gray").convert_png_template_to_note(
+        template, output
+    )
+    generated = output.read_bytes()
+
+    assert generated[:24] == golden[:24]
+    assert _block_tags(generated, 24) == _block_tags(golden, 24)
+    footer_generated = struct.unpack("<I", generated[-4:])[0]
+    footer_golden = struct.unpack("<I", golden[-4:])[0]
+    assert [t.split("_")[0] for t in _block_tags(generated, footer_generated)] == [
+        t.split("_")[0] for t in _block_tags(golden, footer_golden)
+    ]
+
+
+def test_quantized_pages_are_low_bit_depth(sample_pdf: Path) -> None:
+    """Test that quantized pages are encoded as 4-bit palette PNGs."""
+    pytest.importorskip("numpy")
+
+    writer = NoteFileWriter(device="A6X", render_mode="fit", quantize="ordered")
+    assert writer.color_mode == "gray"
+
+    png_pages = writer._convert_pdf_to_pngs(sample_pdf)
+    assert png_pages[0][24] == 4  # IHDR bit depth
+    assert png_pages[0][25] == 3  # palette color type
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_streaming_matches_in_memory_output(
+    sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    """Test that streaming writes the same bytes as the in-memory writer."""
+    monkeypatch.setattr(NoteFileWriter, "_generate_file_id", lambda self: "F20250101000000000" + "A" * 15)
+    monkeypatch.setattr(NoteFileWriter, "_generate_page_id", lambda self: "P20250101000000000" + "B" * 15)
+
+    in_memory = tmp_path / "in_memory.note"
+    streamed = tmp_path / "streamed.note"
+    NoteFileWriter(device="A6X", workers=workers).convert_pdf_to_note(sample_pdf, in_memory, dpi=72)
+    NoteFileWriter(device="A6X", workers=workers, streaming=True).convert_pdf_to_note(
+        sample_pdf, streamed, dpi=72
+    )
+
+    assert streamed.read_bytes() == in_memory.read_bytes()
+
+
+def test_streaming_rejects_short_page_iterator(tmp_path: Path) -> None:
+    """Test that the streaming writer checks the announced page count."""
+    writer = NoteFileWriter(device="A6X")
+    with pytest.raises(ValueError):
+        writer._write_note_file_streaming(tmp_path / "short.note", iter([b"png"]), 2, "doc", 100)
+
+
+def test_update_note_file_keeps_handwriting_archive(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that update mode swaps the templates and keeps the ZIP archive."""
+    import io
+    import zipfile
+
+    original = tmp_path / "original.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, original, dpi=72)
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("page1/stroke.bin", b"\x01\x02\x03")
+    with open(original, "ab") as f:
+        f.write(archive.getvalue())
+
+    new_pdf = _make_pdf(tmp_path / "new.pdf", 5)
+    updated = tmp_path / "updated.note"
+    writer.update_note_file(original, new_pdf, updated, dpi=72)
+
+    parser = NoteFileParser(updated)
+    parser.parse()
+    assert len(parser.png_images) == 5
+    assert parser.get_zip_archive() == archive.getvalue()
+
+
+def test_update_note_file_uses_index(
+    sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a note the index knows has no handwriting is not parsed again."""
+    from obsidian_supernote.converters import note_writer
+    from obsidian_supernote.parsers.note_index import NoteIndex
+
+    original = tmp_path / "original.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, original, dpi=72)
+
+    with NoteIndex() as index:
+        index.get(original)
+        monkeypatch.setattr(note_writer, "NoteFileParser", None)
+        updated = tmp_path / "updated.note"
+        writer.update_note_file(original, _make_pdf(tmp_path / "new.pdf", 3), updated, dpi=72, index=index)
+
+    parser = NoteFileParser(updated)
+    parser.parse()
+    assert len(parser.png_images) == 3
+
+
+def test_markdown_update_passes_index(
+    sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that update mode of the Markdown conversion consults the index."""
+    from obsidian_supernote.converters import note_writer
+
+    existing = tmp_path / "existing.note"
+    NoteFileWriter(device="A6X").convert_pdf_to_note(sample_pdf, existing, dpi=72)
+    markdown = tmp_path / "note.md"
+    markdown.write_text("---\nsupernote.file: '[existing.note]'\n---\n\n# Note\n", encoding="utf-8")
+
+    class FakePandoc:
+        """Write a three-page PDF instead of running Pandoc."""
+
+        def __init__(self, **kwargs) -> None:
+            pass
+
+        def convert(self, markdown_path: Path, pdf_path: Path) -> None:
+            _make_pdf(Path(pdf_path), 3)
+
+    monkeypatch.setattr(note_writer, "PandocConverter", FakePandoc)
+    monkeypatch.setattr(note_writer, "NoteFileParser", None)
+    output = tmp_path / "updated.note"
+    note_writer.convert_markdown_to_note(
+        markdown, output, device="A6X", update_markdown=False, index_path=tmp_path / "index.sqlite"
+    )
+
+    parser = NoteFileParser(output)
+    parser.parse()
+    assert len(parser.png_images) == 3
+
+
+def _make_variant_pdf(path: Path, changed_page: int) -> Path:
+    """Create the five-page sample PDF with one page's drawing changed."""
+    doc = fitz.open()
+    for i in range(5):
+        page = doc.new_page(width=420, height=595)
+        page.insert_text((72, 72), f"Page {i + 1}", fontsize=24)
+        width = 200 if i == changed_page else 20 * (i + 1)
+        page.draw_rect(fitz.Rect(72, 100, 72 + width, 140), color=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_incremental_update_appends_changed_pages(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that an incremental update appends only the changed page."""
+    import struct
+
+    from supernotelib import load_notebook
+
+    note = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, note, dpi=72)
+    original = note.read_bytes()
+
+    new_pdf = _make_variant_pdf(tmp_path / "sample.pdf", changed_page=2)
+    new_png = writer._convert_pdf_to_pngs(new_pdf, dpi=72)[2]
+    writer.update_note_file(note, new_pdf, note, dpi=72, incremental=True)
+    updated = note.read_bytes()
+
+    # Everything before the old end of file is untouched
+    assert updated[: len(original)] == original
+    # One new PNG plus small metadata blocks (page styles embed the PDF size)
+    assert len(updated) - len(original) < len(new_png) + 16384
+
+    # The new footer points at the replaced page; other pages are reused
+    footer_address = struct.unpack("<I", updated[-4:])[0]
+    footer = _block_tags(updated, footer_address)
+    assert footer[:5] == ["PAGE1", "PAGE2", "PAGE3", "PAGE4", "PAGE5"]
+
+    notebook = load_notebook(str(note))
+    assert notebook.get_total_pages() == 5
+    assert notebook.get_page(2).get_layers()[-1].get_content() == new_png
+
+
+def test_incremental_update_without_changes_is_noop(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that an incremental update with identical pages writes nothing."""
+    note = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, note, dpi=72)
+    original = note.read_bytes()
+
+    writer.update_note_file(note, sample_pdf, note, dpi=72, incremental=True)
+    assert note.read_bytes() == original
+
+
+def test_incremental_update_falls_back_on_removed_pages(
+    sample_pdf: Path, tmp_path: Path
+) -> None:
+    """Test that a PDF with fewer pages triggers a full rewrite."""
+    note = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, note, dpi=72)
+
+    writer.update_note_file(note, _make_pdf(tmp_path / "shorter.pdf", 3), note, dpi=72, incremental=True)
+
+    parser = NoteFileParser(note)
+    parser.parse()
+    assert len(parser.png_images) == 3
+
+
+def test_incremental_update_appends_new_pages(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that pages the PDF gained are appended to the existing file."""
+    note = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X")
+    writer.convert_pdf_to_note(sample_pdf, note, dpi=72)
+    original = note.read_bytes()
+
+    writer.update_note_file(note, _make_pdf(tmp_path / "longer.pdf", 7), note, dpi=72, incremental=True)
+
+    assert note.read_bytes()[: len(original)] == original
+    parser = NoteFileParser(note)
+    parser.parse()
+    assert len(parser.png_images) == 7
+
+
+def test_identical_pages_share_one_png_block(tmp_path: Path) -> None:
+    """Test that duplicate background pages are stored once."""
+    from supernotelib import load_notebook
+
+    doc = fitz.open()
+    for text in ["Cover", None, None, None]:
+        page = doc.new_page(width=420, height=595)
+        if text:
+            page.insert_text((72, 72), text, fontsize=24)
+    pdf = tmp_path / "blank_pages.pdf"
+    doc.save(pdf)
+    doc.close()
+
+    output = tmp_path / "blank_pages.note"
+    NoteFileWriter(device="A6X").convert_pdf_to_note(pdf, output, dpi=72)
+
+    parser = NoteFileParser(output)
+    parser.parse()
+    assert len(parser.png_images) == 2
+
+    notebook = load_notebook(str(output))
+    assert notebook.get_total_pages() == 4
+    backgrounds = [notebook.get_page(i).get_layers()[-1].get_content() for i in range(4)]
+    assert backgrounds[1] == backgrounds[2] == backgrounds[3] != backgrounds[0]
+
+
+def test_deterministic_output_is_reproducible(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that deterministic mode gives identical bytes and skips rewrites."""
+    import os
+
+    output = tmp_path / "sample.note"
+    writer = NoteFileWriter(device="A6X", deterministic=True)
+    writer.convert_pdf_to_note(sample_pdf, output, dpi=72)
+    assert not writer.last_write_skipped
+    first = output.read_bytes()
+    os.utime(output, (1_000, 1_000))
+
+    writer.convert_pdf_to_note(sample_pdf, output, dpi=72)
+    assert writer.last_write_skipped
+    assert output.stat().st_mtime == 1_000
+    assert output.read_bytes() == first
+
+    # Streaming produces the same file and also leaves it untouched
+    streaming = NoteFileWriter(device="A6X", deterministic=True, streaming=True)
+    streaming.convert_pdf_to_note(sample_pdf, output, dpi=72)
+    assert streaming.last_write_skipped
+    assert output.stat().st_mtime == 1_000
+    assert list(tmp_path.glob(".*.tmp")) == []
+
+    # Different options give different IDs
+    other = tmp_path / "other.note"
+    NoteFileWriter(device="A6X", deterministic=True).convert_pdf_to_note(
+        sample_pdf, other, dpi=72, realtime=True
+    )
+    assert _block_tags(other.read_bytes(), 24) == _block_tags(first, 24)
+    assert other.read_bytes()[:400] != first[:400]
+
+
+def test_deterministic_streaming_replaces_changed_output(sample_pdf: Path, tmp_path: Path) -> None:
+    """Test that deterministic streaming rewrites an outdated file."""
+    output = tmp_path / "sample.note"
+    output.write_bytes(b"outdated")
+
+    writer = NoteFileWriter(device="A6X", deterministic=True, streaming=True)
+    writer.convert_pdf_to_note(sample_pdf, output, dpi=72)
+
+    assert not writer.last_write_skipped
+    expected = tmp_path / "expected.note"
+    NoteFileWriter(device="A6X", deterministic=True).convert_pdf_to_note(sample_pdf, expected, dpi=72)
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def _make_images(tmp_path: Path) -> list:
+    """Create a large JPEG photo, a transparent PNG and a small gray image."""
+    from PIL import Image
+
+    photo = tmp_path / "photo.jpg"
+    Image.radial_gradient("L").resize((3000, 4000)).convert("RGB").save(photo, quality=90)
+    overlay = tmp_path / "overlay.png"
+    Image.new("RGBA", (700, 900), (0, 0, 0, 0)).save(overlay)
+    small = tmp_path / "small.png"
+    Image.new("L", (200, 300), 128).save(small)
+    return [photo, overlay, small]
+
+
+@pytest.mark.parametrize("color_mode", ["rgba", "gray"])
+def test_convert_images_to_note_in_threads(tmp_path: Path, color_mode: str) -> None:
+    """Test that threaded image loading gives the same file as serial loading."""
+    images = _make_images(tmp_path)
+
+    outputs = []
+    for workers in (1, 3):
+        output = tmp_path / f"images_{workers}.note"
+        writer = NoteFileWriter(
+            device="A6X", workers=workers, color_mode=color_mode, deterministic=True
+        )
+        writer.convert_images_to_note(images, output, name="scans")
+        outputs.append(output.read_bytes())
+    assert outputs[0] == outputs[1]
+
+    parser = NoteFileParser(tmp_path / "images_3.note")
+    parser.parse()
+    assert len(parser.png_images) == 3
+    for index in range(3):
+        img = parser.get_png_image(index)
+        assert img.size == (1404, 1872)
+        if color_mode == "gray":
+            assert img.mode == "L"
+
+
+def test_convert_images_to_note_rejects_empty_list(tmp_path: Path) -> None:
+    """Test that a note needs at least one image."""
+    with pytest.raises(ValueError, match="No images"):
+        NoteFileWriter(device="A6X").convert_images_to_note([], tmp_path / "empty.note")
+
+
+def _count_renders(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record the index of every page rasterized in-process."""
+    from obsidian_supernote.converters import note_writer
+
+    rendered = []
+    render = note_writer._render_page_to_png
+
+    def counting_render(page, settings):
+        rendered.append(page.number)
+        return render(page, settings)
+
+    monkeypatch.setattr(note_writer, "_render_page_to_png", counting_render)
+    return rendered
+
+
+def test_page_range_renders_only_selected_pages(
+    sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that --pages style selection skips rasterizing other pages."""
+    rendered = _count_renders(monkeypatch)
+    output = tmp_path / "selected.note"
+    NoteFileWriter(device="A6X").convert_pdf_to_note(sample_pdf, output, dpi=72, pages="4-,2")
+
+    assert rendered == [1, 3, 4]
+    parser = NoteFileParser(output)
+    parser.parse()
+    assert len(parser.png_images) == 3
+
+    with pytest.raises(ValueError, match="outside pages 1-5"):
+        NoteFileWriter(device="A6X").convert_pdf_to_note(sample_pdf, output, pages="6")
+
+
+def _draw_on_page(note: Path, page_number: int, bitmap: bytes) -> None:
+    """Append a new main layer bitmap to a page, the way the device saves ink."""
+    import re
+    import struct
+
+    data = note.read_bytes()
+
+    def block(address: int) -> str:
+        length = struct.unpack_from("<I", data, address)[0]
+        return data[address + 4 : address + 4 + length].decode("utf-8")
+
+    footer = block(struct.unpack("<I", data[-4:])[0])
+    page_address = int(re.search(rf"<PAGE{page_number}:(\d+)>", footer).group(1))
+    page = block(page_address)
+    layer = block(int(re.search(r"<MAINLAYER:(\d+)>", page).group(1)))
+
+    blocks = []
+    address = len(data)
+
+    def add(content: bytes) -> int:
+        nonlocal address
+        blocks.append(struct.pack("<I", len(content)) + content)
+        address += 4 + len(content)
+        return address - 4 - len(content)
+
+    bitmap_address = add(bitmap)
+    layer = re.sub(r"<LAYERBITMAP:\d+>", f"<LAYERBITMAP:{bitmap_address}>", layer)
+    layer_address = add(layer.encode("utf-8"))
+    page = re.sub(r"<MAINLAYER:\d+>", f"<MAINLAYER:{layer_address}>", page)
+    new_page_address = add(page.encode("utf-8"))
+    footer = footer.replace(f"<PAGE{page_number}:{page_address}>", f"<PAGE{page_number}:{new_page_address}>")
+    footer_address = add(footer.encode("utf-8"))
+
+    with open(note, "ab") as f:
+        f.write(b"".join(blocks) + b"tail" + struct.pack("<I", footer_address))
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_progressive_conversion_extends_preview(
+    sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, streaming: bool
+) -> None:
+    """Test that a preview note is extended in place, keeping its handwriting."""
+    from supernotelib import load_notebook
+
+    rendered = _count_renders(monkeypatch)
+    output = tmp_path / "progressive.note"
+    ink = b"\x61\x10" * 64
+    preview_pages = []
+
+    def on_first_pages(path: Path, count: int) -> None:
+        parser = NoteFileParser(path)
+        parser.parse()
+        preview_pages.append((count, len(parser.png_images)))
+        _draw_on_page(path, 1, ink)
+
+    writer = NoteFileWriter(device="A6X", streaming=streaming, deterministic=True)
+    extension = writer.start_pdf_to_note_progressive(
+        sample_pdf, output, 2, dpi=72, on_first_pages=on_first_pages
+    )
+    assert extension.result(timeout=60) == output
+
+    assert preview_pages == [(2, 2)]
+    assert rendered == [0, 1, 2, 3, 4]
+    assert list(tmp_path.glob(".*.tmp")) == []
+
+    direct = tmp_path / "direct.note"
+    NoteFileWriter(device="A6X", deterministic=True).convert_pdf_to_note(sample_pdf, direct, dpi=72)
+    expected = NoteFileParser(direct)
+    expected.parse()
+    extended = NoteFileParser(output)
+    extended.parse()
+    assert extended.png_images == expected.png_images
+
+    notebook = load_notebook(str(output))
+    assert notebook.get_total_pages() == 5
+    assert notebook.get_page(0).get_layers()[0].get_content() == ink
+
+
+def test_progressive_conversion_keeps_changed_preview(
+    sample_pdf: Path, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that a preview that can't be extended in place is never replaced."""
+    output = tmp_path / "progressive.note"
+
+    def on_first_pages(path: Path, count: int) -> None:
+        # A trailing handwriting archive rules out appending to the file
+        with open(path, "ab") as f:
+            f.write(b"PK\x05\x06" + bytes(18))
+
+    writer = NoteFileWriter(device="A6X")
+    complete = writer.convert_pdf_to_note_progressive(
+        sample_pdf, output, 2, dpi=72, on_first_pages=on_first_pages
+    )
+
+    assert complete == tmp_path / "progressive.complete.note"
+    assert "can't be extended in place" in caplog.text
+    assert output.read_bytes().endswith(b"PK\x05\x06" + bytes(18))
+    parser = NoteFileParser(complete)
+    parser.parse()
+    assert len(parser.png_images) == 5
+    assert list(tmp_path.glob(".*.tmp")) == []
@@ -0,0 +1,105 @@
+"""Tests for the rendered-page cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import fitz  # PyMuPDF
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.converters.page_cache import PageCache
+
+
+def _make_pdf(path: Path, texts: list) -> Path:
+    """Create a PDF with one line of text per page."""
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page(width=420, height=595)
+        page.insert_text((72, 72), text, fontsize=24)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_keys_follow_page_content(tmp_path: Path) -> None:
+    """Test that keys survive object renumbering and track content and settings."""
+    cache = PageCache(tmp_path / "cache")
+    original = _make_pdf(tmp_path / "a.pdf", ["One", "Two", "Three"])
+    inserted = _make_pdf(tmp_path / "b.pdf", ["Zero", "One", "Two", "Changed"])
+
+    with fitz.open(original) as doc:
+        keys = cache.document_keys(doc, ("A6X", 300))
+        other_settings = cache.document_keys(doc, ("A6X", 226))
+    with fitz.open(inserted) as doc:
+        new_keys = cache.document_keys(doc, ("A6X", 300))
+
+    assert new_keys[1:3] == keys[:2]
+    assert new_keys[3] != keys[2]
+    assert not set(other_settings) & set(keys)
+
+
+def test_get_put_and_counters(tmp_path: Path) -> None:
+    """Test that lookups are counted and entries round-trip."""
+    cache = PageCache(tmp_path / "cache")
+    assert not cache.has("ab" * 32)
+    cache.put("ab" * 32, b"png data")
+    assert cache.has("ab" * 32)
+    assert cache.get("ab" * 32) == b"png data"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["size_bytes"] == len(b"png data")
+
+
+def test_overwriting_an_entry_keeps_the_size(tmp_path: Path) -> None:
+    """Test that putting an existing key again replaces its size."""
+    cache = PageCache(tmp_path / "cache", max_size_mb=1)
+    blob = b"x" * (400 * 1024)
+    first, second = "a" * 64, "b" * 64
+
+    cache.put(first, blob)
+    cache.put(second, blob)
+    cache.put(first, blob)
+    cache.put(first, blob[:1024])
+
+    assert cache._size_bytes == len(blob) + 1024
+    assert cache.get(second) == blob
+    assert cache.stats()["evictions"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    """Test that eviction removes the entries used longest ago."""
+    cache = PageCache(tmp_path / "cache", max_size_mb=1)
+    blob = b"x" * (400 * 1024)
+    first, second, third = "a" * 64, "b" * 64, "c" * 64
+
+    cache.put(first, blob)
+    cache.put(second, blob)
+    os.utime(cache._path(first), (1_000, 1_000))
+    os.utime(cache._path(second), (2_000, 2_000))
+    cache.get(first)  # marks it as recently used
+
+    cache.put(third, blob)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == blob
+    assert cache.get(third) == blob
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_writer_reuses_cached_pages(tmp_path: Path, workers: int) -> None:
+    """Test that unchanged pages come from the cache on the next conversion."""
+    cache = PageCache(tmp_path / "cache")
+    writer = NoteFileWriter(device="A6X", workers=workers, page_cache=cache)
+
+    first = writer._convert_pdf_to_pngs(_make_pdf(tmp_path / "v1.pdf", ["1", "2", "3", "4"]), dpi=72)
+    assert (cache.hits, cache.misses) == (0, 4)
+
+    edited = _make_pdf(tmp_path / "v2.pdf", ["1", "2", "3", "4 (edited)"])
+    second = writer._convert_pdf_to_pngs(edited, dpi=72)
+    assert (cache.hits, cache.misses) == (3, 5)
+
+    assert second[:3] == first[:3]
+    assert second == NoteFileWriter(device="A6X")._convert_pdf_to_pngs(edited, dpi=72)
@@ -0,0 +1,20 @@
+"""Tests for page range selection."""
+
+import pytest
+
+from obsidian_supernote.utils import parse_page_ranges
+
+
+def test_parse_pages_and_ranges() -> None:
+    """Test single pages, closed and open ranges, in document order."""
+    assert parse_page_ranges("1-3,45", 50) == [0, 1, 2, 44]
+    assert parse_page_ranges("48-", 50) == [47, 48, 49]
+    assert parse_page_ranges("-2", 50) == [0, 1]
+    assert parse_page_ranges(" 5, 2-3 ,3", 50) == [1, 2, 4]
+
+
+@pytest.mark.parametrize("spec", ["", "1,,2", "a-3", "0-2", "4-51", "5-2", "1-2-3"])
+def test_invalid_page_ranges(spec: str) -> None:
+    """Test that malformed, reversed and out-of-range selections are rejected."""
+    with pytest.raises(ValueError):
+        parse_page_ranges(spec, 50)
@@ -0,0 +1,93 @@
+"""Tests for e-ink gray-level quantization."""
+
+import pytest
+from io import BytesIO
+
+from PIL import Image
+
+from obsidian_supernote.converters.quantize import (
+    NUMPY_AVAILABLE,
+    encode_quantized_png,
+    gray_palette,
+    png_bit_depth,
+    quantize_gray_image,
+    validate_quantize_options,
+)
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+
+
+def _gradient(width: int = 256, height: int = 64) -> Image.Image:
+    """Create a horizontal black-to-white gradient."""
+    return Image.linear_gradient("L").rotate(90).resize((width, height))
+
+
+def test_gray_palette_spans_black_to_white() -> None:
+    """Test that the palette covers the full gray range evenly."""
+    palette = gray_palette(16)
+    assert len(palette) == 16
+    assert palette[0] == 0
+    assert palette[-1] == 255
+    assert palette[1] == 17
+
+
+def test_png_bit_depth() -> None:
+    """Test the smallest PNG palette depth for each level count."""
+    assert png_bit_depth(2) == 1
+    assert png_bit_depth(4) == 2
+    assert png_bit_depth(16) == 4
+    assert png_bit_depth(17) == 8
+
+
+def test_validate_rejects_bad_options() -> None:
+    """Test that unknown modes and level counts are rejected."""
+    with pytest.raises(ValueError):
+        validate_quantize_options("floyd", 16)
+    with pytest.raises(ValueError):
+        validate_quantize_options("levels", 1)
+
+
+@requires_numpy
+@pytest.mark.parametrize("mode", ["levels", "ordered", "diffusion"])
+def test_quantize_uses_only_palette_levels(mode: str) -> None:
+    """Test that every quantized pixel addresses one of the gray levels."""
+    quantized = quantize_gray_image(_gradient(), 16, mode)
+
+    assert quantized.mode == "P"
+    assert max(quantized.tobytes()) <= 15
+    # Pure black and pure white must survive every mode unchanged
+    assert quantized.getpixel((0, 0)) == 0
+    assert quantized.getpixel((255, 0)) == 15
+
+
+@requires_numpy
+def test_levels_mode_maps_to_nearest_level() -> None:
+    """Test nearest-level mapping without dithering."""
+    img = Image.new("L", (8, 8), 120)
+    quantized = quantize_gray_image(img, 16, "levels")
+    # 120 / 17 = 7.06 -> level 7
+    assert set(quantized.tobytes()) == {7}
+
+
+@requires_numpy
+def test_ordered_dither_preserves_mean_gray() -> None:
+    """Test that ordered dithering mixes neighbouring levels around the input value."""
+    img = Image.new("L", (64, 64), 120)
+    quantized = quantize_gray_image(img, 16, "ordered")
+    values = quantized.tobytes()
+    assert set(values) == {7, 8}
+    mean_gray = sum(gray_palette(16)[v] for v in values) / len(values)
+    assert abs(mean_gray - 120) < 2
+
+
+@requires_numpy
+def test_encode_writes_four_bit_palette_png() -> None:
+    """Test that 16 levels are stored as a 4-bit palette PNG."""
+    png = encode_quantized_png(_gradient(), 16, "levels")
+
+    # IHDR bit depth (byte 24) and color type (byte 25)
+    assert png[24] == 4
+    assert png[25] == 3
+    decoded = Image.open(BytesIO(png))
+    assert decoded.mode == "P"
+    assert decoded.size == (256, 64)
@@ -0,0 +1,164 @@
+"""Tests for the vectorized RATTA_RLE layer encoder/decoder."""
+
+import pytest
+from supernotelib.decoder import RattaRleDecoder, RattaRleX2Decoder
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.converters.ratta_rle import (
+    COLORCODE_BACKGROUND,
+    COLORCODE_BLACK,
+    COLORCODE_X2_DARK_GRAY,
+    COLORCODE_X2_GRAY,
+    NUMPY_AVAILABLE,
+    blank_layer_rle,
+    codes_to_gray,
+    decode_rle,
+    encode_rle,
+    gray_to_codes,
+)
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+
+
+def _sample_layer(width: int = 300, height: int = 200):
+    """Create a layer with long blank runs, strokes and single-pixel noise."""
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    codes = np.full((height, width), COLORCODE_BACKGROUND, dtype=np.uint8)
+    codes[20:60, 10:290] = COLORCODE_BLACK
+    codes[80:90] = rng.choice(
+        [COLORCODE_BLACK, COLORCODE_X2_DARK_GRAY, COLORCODE_X2_GRAY, COLORCODE_BACKGROUND],
+        size=(10, width),
+    )
+    codes[120:121, :150] = COLORCODE_X2_GRAY
+    return codes
+
+
+def _reference_decode(data: bytes, width: int, height: int, x2: bool = True, all_blank: bool = False):
+    """Decode with supernotelib's pure-Python decoder."""
+    import numpy as np
+
+    decoder = RattaRleX2Decoder() if x2 else RattaRleDecoder()
+    bitmap, _, _ = decoder.decode(data, width, height, all_blank=all_blank)
+    return np.frombuffer(bitmap, dtype=np.uint8).reshape(height, width)
+
+
+@requires_numpy
+def test_round_trip_matches_supernotelib() -> None:
+    """Test that encoded layers decode identically here and in supernotelib."""
+    codes = _sample_layer()
+    data = encode_rle(codes)
+
+    assert (decode_rle(data, 300, 200) == codes).all()
+    assert (_reference_decode(data, 300, 200) == codes_to_gray(codes)).all()
+
+
+@requires_numpy
+def test_decoder_handles_held_runs_like_supernotelib() -> None:
+    """Test held runs: joined, standalone, followed by another held pair, and at the tail."""
+    data = bytes([
+        0x61, 0x81, 0x61, 0x10,  # joined: 1 + 0x10 + 256
+        0x62, 0x80, 0x61, 0x05,  # standalone held run (128), then 6 pixels
+        0x62, 0x82, 0x62, 0x83, 0x62, 0x81,  # held pair consumed raw, then a new held run
+        0x63, 0xff,  # 0x4000 (0x400 when all blank)
+        0x65, 0x83,  # held run at the tail, shortened to fit
+    ])
+    for total, all_blank in ((17563 + 64, False), (2203 + 256, True)):
+        expected = _reference_decode(data, 1, total, all_blank=all_blank)
+        assert (codes_to_gray(decode_rle(data, 1, total, all_blank=all_blank)) == expected).all()
+
+
+@requires_numpy
+def test_decoder_rejects_wrong_size() -> None:
+    """Test that data not covering the layer exactly is rejected."""
+    with pytest.raises(ValueError, match="expected"):
+        decode_rle(bytes([0x62, 0x05]), 4, 4)
+
+
+@requires_numpy
+def test_gray_codes_round_trip() -> None:
+    """Test mapping between palette gray values and color codes."""
+    codes = _sample_layer()
+    assert (gray_to_codes(codes_to_gray(codes)) == codes).all()
+    with pytest.raises(ValueError, match="palette"):
+        gray_to_codes(codes_to_gray(codes) - 1)
+
+
+@pytest.mark.parametrize("device", ["A5X2", "A6X"])
+def test_blank_layer_fits_device(device: str) -> None:
+    """Test that the writer's blank layers decode to the device's page size."""
+    writer = NoteFileWriter(device=device)
+    width, height = writer.template_width, writer.template_height
+
+    if device == "A5X2":
+        assert writer.empty_layer_rle == NoteFileWriter.EMPTY_LAYER_RLE
+    bitmap = _reference_decode(writer.empty_layer_rle, width, height)
+    assert bitmap.shape == (height, width)
+    if NUMPY_AVAILABLE:
+        import numpy as np
+
+        assert writer.empty_layer_rle == encode_rle(
+            np.full((height, width), COLORCODE_BACKGROUND, dtype=np.uint8)
+        )
+        assert blank_layer_rle(width, height) == writer.empty_layer_rle
+
+
+def _random_rle(seed: int, x2: bool, all_blank: bool, run_count: int = 300):
+    """Build a RATTA_RLE stream from random runs, returning it with its color codes.
+
+    Every run is written in one of the device's run forms: a short pair, a
+    standalone held run, a held run joined with a following pair of the same
+    color (whose length byte is taken raw, even above 0x7f), or a 0xff run.
+    Neighbouring runs differ in color, so no pair joins by accident.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    colors = (
+        [0x61, 0x62, 0x65, 0x66, 0x63, 0x64, COLORCODE_X2_DARK_GRAY, COLORCODE_X2_GRAY, 0x9E, 0xCA]
+        if x2
+        else list(range(0x61, 0x69))
+    )
+    data = bytearray()
+    run_codes, run_lengths = [], []
+    for index in range(run_count):
+        code = int(rng.choice([color for color in colors if not run_codes or color != run_codes[-1]]))
+        # The last run is a short one: a held run at the tail would be cut to fit
+        form = 0 if index == run_count - 1 else int(rng.integers(4))
+        if form == 0:
+            length = int(rng.integers(0, 0x80))
+            data += bytes([code, length])
+            length += 1
+        elif form == 1:
+            held = int(rng.integers(0x80, 0xFF))
+            data += bytes([code, held])
+            length = ((held & 0x7F) + 1) << 7
+        elif form == 2:
+            held, extra = int(rng.integers(0x80, 0xFF)), int(rng.integers(0, 0x100))
+            data += bytes([code, held, code, extra])
+            length = 1 + extra + (((held & 0x7F) + 1) << 7)
+        else:
+            data += bytes([code, 0xFF])
+            length = 0x400 if all_blank else 0x4000
+        run_codes.append(code)
+        run_lengths.append(length)
+    return bytes(data), np.repeat(np.array(run_codes, dtype=np.uint8), run_lengths)
+
+
+@requires_numpy
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(("x2", "all_blank"), [(True, False), (False, False), (True, True)])
+def test_random_streams_match_supernotelib(seed: int, x2: bool, all_blank: bool) -> None:
+    """Test the decoder and encoder against supernotelib on generated streams."""
+    data, expected = _random_rle(seed, x2, all_blank)
+    height = len(expected)
+
+    codes = decode_rle(data, 1, height, all_blank=all_blank)
+    assert (codes.ravel() == expected).all()
+    reference = _reference_decode(data, 1, height, x2, all_blank)
+    assert (codes_to_gray(codes, x2) == reference).all()
+
+    encoded = encode_rle(codes)
+    assert (decode_rle(encoded, 1, height) == codes).all()
+    assert (_reference_decode(encoded, 1, height, x2) == reference).all()
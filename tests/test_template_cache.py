@@ -0,0 +1,79 @@
+"""Tests for the prepared PNG template registry."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from obsidian_supernote.converters.note_writer import NoteFileWriter
+from obsidian_supernote.converters.page_cache import PageCache
+from obsidian_supernote.converters.template_cache import TemplateCache
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    """Create a small template that must be resized for every device."""
+    path = tmp_path / "dots.png"
+    img = Image.new("RGB", (351, 468), "white")
+    for x in range(0, 351, 27):
+        img.putpixel((x, x), (0, 0, 0))
+    img.save(path)
+    return path
+
+
+def test_key_depends_on_content_and_settings() -> None:
+    """Test that keys change with the template bytes and the render settings."""
+    key = TemplateCache.key(b"png", ("A5X2", "rgba"))
+    assert key == TemplateCache.key(b"png", ("A5X2", "rgba"))
+    assert key != TemplateCache.key(b"png!", ("A5X2", "rgba"))
+    assert key != TemplateCache.key(b"png", ("A6X", "rgba"))
+
+
+def test_memory_entries_are_bounded() -> None:
+    """Test that the least recently used templates leave memory first."""
+    cache = TemplateCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode(), key)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == (b"c", "c")
+    assert cache.stats()["entries"] == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_writer_prepares_template_once(template: Path, tmp_path: Path, monkeypatch) -> None:
+    """Test that repeated notes from one template reuse the prepared PNG."""
+    cache = TemplateCache(PageCache(tmp_path / "cache"))
+    writer = NoteFileWriter(device="A6X", template_cache=cache, deterministic=True)
+    writer.convert_png_template_to_note(template, tmp_path / "first.note")
+
+    uncached = tmp_path / "uncached.note"
+    NoteFileWriter(device="A6X", deterministic=True).convert_png_template_to_note(
+        template, uncached, template_name="dots"
+    )
+    assert (tmp_path / "first.note").read_bytes() == uncached.read_bytes()
+
+    def fail(*args):
+        raise AssertionError("template prepared again")
+
+    monkeypatch.setattr(NoteFileWriter, "_prepare_png_template", fail)
+    writer.convert_png_template_to_note(template, tmp_path / "second.note")
+    assert cache.hits == 1
+
+    # A new process only shares the on-disk store
+    fresh = TemplateCache(PageCache(tmp_path / "cache"))
+    NoteFileWriter(device="A6X", template_cache=fresh, deterministic=True).convert_png_template_to_note(
+        template, tmp_path / "third.note"
+    )
+    assert fresh.hits == 1
+    assert (tmp_path / "third.note").read_bytes() == uncached.read_bytes()
+
+
+def test_devices_get_separate_entries(template: Path, tmp_path: Path) -> None:
+    """Test that a template is prepared separately for each device size."""
+    cache = TemplateCache()
+    for device in ("A6X", "A5X2"):
+        NoteFileWriter(device=device, template_cache=cache).convert_png_template_to_note(
+            template, tmp_path / f"{device}.note"
+        )
+    assert (cache.hits, cache.misses) == (0, 2)